@@ -1,9 +1,10 @@
 from django.contrib import admin
-from .models import Post, Profile, Comment, Tag
+from . import threads
+from .models import Post, Profile, Comment, TagStats
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ('title', 'author', 'published_date')
+    list_display = ('title', 'author', 'published_date', 'comment_count', 'view_count')
     search_fields = ('title', 'content')
     list_filter = ('published_date', 'author')
 
@@ -13,14 +14,20 @@ class ProfileAdmin(admin.ModelAdmin):
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
-    list_display = ('post', 'author', 'created_at', 'updated_at')
+    list_display = ('post', 'author', 'created_at', 'updated_at', 'is_removed')
     search_fields = ('content', 'author__username')
-    list_filter = ('created_at', 'author')
-
-@admin.register(Tag)
-class TagAdmin(admin.ModelAdmin):
-    list_display = ('name', 'slug')
-    search_fields = ('name',)
+    list_filter = ('created_at', 'author', 'is_removed')
+    raw_id_fields = ('parent',)
+    actions = ['remove_keeping_threads']
 
+    @admin.action(description="Remove selected comments (keep reply threads)")
+    def remove_keeping_threads(self, request, queryset):
+        deleted, tombstoned = threads.remove_comments(queryset)
+        self.message_user(request, f"{deleted} deleted, {tombstoned} tombstoned.")
 
+@admin.register(TagStats)
+class TagStatsAdmin(admin.ModelAdmin):
+    list_display = ('tag', 'post_count', 'last_used')
+    ordering = ('-post_count',)
 
+# Tag is registered by taggit's own admin module.
@@ -0,0 +1,126 @@
+# Alx_DjangoLearnLab/django_blog/blog/async_views.py
+"""
+Async (ASGI-native) versions of the read views.
+
+Each class subclasses its sync twin in views.py, so queryset, template and
+context stay shared, and only replaces ``get()`` with a coroutine that
+loads everything the template needs through the async ORM (``async for``,
+``aget``, ``acount``). Under ASGI the view then runs on the event loop and
+only the individual queries go to Django's database thread, instead of the
+whole request being pushed through ``sync_to_async``.
+
+Routes opt in by name through the ``BLOG_ASYNC_VIEWS`` setting, read once
+when urls.py is imported; ``manage.py benchmark_read_views`` compares both
+setups.
+"""
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage, Page
+from django.db.models import QuerySet
+from django.http import Http404
+
+from . import related, tagstats, threads, views
+from .search import search_with_fallback
+
+ASYNC_ROUTES = ('post_list', 'post_detail', 'posts_by_tag', 'tag_cloud', 'search_results')
+
+
+async def _afetch(results, start, stop):
+    """Load ``results[start:stop]`` for a QuerySet or a ranked list from search.py."""
+    if isinstance(results, QuerySet):
+        return [obj async for obj in results[start:stop]]
+    return await results.aslice(start, stop)
+
+
+class AsyncReadMixin:
+    """
+    Loads the user and session before anything else runs: the conditional
+    GET callbacks, the page cache and the templates read them synchronously.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        await request.session.akeys()
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class AsyncListMixin(AsyncReadMixin):
+    """
+    ``get()`` for ListViews: the page is loaded up front and handed to the
+    sync get_context_data() through paginate_queryset().
+    """
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        page_size = self.get_paginate_by(self.object_list)
+        self._loaded_page = await self.apaginate_queryset(self.object_list, page_size)
+        return self.render_to_response(self.get_context_data())
+
+    def paginate_queryset(self, queryset, page_size):
+        return self._loaded_page
+
+    async def apaginate_queryset(self, queryset, page_size):
+        if getattr(self, 'keyset_pagination', False):
+            return await super().apaginate_queryset(queryset, page_size)
+        paginator = self.get_paginator(
+            queryset, page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        paginator.count = await queryset.acount()
+        page = self.kwargs.get(self.page_kwarg) or self.request.GET.get(self.page_kwarg) or 1
+        try:
+            number = paginator.num_pages if page == 'last' else int(page)
+            number = paginator.validate_number(number)
+        except (ValueError, InvalidPage):
+            raise Http404("Invalid page.")
+        bottom = (number - 1) * paginator.per_page
+        top = bottom + paginator.per_page
+        if top + paginator.orphans >= paginator.count:
+            top = paginator.count
+        page = Page(await _afetch(queryset, bottom, top), number, paginator)
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+
+# --- Views ------------------------------------------------------------------
+class PostListView(AsyncListMixin, views.PostListView):
+    pass
+
+
+class PostDetailView(AsyncReadMixin, views.PostDetailView):
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        comment_page = await threads.acomment_page(self.object.pk)
+        related_posts = await related.arelated_posts(self.object.pk)
+        return self.render_to_response(self.get_context_data(
+            object=self.object, comment_page=comment_page, related_posts=related_posts,
+        ))
+
+    async def aget_object(self):
+        try:
+            return await self.get_queryset().aget(pk=self.kwargs.get(self.pk_url_kwarg))
+        except self.model.DoesNotExist:
+            raise Http404("No post found matching the query.")
+
+
+class TagListView(AsyncListMixin, views.TagListView):
+    pass
+
+
+class PostByTagListView(AsyncListMixin, views.PostByTagListView):
+    pass
+
+
+class SearchResultsView(AsyncListMixin, views.SearchResultsView):
+
+    async def get(self, request, *args, **kwargs):
+        # The FTS count and a trigram index load are sync-only.
+        self.search = await sync_to_async(search_with_fallback)(request.GET.get('q', ''))
+        return await super().get(request, *args, **kwargs)
+
+
+class TagCloudView(AsyncReadMixin, views.TagCloudView):
+
+    async def get(self, request, *args, **kwargs):
+        tags = await tagstats.acloud()
+        return self.render_to_response(self.get_context_data(tags=tags, **kwargs))
@@ -0,0 +1,201 @@
+# Alx_DjangoLearnLab/django_blog/blog/autocomplete.py
+"""
+In-process prefix index for search-as-you-type suggestions.
+
+Post titles and tag names are folded (casefolded, whitespace collapsed)
+and indexed under every word start, so "dj" finds "Django tips" and "Intro
+to Django" alike. The index is two parallel lists sorted by key: ``keys``
+(folded suffixes, cut to MAX_KEY_LENGTH) and ``refs`` (the ``(kind, pk)``
+they belong to). A lookup bisects to the prefix and scans forward, so it
+costs O(log n) plus the matches looked at, with no query.
+
+The index is loaded with one streaming query (posts UNION tags) on the
+first lookup, so startup and management commands never touch the
+database for it. It is patched from signals after the write commits (see
+signals.py), and dropped by bulk writes that send no signals (importer.py).
+Like tagindex.py, other processes notice writes through a shared
+generation counter in the Django cache and reload when someone else wrote.
+"""
+import re
+import threading
+from bisect import bisect_left
+
+from django.core.cache import cache
+from django.db.models import CharField, Value
+from django.urls import reverse
+
+from taggit.models import Tag
+
+from .models import Post
+
+MAX_KEY_LENGTH = 64
+MAX_SUGGESTIONS = 10
+# Matches looked at per lookup; bounds the scan for short prefixes.
+MAX_SCAN = 200
+MIN_PREFIX_LENGTH = 2
+
+POST, TAG = 'post', 'tag'
+# Tags first: a tag page covers more than one post.
+KIND_ORDER = {TAG: 0, POST: 1}
+
+_GENERATION_KEY = 'blog:autocomplete:generation'
+_WORD_START_RE = re.compile(r'(?<!\w)\w')
+
+
+def fold(text):
+    return ' '.join(text.casefold().split())
+
+
+def index_keys(label):
+    folded = fold(label)
+    starts = (m.start() for m in _WORD_START_RE.finditer(folded))
+    return sorted({folded[start:start + MAX_KEY_LENGTH] for start in starts})
+
+
+def _rows():
+    """(kind, pk, label, slug) for every post and tag, in one query."""
+    posts = Post.objects.order_by().annotate(
+        kind=Value(POST, output_field=CharField()), slug=Value('', output_field=CharField())
+    ).values_list('kind', 'pk', 'title', 'slug')
+    tags = Tag.objects.order_by().annotate(
+        kind=Value(TAG, output_field=CharField())
+    ).values_list('kind', 'pk', 'name', 'slug')
+    return posts.union(tags, all=True).iterator(chunk_size=2000)
+
+
+class PrefixIndex:
+
+    def __init__(self):
+        self.keys = []
+        self.refs = []
+        self.items = {}
+        self.loaded = False
+        self._generation = None
+        self._lock = threading.Lock()
+
+    # --- cross-process invalidation (see tagindex.py) ---
+    def _shared_generation(self):
+        generation = cache.get(_GENERATION_KEY)
+        if generation is None:
+            cache.add(_GENERATION_KEY, 0, None)
+            generation = cache.get(_GENERATION_KEY)
+        return generation
+
+    def _advance(self):
+        """Record a local write. Returns False if another process also wrote."""
+        self._shared_generation()
+        try:
+            generation = cache.incr(_GENERATION_KEY)
+        except ValueError:
+            generation = None
+        in_step = generation is not None and generation == (self._generation or 0) + 1
+        self._generation = generation
+        return in_step
+
+    def _reset(self):
+        self.keys, self.refs, self.items = [], [], {}
+        self.loaded = False
+
+    # --- building ---
+    def load(self):
+        """(Re)build from the database. Returns the number of entries."""
+        with self._lock:
+            self._reset()
+            self._generation = self._shared_generation()
+            pairs = []
+            for kind, pk, label, slug in _rows():
+                ref = (kind, pk)
+                self.items[ref] = (label, slug)
+                pairs.extend((key, ref) for key in index_keys(label))
+            pairs.sort()
+            self.keys = [key for key, _ in pairs]
+            self.refs = [ref for _, ref in pairs]
+            self.loaded = True
+            return len(self.items)
+
+    def _ensure_loaded(self):
+        if not self.loaded or self._shared_generation() != self._generation:
+            self.load()
+
+    # --- reads ---
+    def lookup(self, prefix, limit=MAX_SUGGESTIONS):
+        """
+        Up to ``limit`` ``(kind, pk, label, slug)`` matches for ``prefix``:
+        whole-label matches first, then tags before posts, shorter first.
+        """
+        prefix = fold(prefix)[:MAX_KEY_LENGTH]
+        if len(prefix) < MIN_PREFIX_LENGTH:
+            return []
+        self._ensure_loaded()
+        with self._lock:
+            matches = {}
+            i = bisect_left(self.keys, prefix)
+            end = min(i + MAX_SCAN, len(self.keys))
+            while i < end and self.keys[i].startswith(prefix):
+                ref = self.refs[i]
+                if ref not in matches:
+                    matches[ref] = self.items[ref]
+                i += 1
+
+        def rank(match):
+            (kind, _), (label, _) = match
+            return (not fold(label).startswith(prefix), KIND_ORDER[kind], len(label), label)
+
+        return [
+            (kind, pk, label, slug)
+            for (kind, pk), (label, slug) in sorted(matches.items(), key=rank)[:limit]
+        ]
+
+    def invalidate(self):
+        """Drop this process's index and tell the others to drop theirs."""
+        with self._lock:
+            self._advance()
+            self._reset()
+
+    # --- writes (called after commit) ---
+    def _remove(self, ref):
+        item = self.items.pop(ref, None)
+        if item is None:
+            return
+        for key in index_keys(item[0]):
+            i = bisect_left(self.keys, key)
+            while i < len(self.keys) and self.keys[i] == key:
+                if self.refs[i] == ref:
+                    del self.keys[i]
+                    del self.refs[i]
+                    break
+                i += 1
+
+    def _add(self, ref, label, slug):
+        self.items[ref] = (label, slug)
+        for key in index_keys(label):
+            i = bisect_left(self.keys, key)
+            self.keys.insert(i, key)
+            self.refs.insert(i, ref)
+
+    def apply(self, upserted=(), removed=()):
+        """
+        ``upserted`` holds ``(kind, pk, label, slug)`` tuples, ``removed``
+        holds ``(kind, pk)`` refs.
+        """
+        with self._lock:
+            # Advance even when not loaded, so other processes reload.
+            if not self._advance() or not self.loaded:
+                self._reset()
+                return
+            for ref in removed:
+                self._remove(ref)
+            for kind, pk, label, slug in upserted:
+                ref = (kind, pk)
+                if self.items.get(ref) != (label, slug):
+                    self._remove(ref)
+                    self._add(ref, label, slug)
+
+
+prefix_index = PrefixIndex()
+
+
+def suggestion_url(kind, pk, slug):
+    if kind == TAG:
+        return reverse('blog:posts_by_tag', kwargs={'tag_slug': slug})
+    return reverse('blog:post_detail', kwargs={'pk': pk})
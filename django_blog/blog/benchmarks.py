@@ -0,0 +1,340 @@
+# Alx_DjangoLearnLab/django_blog/blog/benchmarks.py
+"""
+Benchmarks used by ``manage.py benchmark_read_views``,
+``manage.py benchmark_related_posts``, ``manage.py benchmark_autocomplete``
+and ``manage.py benchmark_throttle``.
+
+Read views: requests are fed straight into Django's handlers, in-process,
+with no network server in the way:
+
+* ``wsgi``: WSGIHandler + sync views, one thread per concurrent client
+  (like a threaded WSGI server);
+* ``asgi``: ASGIHandler + async views (async_views.py), one task per
+  concurrent client on a single event loop;
+* ``asgi-sync``: ASGIHandler + sync views, i.e. the sync_to_async
+  hop that the async views avoid.
+
+The load generator shares the process (and the GIL) with the server, so
+absolute numbers are lower than behind gunicorn/uvicorn; the modes are
+compared like for like.
+
+Related posts: time to rescore one post (what a tag change costs, see
+related.py), to look up a post's related list, and optionally to rebuild
+everything, on the current database.
+
+Autocomplete: time to build the prefix index (autocomplete.py), the memory
+it retains per entry, and lookup latency for prefixes of indexed keys.
+
+Throttling: cost of one throttle check (throttling.py) against the
+configured cache, for a user and IP bucket that never run dry.
+"""
+import asyncio
+import gc
+import importlib
+import io
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import cycle, islice
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.test.utils import override_settings
+from django.urls import clear_url_caches
+
+from . import related, throttling
+from .autocomplete import PrefixIndex
+from .async_views import ASYNC_ROUTES
+from .models import Post
+
+HOST = 'localhost'
+
+# mode -> routes served by the async views
+MODES = {
+    'wsgi': (),
+    'asgi': ASYNC_ROUTES,
+    'asgi-sync': (),
+}
+
+
+def _reload_urls():
+    from . import urls
+    importlib.reload(urls)
+    # The root URLconf's include() resolver caches the old patterns.
+    importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+    clear_url_caches()
+
+
+@contextmanager
+def use_async_views(names=ASYNC_ROUTES):
+    """
+    Serve the ``names`` routes with the async views inside the block, by
+    re-importing the URLconf under another BLOG_ASYNC_VIEWS. For benchmarks
+    and tests only.
+    """
+    try:
+        with override_settings(BLOG_ASYNC_VIEWS=tuple(names)):
+            _reload_urls()
+            yield
+    finally:
+        _reload_urls()
+
+
+def _percentile(values, p):
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100)[p - 1]
+
+
+@dataclass
+class Result:
+    mode: str
+    requests: int
+    concurrency: int
+    seconds: float
+    latencies: list
+    errors: int
+
+    @property
+    def rate(self):
+        return self.requests / self.seconds if self.seconds else 0.0
+
+    def percentile(self, p):
+        return _percentile(self.latencies, p)
+
+    def summary(self):
+        return (
+            f"{self.mode:<10} {self.rate:8.0f} req/s  "
+            f"p50 {self.percentile(50) * 1000:7.1f} ms  "
+            f"p99 {self.percentile(99) * 1000:7.1f} ms  "
+            f"errors {self.errors}"
+        )
+
+
+# --- WSGI -------------------------------------------------------------------
+def _wsgi_request(handler, url):
+    parts = urlsplit(url)
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': parts.path,
+        'QUERY_STRING': parts.query,
+        'SCRIPT_NAME': '',
+        'SERVER_NAME': HOST,
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': HOST,
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    status = []
+    started = time.perf_counter()
+    body = handler(environ, lambda s, headers, exc_info=None: status.append(s))
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    return time.perf_counter() - started, status[0].startswith('200')
+
+
+def _run_wsgi(urls, concurrency):
+    handler = WSGIHandler()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(lambda url: _wsgi_request(handler, url), urls))
+
+
+# --- ASGI -------------------------------------------------------------------
+async def _asgi_request(handler, url):
+    parts = urlsplit(url)
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': parts.path,
+        'raw_path': parts.path.encode(),
+        'query_string': parts.query.encode(),
+        'root_path': '',
+        'headers': [(b'host', HOST.encode())],
+        'client': ('127.0.0.1', 0),
+        'server': (HOST, 80),
+    }
+    disconnected = asyncio.Event()
+    sent = []
+
+    async def receive():
+        if not sent:
+            sent.append(None)
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    status = []
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    started = time.perf_counter()
+    try:
+        await handler(scope, receive, send)
+    finally:
+        disconnected.set()
+    return time.perf_counter() - started, status[0] == 200
+
+
+async def _run_asgi(urls, concurrency):
+    handler = ASGIHandler()
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(url):
+        async with gate:
+            return await _asgi_request(handler, url)
+
+    return await asyncio.gather(*(one(url) for url in urls))
+
+
+# --- Entry point ------------------------------------------------------------
+def run(mode, paths, requests=1000, concurrency=100):
+    """Fire ``requests`` GETs over ``paths`` with ``concurrency`` in flight."""
+    urls = list(islice(cycle(paths), requests))
+    with use_async_views(MODES[mode]):
+        # Warm caches and imports so every mode starts from the same state.
+        if mode == 'wsgi':
+            _run_wsgi(paths, 1)
+            started = time.perf_counter()
+            outcomes = _run_wsgi(urls, concurrency)
+        else:
+            asyncio.run(_run_asgi(paths, 1))
+            started = time.perf_counter()
+            outcomes = asyncio.run(_run_asgi(urls, concurrency))
+        seconds = time.perf_counter() - started
+    return Result(
+        mode=mode,
+        requests=len(urls),
+        concurrency=concurrency,
+        seconds=seconds,
+        latencies=[latency for latency, _ in outcomes],
+        errors=sum(1 for _, ok in outcomes if not ok),
+    )
+
+
+# --- Related posts ----------------------------------------------------------
+@dataclass
+class Timings:
+    name: str
+    seconds: list
+
+    def summary(self):
+        mean = statistics.fmean(self.seconds) if self.seconds else 0.0
+        return (
+            f"{self.name:<10} n={len(self.seconds):<6} "
+            f"mean {mean * 1000:7.2f} ms  "
+            f"p50 {_percentile(self.seconds, 50) * 1000:7.2f} ms  "
+            f"p99 {_percentile(self.seconds, 99) * 1000:7.2f} ms"
+        )
+
+
+def _time(name, calls):
+    seconds = []
+    for call in calls:
+        started = time.perf_counter()
+        call()
+        seconds.append(time.perf_counter() - started)
+    return Timings(name, seconds)
+
+
+def related_posts(samples=200, rebuild=False):
+    """Time related-post maintenance and lookups over ``samples`` random posts."""
+    post_ids = list(Post.objects.order_by('?').values_list('pk', flat=True)[:samples])
+    results = []
+    if rebuild:
+        results.append(_time('rebuild', [related.rebuild]))
+    # force=True rescores the post and walks its neighbours' lists, as if
+    # its features had changed.
+    results.append(_time(
+        'refresh', [lambda pk=pk: related.refresh([pk], force=True) for pk in post_ids]
+    ))
+    results.append(_time('lookup', [lambda pk=pk: related.related_posts(pk) for pk in post_ids]))
+    return results
+
+
+# --- Autocomplete -----------------------------------------------------------
+@dataclass
+class IndexReport:
+    entries: int
+    keys: int
+    build_seconds: float
+    retained_bytes: int
+    lookups: Timings
+
+    def summary(self):
+        per_entry = self.retained_bytes / self.entries if self.entries else 0
+        build_ms = self.build_seconds * 1000
+        return (
+            f"build      {self.entries} entries, {self.keys} keys in {build_ms:.0f} ms\n"
+            f"memory     {self.retained_bytes / 1024:.0f} KiB, {per_entry:.0f} bytes/entry\n"
+            f"{self.lookups.summary()}"
+        )
+
+
+def autocomplete(lookups=5000, seed=0):
+    """Build a fresh prefix index and time ``lookups`` random prefixes on it."""
+    index = PrefixIndex()
+    started = time.perf_counter()
+    entries = index.load()
+    build_seconds = time.perf_counter() - started
+
+    # Again under tracemalloc (which slows it down) for the retained size.
+    del index
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        index = PrefixIndex()
+        index.load()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    rng = random.Random(seed)
+    prefixes = [
+        key[:rng.randint(2, 6)] for key in rng.choices(index.keys, k=lookups)
+    ] if index.keys else []
+    timings = _time('lookup', [lambda prefix=prefix: index.lookup(prefix) for prefix in prefixes])
+    return IndexReport(entries, len(index.keys), build_seconds, retained, timings)
+
+
+# --- Throttling -------------------------------------------------------------
+def throttle(checks=10000, clients=100):
+    """Time ``checks`` token takes spread over ``clients`` user/IP bucket pairs."""
+    # Never empty, so every check does the full read-modify-write.
+    rate = throttling.Rate(tokens=checks, period=1)
+    buckets = [
+        {f'bench:throttle:user:{i}': rate, f'bench:throttle:ip:{i}': rate}
+        for i in range(clients)
+    ]
+    timings = _time('check', [
+        lambda pair=pair: throttling.take(pair) for pair in islice(cycle(buckets), checks)
+    ])
+    for pair in buckets:
+        cache.delete_many(list(pair))
+    return timings
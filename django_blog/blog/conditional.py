@@ -0,0 +1,150 @@
+# Alx_DjangoLearnLab/django_blog/blog/conditional.py
+"""
+Conditional GET (ETag / Last-Modified) for the blog read views.
+
+Validators are computed before the view runs, so a matching
+If-None-Match / If-Modified-Since is answered with 304 without running the
+list queries or rendering a template:
+
+* list, tag and search pages use the global content stamp (versions.py),
+  i.e. no database query at all;
+* the detail page uses one aggregate query over the post and its comments
+  plus the post and author stamps.
+
+The requesting user is part of every ETag because pages contain per-user
+links; pages with pending flash messages are never validated.
+
+The mixins also serve the async views (async_views.py): validators are then
+resolved with the async ORM before ``condition()`` runs.
+"""
+import hashlib
+
+from django.db.models import Max
+from django.views.decorators.http import condition
+
+from . import versions
+from .models import Post
+
+
+def _digest(*parts):
+    return hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def _viewer(request):
+    return request.user.pk if request.user.is_authenticated else 'anon'
+
+
+def has_pending_messages(request):
+    storage = getattr(request, '_messages', None)
+    return storage is not None and len(storage) > 0
+
+
+class ConditionalGetMixin:
+    """
+    Wraps dispatch() in django.views.decorators.http.condition. Subclasses
+    implement ``get_content_validators(request, **kwargs)`` returning
+    ``(content_key, last_modified)`` for what the page shows, independent of
+    the viewer; ``(None, None)`` disables validation. The ETag is the content
+    key combined with the viewer.
+    """
+
+    def get_content_validators(self, request, **kwargs):
+        raise NotImplementedError
+
+    async def aget_content_validators(self, request, **kwargs):
+        # Validators that need no database query serve both paths.
+        return self.get_content_validators(request, **kwargs)
+
+    def content_validators(self, request, **kwargs):
+        cached = getattr(request, '_blog_validators', None)
+        if cached is None:
+            cached = self.get_content_validators(request, **kwargs)
+            request._blog_validators = cached
+        return cached
+
+    async def acontent_validators(self, request, **kwargs):
+        cached = getattr(request, '_blog_validators', None)
+        if cached is None:
+            cached = await self.aget_content_validators(request, **kwargs)
+            request._blog_validators = cached
+        return cached
+
+    def _etag_func(self, request, *args, **kwargs):
+        if has_pending_messages(request):
+            return None
+        content_key = self.content_validators(request, **kwargs)[0]
+        return content_key and _digest(content_key, _viewer(request))
+
+    def _last_modified_func(self, request, *args, **kwargs):
+        if has_pending_messages(request):
+            return None
+        return self.content_validators(request, **kwargs)[1]
+
+    def _condition(self):
+        return condition(etag_func=self._etag_func, last_modified_func=self._last_modified_func)
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self._adispatch_conditional(request, *args, **kwargs)
+        return self._condition()(super().dispatch)(request, *args, **kwargs)
+
+    async def _adispatch_conditional(self, request, *args, **kwargs):
+        # Memoize the validators first so condition()'s sync callbacks
+        # never touch the database.
+        await self.acontent_validators(request, **kwargs)
+        parent = super().dispatch
+
+        async def view(request, *args, **kwargs):
+            return await parent(request, *args, **kwargs)
+
+        return await self._condition()(view)(request, *args, **kwargs)
+
+
+class ContentVersionConditionalMixin(ConditionalGetMixin):
+    """Validators for pages derived from the whole post table."""
+
+    def get_content_validators(self, request, **kwargs):
+        version = versions.content_version()
+        content_key = _digest(
+            request.resolver_match.view_name,
+            sorted(kwargs.items()),
+            sorted(request.GET.lists()),
+            version,
+        )
+        return content_key, versions.as_datetime(version)
+
+
+class PostConditionalMixin(ConditionalGetMixin):
+    """Validators for a single post page (post, its comments and author)."""
+
+    def _validator_rows(self, pk):
+        return (
+            Post.objects.filter(pk=pk).order_by()
+            .values('author_id', 'published_date', 'comment_count')
+            .annotate(last_comment=Max('comments__updated_at'))[:1]
+        )
+
+    def _validators_from_row(self, pk, row):
+        if row is None:
+            # Let the view raise its 404.
+            return None, None
+        author_id, published = row['author_id'], row['published_date']
+        comment_count, last_comment = row['comment_count'], row['last_comment']
+        post_ver = versions.post_version(pk)
+        author_ver = versions.author_version(author_id)
+        content_key = _digest(pk, post_ver, author_ver, comment_count, last_comment)
+        last_modified = max(
+            d for d in (
+                published, last_comment,
+                versions.as_datetime(post_ver), versions.as_datetime(author_ver),
+            ) if d is not None
+        )
+        return content_key, last_modified
+
+    def get_content_validators(self, request, pk=None, **kwargs):
+        rows = list(self._validator_rows(pk))
+        return self._validators_from_row(pk, rows[0] if rows else None)
+
+    async def aget_content_validators(self, request, pk=None, **kwargs):
+        rows = [row async for row in self._validator_rows(pk)]
+        return self._validators_from_row(pk, rows[0] if rows else None)
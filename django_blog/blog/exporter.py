@@ -0,0 +1,134 @@
+# Alx_DjangoLearnLab/django_blog/blog/exporter.py
+"""
+Streaming export of posts and comments as NDJSON or CSV.
+
+Rows are read with ``.iterator(chunk_size=...)`` and tags are joined once per
+chunk, so memory stays flat however large the tables are. The output is a
+generator of byte strings, optionally gzip-compressed on the fly; it backs
+both the staff export views and ``manage.py export_blog``.
+"""
+import csv
+import re
+import zlib
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+
+from taggit.models import TaggedItem
+
+from .importer import batched
+from .models import Post, Comment
+
+CHUNK_SIZE = 2000
+
+POST_FIELDS = ['id', 'title', 'content', 'author', 'published_date', 'comment_count', 'tags']
+COMMENT_FIELDS = [
+    'id', 'post_id', 'parent_id', 'author', 'content', 'is_removed', 'created_at', 'updated_at',
+]
+
+# An RFC 9110 qvalue: 0 to 1 with at most three decimals.
+_Q_RE = re.compile(r'^q=(0(?:\.\d{0,3})?|1(?:\.0{0,3})?)$', re.IGNORECASE)
+
+
+def _tags_for(post_ids):
+    tags = {}
+    rows = TaggedItem.objects.filter(
+        content_type=ContentType.objects.get_for_model(Post), object_id__in=post_ids
+    ).values_list('object_id', 'tag__name')
+    for object_id, name in rows:
+        tags.setdefault(object_id, []).append(name)
+    return tags
+
+
+def post_rows(chunk_size=CHUNK_SIZE):
+    qs = Post.objects.order_by('pk').values_list(
+        'pk', 'title', 'content', 'author__username', 'published_date', 'comment_count'
+    )
+    for chunk in batched(qs.iterator(chunk_size=chunk_size), chunk_size):
+        tags = _tags_for([row[0] for row in chunk])
+        for row in chunk:
+            yield dict(zip(POST_FIELDS, (*row, sorted(tags.get(row[0], [])))))
+
+
+def comment_rows(chunk_size=CHUNK_SIZE):
+    qs = Comment.objects.order_by('pk').values_list(
+        'pk', 'post_id', 'parent_id', 'author__username', 'content', 'is_removed',
+        'created_at', 'updated_at',
+    )
+    for row in qs.iterator(chunk_size=chunk_size):
+        yield dict(zip(COMMENT_FIELDS, row))
+
+
+EXPORTS = {
+    'posts': (post_rows, POST_FIELDS),
+    'comments': (comment_rows, COMMENT_FIELDS),
+}
+
+
+def encoding_qualities(header):
+    """
+    {coding: q-value} from an Accept-Encoding header, codings lowercased.
+    A coding with a malformed q-value gets 0, i.e. is not acceptable.
+    """
+    qualities = {}
+    for part in header.split(','):
+        name, *params = [p.strip() for p in part.split(';')]
+        q = 1.0
+        for param in params:
+            if param[:2].lower() == 'q=':
+                match = _Q_RE.match(param)
+                q = float(match.group(1)) if match else 0.0
+        if name:
+            qualities[name.lower()] = q
+    return qualities
+
+
+def accepts_encoding(header, coding):
+    """
+    Whether an Accept-Encoding header allows ``coding``: listed, or covered
+    by ``*``, with a q-value above zero.
+    """
+    qualities = encoding_qualities(header)
+    return qualities.get(coding, qualities.get('*', 0)) > 0
+
+
+class _Echo:
+    """File-like object whose write() just returns the line (csv.writer sink)."""
+
+    def write(self, value):
+        return value
+
+
+def ndjson_lines(rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield (encoder.encode(row) + '\n').encode('utf-8')
+
+
+def csv_lines(rows, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields).encode('utf-8')
+    for row in rows:
+        if isinstance(row.get('tags'), list):
+            row['tags'] = ', '.join(row['tags'])
+        values = [v.isoformat() if hasattr(v, 'isoformat') else v for v in row.values()]
+        yield writer.writerow(values).encode('utf-8')
+
+
+def gzip_stream(chunks, level=6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(kind, fmt='ndjson', gzip=False, chunk_size=CHUNK_SIZE):
+    """Byte chunks for the ``kind`` ('posts'/'comments') export."""
+    rows_func, fields = EXPORTS[kind]
+    rows = rows_func(chunk_size)
+    lines = csv_lines(rows, fields) if fmt == 'csv' else ndjson_lines(rows)
+    # Group lines so each yielded chunk is a reasonable write size.
+    chunks = (b''.join(group) for group in batched(lines, 256))
+    return gzip_stream(chunks) if gzip else chunks
@@ -0,0 +1,147 @@
+# Alx_DjangoLearnLab/django_blog/blog/feeds.py
+"""
+Atom feeds for the whole blog, per author and per tag.
+
+The feeds are ordinary django.contrib.syndication Feed classes, but they are
+served through ``cached_feed()``: the generated document is stored in the
+cache together with its ETag and Last-Modified, so a poll costs one cache
+lookup and is answered with 304 or a streamed copy of the stored bytes.
+Last-Modified is the newest entry's publish date, as the Feed view sets it,
+so regenerating an unchanged feed does not make it look new.
+Entries are regenerated only after a post in that feed changes; signals.py
+deletes the affected keys (site, author, tags) once the write commits.
+"""
+import hashlib
+
+from django.contrib.auth.models import User
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, parse_http_date, quote_etag
+
+from taggit.models import Tag
+
+from .models import Post
+
+FEED_SIZE = 20
+FEED_TIMEOUT = 60 * 60
+CHUNK_SIZE = 8192
+
+
+class LatestPostsFeed(Feed):
+    feed_type = Atom1Feed
+    title = "Django Blog"
+    subtitle = "Latest posts"
+    cache_name = 'site'
+
+    def link(self):
+        return reverse('blog:post_list')
+
+    def base_queryset(self, obj):
+        return Post.objects.all()
+
+    def items(self, obj=None):
+        return (
+            self.base_queryset(obj).select_related('author').defer('content')
+            .order_by('-published_date', '-pk')[:FEED_SIZE]
+        )
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.excerpt
+
+    def item_author_name(self, item):
+        return item.author.username
+
+    def item_pubdate(self, item):
+        return item.published_date
+
+
+class AuthorPostsFeed(LatestPostsFeed):
+    cache_name = 'author'
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f"Django Blog: posts by {obj.username}"
+
+    def link(self, obj):
+        return reverse('blog:author_feed', kwargs={'username': obj.username})
+
+    def base_queryset(self, obj):
+        return Post.objects.filter(author=obj)
+
+
+class TagPostsFeed(LatestPostsFeed):
+    cache_name = 'tag'
+
+    def get_object(self, request, tag_slug):
+        return get_object_or_404(Tag, slug=tag_slug)
+
+    def title(self, obj):
+        return f'Django Blog: posts tagged "{obj.name}"'
+
+    def link(self, obj):
+        return reverse('blog:posts_by_tag', kwargs={'tag_slug': obj.slug})
+
+    def base_queryset(self, obj):
+        return Post.objects.filter(tags=obj)
+
+
+# --- Cache ------------------------------------------------------------------
+def feed_key(name, value=''):
+    return f'blog:feed:{name}:{value}'
+
+
+def invalidate(site=True, author_username=None, tag_slugs=()):
+    """Drop the cached site feed and the given author and tag feeds."""
+    keys = [feed_key('site')] if site else []
+    if author_username:
+        keys.append(feed_key('author', author_username))
+    keys.extend(feed_key('tag', slug) for slug in tag_slugs)
+    cache.delete_many(keys)
+
+
+def _chunks(body):
+    for start in range(0, len(body), CHUNK_SIZE):
+        yield body[start:start + CHUNK_SIZE]
+
+
+def cached_feed(feed_class):
+    """Wrap a Feed class into a cached, conditional, streaming view."""
+    feed = feed_class()
+
+    def view(request, **kwargs):
+        key = feed_key(feed_class.cache_name, next(iter(kwargs.values()), ''))
+        entry = cache.get(key)
+        if entry is None:
+            generated = feed(request, **kwargs)
+            body = generated.content
+            entry = {
+                'body': body,
+                'content_type': generated['Content-Type'],
+                'etag': quote_etag(hashlib.md5(body, usedforsecurity=False).hexdigest()),
+                'last_modified': parse_http_date(generated['Last-Modified']),
+            }
+            cache.set(key, entry, FEED_TIMEOUT)
+
+        response = StreamingHttpResponse(_chunks(entry['body']), content_type=entry['content_type'])
+        response['ETag'] = entry['etag']
+        response['Last-Modified'] = http_date(entry['last_modified'])
+        return get_conditional_response(
+            request, etag=entry['etag'], last_modified=entry['last_modified'], response=response
+        )
+
+    return view
+
+
+site_feed = cached_feed(LatestPostsFeed)
+author_feed = cached_feed(AuthorPostsFeed)
+tag_feed = cached_feed(TagPostsFeed)
@@ -0,0 +1,63 @@
+# Alx_DjangoLearnLab/django_blog/blog/fragments.py
+"""
+Rendered-fragment cache for posts.
+
+The list summary of a post is cached as HTML under a key made of the post
+id plus version stamps (see versions.py), so stale fragments are never
+read again and simply age out of the cache. (The detail body needs no
+cache: it is stored pre-rendered in Post.content_html.)
+
+Hit/miss counters are kept per process; see ``stats()`` and the staff-only
+``blog:fragment_cache_stats`` view.
+"""
+import threading
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+
+from .versions import author_version, post_version
+
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+# --- Fragments --------------------------------------------------------------
+def _record(hit):
+    with _stats_lock:
+        _stats['hits' if hit else 'misses'] += 1
+
+
+def stats():
+    with _stats_lock:
+        hits, misses = _stats['hits'], _stats['misses']
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else None,
+    }
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats['hits'] = _stats['misses'] = 0
+
+
+def _cached(key, template_name, context):
+    html = cache.get(key)
+    _record(html is not None)
+    if html is None:
+        html = render_to_string(template_name, context)
+        cache.set(key, html, FRAGMENT_TIMEOUT)
+    return html
+
+
+def post_summary(post):
+    """Title, byline and excerpt as shown on list pages."""
+    key = 'blog:frag:summary:%s:%s:%s:%s' % (
+        post.pk, post_version(post.pk), author_version(post.author_id), post.comment_count
+    )
+    return _cached(key, 'blog/_post_summary.html', {'post': post})
+
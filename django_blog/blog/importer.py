@@ -0,0 +1,189 @@
+# Alx_DjangoLearnLab/django_blog/blog/importer.py
+"""
+Bulk post import used by ``manage.py import_posts``.
+
+Records are streamed from a JSONL or CSV file and handled in batches: the
+batch's authors and tags are resolved with one query each (missing tags,
+and optionally missing authors, are bulk-created), then posts and their
+TaggedItem rows are inserted with bulk_create inside one transaction per
+batch.
+
+bulk_create sends no signals, so nothing derived (search index, tag stats,
+related posts, trending scores, profiles, caches, in-memory indexes) is
+touched per row; ``finish()`` rebuilds all of it once at the end.
+
+Record fields: ``title``, ``content``, ``author`` (username), optional
+``tags`` (list, or a comma-separated string in CSV) and ``published_date``
+(ISO 8601).
+"""
+import csv
+import json
+import time
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from taggit.models import Tag, TaggedItem
+from taggit.utils import parse_tags
+
+from . import autocomplete, feeds, profiles, related, search, tagstats, trending, versions
+from .models import Post
+from .tagindex import posting_cache
+from .trigrams import trigram_index
+
+
+def read_records(path, fmt=None):
+    """Yield dict records from a .jsonl or .csv file without loading it."""
+    fmt = fmt or ('csv' if str(path).endswith('.csv') else 'jsonl')
+    with open(path, newline='', encoding='utf-8') as fh:
+        if fmt == 'csv':
+            yield from csv.DictReader(fh)
+        else:
+            for line in fh:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _tag_names(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        return parse_tags(value)
+    return [str(v).strip() for v in value if str(v).strip()]
+
+
+class PostImporter:
+
+    def __init__(self, create_authors=False, stdout=None):
+        self.create_authors = create_authors
+        self.stdout = stdout
+        self.post_type = ContentType.objects.get_for_model(Post)
+        self.imported = 0
+        self.skipped = 0
+        self.created_users = []
+        self.authors_touched = set()
+        self.tags_touched = set()
+        self.started = time.monotonic()
+
+    # --- resolution ---
+    def _authors(self, usernames):
+        users = dict(User.objects.filter(username__in=usernames).values_list('username', 'pk'))
+        missing = [name for name in usernames if name not in users]
+        if missing and self.create_authors:
+            new = [User(username=name) for name in missing]
+            for user in new:
+                user.set_unusable_password()
+            User.objects.bulk_create(new, ignore_conflicts=True)
+            created = dict(
+                User.objects.filter(username__in=missing).values_list('username', 'pk')
+            )
+            self.created_users.extend(created.values())
+            users.update(created)
+        return users
+
+    def _tags(self, names):
+        tags = dict(Tag.objects.filter(name__in=names).values_list('name', 'pk'))
+        missing = [name for name in names if name not in tags]
+        if missing:
+            taken = set(
+                Tag.objects.filter(slug__in=[Tag().slugify(n) for n in missing])
+                .values_list('slug', flat=True)
+            )
+            new = []
+            for name in missing:
+                slug, i = Tag().slugify(name), 1
+                while slug in taken:
+                    slug, i = Tag().slugify(name, i), i + 1
+                taken.add(slug)
+                new.append(Tag(name=name, slug=slug))
+            Tag.objects.bulk_create(new, ignore_conflicts=True)
+            tags.update(Tag.objects.filter(name__in=missing).values_list('name', 'pk'))
+        return tags
+
+    # --- batches ---
+    def import_batch(self, records):
+        usernames = {r.get('author') for r in records} - {None, ''}
+        authors = self._authors(usernames)
+        tag_names = {name for r in records for name in _tag_names(r.get('tags'))}
+        tags = self._tags(tag_names) if tag_names else {}
+
+        posts, post_tags, dated = [], [], []
+        for record in records:
+            author_id = authors.get(record.get('author', ''))
+            if author_id is None or not record.get('title'):
+                self.skipped += 1
+                continue
+            post = Post(title=record['title'], content=record.get('content', ''), author_id=author_id)
+            post.refresh_derived_fields()
+            published = record.get('published_date')
+            published = parse_datetime(published) if published else None
+            if published is not None and timezone.is_naive(published):
+                published = timezone.make_aware(published)
+            posts.append(post)
+            post_tags.append(_tag_names(record.get('tags')))
+            dated.append(published)
+            self.authors_touched.add(record['author'])
+
+        with transaction.atomic():
+            Post.objects.bulk_create(posts)
+            # auto_now_add overrides dates on insert; restore archive dates.
+            redated = []
+            for post, published in zip(posts, dated):
+                if published is not None:
+                    post.published_date = published
+                    redated.append(post)
+            if redated:
+                Post.objects.bulk_update(redated, ['published_date'])
+            TaggedItem.objects.bulk_create(
+                [
+                    TaggedItem(content_type=self.post_type, object_id=post.pk, tag_id=tags[name])
+                    for post, names in zip(posts, post_tags)
+                    for name in set(names)
+                ],
+                ignore_conflicts=True,
+            )
+        for names in post_tags:
+            self.tags_touched.update(names)
+        self.imported += len(posts)
+        self._report()
+
+    def rate(self):
+        elapsed = time.monotonic() - self.started
+        return self.imported / elapsed if elapsed else 0.0
+
+    def _report(self):
+        if self.stdout is not None:
+            self.stdout.write(f"{self.imported} posts imported ({self.rate():.0f} rows/s)")
+
+    # --- deferred side effects ---
+    def finish(self):
+        """Rebuild everything the per-row signals would have maintained."""
+        if self.created_users:
+            profiles.backfill(user_ids=self.created_users)
+        search.rebuild_index()
+        tagstats.rebuild()
+        related.rebuild()
+        trending.rebuild()
+        versions.bump_content_version()
+        posting_cache.apply(drop_all=True)
+        autocomplete.prefix_index.invalidate()
+        # Also advances the shared generation, so other processes rebuild.
+        trigram_index.invalidate()
+        keys = [feeds.feed_key('site')]
+        keys += [feeds.feed_key('author', name) for name in self.authors_touched]
+        for names in batched(self.tags_touched, 500):
+            slugs = Tag.objects.filter(name__in=names).values_list('slug', flat=True)
+            keys += [feeds.feed_key('tag', slug) for slug in slugs]
+        cache.delete_many(keys)
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog import versions
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = "Recompute the fields derived from Post.content in pk-ordered batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk, total = 0, 0
+        while True:
+            batch = list(
+                Post.objects.filter(pk__gt=last_pk).order_by('pk')
+                .only('pk', 'content')[:batch_size]
+            )
+            if not batch:
+                break
+            for post in batch:
+                post.refresh_derived_fields()
+            with transaction.atomic():
+                Post.objects.bulk_update(batch, Post.DERIVED_FIELDS)
+            # bulk_update() sends no signals; drop cached fragments and pages.
+            versions.bump_post_versions(post.pk for post in batch)
+            last_pk = batch[-1].pk
+            total += len(batch)
+        if total:
+            versions.bump_content_version()
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {total} posts."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog import profiles
+
+
+class Command(BaseCommand):
+    help = "Create the missing Profile rows for existing users."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = profiles.backfill(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Created {total} profiles."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog import benchmarks
+
+
+class Command(BaseCommand):
+    help = "Measure build time, memory per entry and lookup latency of the autocomplete index."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lookups', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.stdout.write(benchmarks.autocomplete(lookups=options['lookups']).summary())
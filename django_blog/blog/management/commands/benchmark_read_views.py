@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from blog import benchmarks
+
+
+class Command(BaseCommand):
+    help = "Compare sync WSGI and async ASGI throughput of the read views."
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=['/', '/tags/', '/search/?q=django'])
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=200)
+        parser.add_argument(
+            '--mode', action='append', choices=sorted(benchmarks.MODES),
+            help="Repeatable; defaults to every mode.",
+        )
+        parser.add_argument(
+            '--no-page-cache', action='store_true',
+            help="Disable the anonymous page cache so every request renders.",
+        )
+
+    def handle(self, *args, **options):
+        modes = options['mode'] or list(benchmarks.MODES)
+        self.stdout.write(
+            f"{options['requests']} requests, {options['concurrency']} concurrent, "
+            f"paths: {' '.join(options['paths'])}"
+        )
+        with override_settings(BLOG_ANONYMOUS_PAGE_CACHE=not options['no_page_cache']):
+            for mode in modes:
+                result = benchmarks.run(
+                    mode, options['paths'],
+                    requests=options['requests'], concurrency=options['concurrency'],
+                )
+                self.stdout.write(result.summary())
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from blog import benchmarks
+
+
+class Command(BaseCommand):
+    help = "Time related-post recomputation and lookups on the current data."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=200)
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help="Also time a full rebuild (rewrites every related list).",
+        )
+
+    def handle(self, *args, **options):
+        results = benchmarks.related_posts(samples=options['samples'], rebuild=options['rebuild'])
+        for timings in results:
+            self.stdout.write(timings.summary())
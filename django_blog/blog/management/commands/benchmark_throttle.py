@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog import benchmarks
+
+
+class Command(BaseCommand):
+    help = "Measure the cost of one write-throttle check against the configured cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--checks', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        self.stdout.write(benchmarks.throttle(checks=options['checks']).summary())
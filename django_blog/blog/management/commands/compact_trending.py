@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from blog import trending
+
+
+class Command(BaseCommand):
+    help = "Drop decayed trending scores and refresh the cached top posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help="First recompute every score from post and comment dates.",
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            total = trending.rebuild()
+            self.stdout.write(f"Rescored {total} posts.")
+        top = trending.compact()
+        self.stdout.write(self.style.SUCCESS(f"{len(top)} posts trending."))
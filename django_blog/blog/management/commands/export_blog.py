@@ -0,0 +1,30 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from blog.exporter import CHUNK_SIZE, EXPORTS, export_stream
+
+
+class Command(BaseCommand):
+    help = "Stream all posts or comments as NDJSON or CSV (optionally gzipped)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS))
+        parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--output', '-o', help="File to write (default: stdout).")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        stream = export_stream(
+            options['kind'], options['format'], options['gzip'], options['chunk_size']
+        )
+        if options['output']:
+            with open(options['output'], 'wb') as fh:
+                for chunk in stream:
+                    fh.write(chunk)
+        else:
+            out = getattr(self.stdout, 'buffer', None) or sys.stdout.buffer
+            for chunk in stream:
+                out.write(chunk)
+            out.flush()
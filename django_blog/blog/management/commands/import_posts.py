@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.importer import PostImporter, batched, read_records
+
+
+class Command(BaseCommand):
+    help = "Bulk-import posts from a JSONL or CSV file (see blog/importer.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['jsonl', 'csv'], default=None)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--create-authors', action='store_true',
+                            help="Create users for unknown author usernames.")
+        parser.add_argument('--skip-rebuild', action='store_true',
+                            help="Do not rebuild search index, tag stats and caches at the end.")
+
+    def handle(self, *args, **options):
+        importer = PostImporter(create_authors=options['create_authors'], stdout=self.stdout)
+        try:
+            records = read_records(options['path'], options['format'])
+            for batch in batched(records, options['batch_size']):
+                importer.import_batch(batch)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Import stopped after {importer.imported} posts: {exc}")
+        finally:
+            # Batches are committed as they go; a failed import still needs
+            # derived data for the posts it did commit.
+            if not options['skip_rebuild']:
+                self.stdout.write("Rebuilding derived data...")
+                importer.finish()
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {importer.imported} posts, skipped {importer.skipped} "
+            f"({importer.rate():.0f} rows/s)."
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog import tagstats
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized TagStats table from post tags."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = tagstats.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {total} tags."))
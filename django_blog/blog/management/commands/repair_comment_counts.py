@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Post, Comment
+
+
+class Command(BaseCommand):
+    help = "Recompute Post.comment_count (tombstones excluded) in one bulk UPDATE."
+
+    def handle(self, *args, **options):
+        counts = (
+            Comment.objects.filter(post=OuterRef('pk'), is_removed=False)
+            .order_by().values('post').annotate(c=Count('pk')).values('c')
+        )
+        with transaction.atomic():
+            stale = (
+                Post.objects.annotate(actual=Coalesce(Subquery(counts), 0))
+                .exclude(comment_count=F('actual'))
+                .count()
+            )
+            Post.objects.update(comment_count=Coalesce(Subquery(counts), 0))
+        self.stdout.write(self.style.SUCCESS(f"Repaired {stale} post comment counts."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from blog import rendering
+
+
+class Command(BaseCommand):
+    help = "Re-render Post.content_html for posts made by an older renderer."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Re-render every post.")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        total = rendering.rerender(everything=options['all'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-rendered {total} posts with {rendering.RENDERER}."
+        ))
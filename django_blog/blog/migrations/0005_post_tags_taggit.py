@@ -0,0 +1,69 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:00
+
+import taggit.managers
+from django.db import migrations
+from django.utils.text import slugify
+
+
+def copy_tags_to_taggit(apps, schema_editor):
+    """Recreate every old blog.Tag assignment as a taggit Tag/TaggedItem."""
+    OldTag = apps.get_model('blog', 'Tag')
+    Post = apps.get_model('blog', 'Post')
+    Tag = apps.get_model('taggit', 'Tag')
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+
+    Through = Post.tags.through
+    links = list(Through.objects.values_list('post_id', 'tag_id'))
+    if not links:
+        return
+    post_type, _ = ContentType.objects.get_or_create(app_label='blog', model='post')
+
+    new_ids = {}
+    taken = set(Tag.objects.values_list('slug', flat=True))
+    for old in OldTag.objects.filter(pk__in={tag_id for _, tag_id in links}):
+        tag = Tag.objects.filter(name=old.name).first()
+        if tag is None:
+            base = old.slug or slugify(old.name) or 'tag'
+            slug, i = base, 1
+            while slug in taken:
+                slug, i = f'{base}_{i}', i + 1
+            taken.add(slug)
+            tag = Tag.objects.create(name=old.name, slug=slug)
+        new_ids[old.pk] = tag.pk
+
+    TaggedItem.objects.bulk_create(
+        [
+            TaggedItem(content_type=post_type, object_id=post_id, tag_id=new_ids[tag_id])
+            for post_id, tag_id in links
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_tag_alter_profile_avatar_post_tags'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        # Post.tags moved from the local Tag model to django-taggit; an M2M
+        # cannot be altered in place, so copy the assignments over, then
+        # drop it and re-add the manager.
+        migrations.RunPython(copy_tags_to_taggit, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='post',
+            name='tags',
+        ),
+        migrations.DeleteModel(
+            name='Tag',
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='tags',
+            field=taggit.managers.TaggableManager(blank=True, help_text='A comma-separated list of tags.', through='taggit.TaggedItem', to='taggit.Tag', verbose_name='Tags'),
+        ),
+    ]
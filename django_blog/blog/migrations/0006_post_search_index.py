@@ -0,0 +1,38 @@
+from django.db import migrations
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts "
+        "USING fts5(title, content, tags, tokenize='unicode61 remove_diacritics 2')"
+    )
+    # Index posts that already exist.
+    schema_editor.execute(
+        "INSERT INTO blog_post_fts (rowid, title, content, tags) "
+        "SELECT p.id, p.title, p.content, "
+        "COALESCE((SELECT group_concat(t.name, ' ') FROM taggit_taggeditem ti "
+        "JOIN taggit_tag t ON t.id = ti.tag_id "
+        "JOIN django_content_type ct ON ct.id = ti.content_type_id "
+        "WHERE ct.app_label = 'blog' AND ct.model = 'post' AND ti.object_id = p.id), '') "
+        "FROM blog_post p"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS blog_post_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_post_tags_taggit'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-18 05:59
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def backfill_excerpts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    last_pk, batch_size = 0, 500
+    while True:
+        batch = list(
+            Post.objects.filter(pk__gt=last_pk).order_by('pk').only('pk', 'content')[:batch_size]
+        )
+        if not batch:
+            break
+        for post in batch:
+            post.excerpt = Truncator(post.content).chars(200)
+            post.word_count = len(post.content.split())
+        Post.objects.bulk_update(batch, ['excerpt', 'word_count'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_comment_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_excerpts, migrations.RunPython.noop),
+    ]
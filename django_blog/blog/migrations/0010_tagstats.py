@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-18 06:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_tag_stats(apps, schema_editor):
+    schema_editor.execute(
+        "INSERT INTO blog_tagstats (tag_id, post_count, last_used) "
+        "SELECT ti.tag_id, COUNT(DISTINCT ti.object_id), MAX(p.published_date) "
+        "FROM taggit_taggeditem ti "
+        "JOIN django_content_type ct ON ct.id = ti.content_type_id "
+        "JOIN blog_post p ON p.id = ti.object_id "
+        "WHERE ct.app_label = 'blog' AND ct.model = 'post' "
+        "GROUP BY ti.tag_id"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_excerpt_word_count'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagStats',
+            fields=[
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='taggit.tag')),
+                ('post_count', models.PositiveIntegerField(default=0)),
+                ('last_used', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'tag stats',
+                'indexes': [models.Index(fields=['-post_count'], name='blog_tagstats_count_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_tag_stats, migrations.RunPython.noop),
+    ]
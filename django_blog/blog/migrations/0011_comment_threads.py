@@ -0,0 +1,58 @@
+# Generated by Django 5.2.7 on 2026-10-18 06:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def path_segment(pk):
+    digits = ''
+    while pk:
+        pk, rem = divmod(pk, 36)
+        digits = '0123456789abcdefghijklmnopqrstuvwxyz'[rem] + digits
+    return digits.rjust(8, '0')
+
+
+def backfill_paths(apps, schema_editor):
+    # Existing comments are flat: each one becomes a thread root.
+    Comment = apps.get_model('blog', 'Comment')
+    last_pk, batch_size = 0, 500
+    while True:
+        batch = list(Comment.objects.filter(pk__gt=last_pk).order_by('pk').only('pk')[:batch_size])
+        if not batch:
+            break
+        for comment in batch:
+            comment.path = path_segment(comment.pk)
+        Comment.objects.bulk_update(batch, ['path'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_tagstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='is_removed',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='replies', to='blog.comment'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(default='', editable=False, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'path'], name='blog_comment_thread_idx'),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+    ]
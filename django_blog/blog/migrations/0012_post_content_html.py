@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-18 06:24
+
+from django.db import migrations, models
+
+
+def render_posts(apps, schema_editor):
+    # Rendering is app code (not schema), so use the current renderer;
+    # rows it later goes stale for are redone by `manage.py rerender_posts`.
+    from blog.rendering import RENDERER, render
+    Post = apps.get_model('blog', 'Post')
+    last_pk, batch_size = 0, 500
+    while True:
+        batch = list(
+            Post.objects.filter(pk__gt=last_pk).order_by('pk').only('pk', 'content')[:batch_size]
+        )
+        if not batch:
+            break
+        for post in batch:
+            post.content_html = render(post.content)
+            post.renderer = RENDERER
+        Post.objects.bulk_update(batch, ['content_html', 'renderer'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_comment_threads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='renderer',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.RunPython(render_posts, migrations.RunPython.noop),
+    ]
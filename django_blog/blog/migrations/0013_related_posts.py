@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-18 06:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_content_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostFeature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feature', models.CharField(max_length=64)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='features', to='blog.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['feature', 'post'], name='blog_postfeature_inv_idx')],
+                'constraints': [models.UniqueConstraint(fields=('post', 'feature'), name='blog_postfeature_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RelatedPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_entries', to='blog.post')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_listings', to='blog.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['post', '-score'], name='blog_relatedpost_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('post', 'related'), name='blog_relatedpost_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-18 06:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_post_view_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='blog.post')),
+                ('key', models.FloatField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-key'], name='blog_trending_key_idx')],
+            },
+        ),
+    ]
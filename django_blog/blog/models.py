@@ -1,11 +1,47 @@
 # Alx_DjangoLearnLab/django_blog/blog/models.py
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.urls import reverse
+from django.utils.text import Truncator
 
 from taggit.managers import TaggableManager
+from taggit.models import Tag
+
+from . import rendering
+
+EXCERPT_LENGTH = 200
+
+
+def make_excerpt(content):
+    """Same output as the ``truncatechars:200`` filter the list used to run."""
+    return Truncator(content).chars(EXCERPT_LENGTH)
+
+
+def count_words(content):
+    return len(content.split())
+
+
+# Comment.path is the chain of ids from the thread root down to the comment,
+# each as a fixed-width base-36 segment, so sorting by path gives display
+# order and a subtree is one range of the (post, path) index.
+PATH_SEGMENT = 8
+MAX_THREAD_DEPTH = 8
+_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def path_segment(pk):
+    digits = ''
+    while pk:
+        pk, rem = divmod(pk, 36)
+        digits = _DIGITS[rem] + digits
+    return digits.rjust(PATH_SEGMENT, '0')
+
+
+def path_upper_bound(path):
+    """Smallest string above every descendant path of ``path``."""
+    return path + '~'
 
 
 class Post(models.Model):
@@ -14,9 +50,26 @@ class Post(models.Model):
     published_date = models.DateTimeField(auto_now_add=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     tags = TaggableManager(blank=True, related_name='posts')
+    # Denormalized; maintained by Comment signals (see signals.py) and
+    # repairable with `manage.py repair_comment_counts`.
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    # Flushed in batches from the in-memory counter in viewcounts.py.
+    view_count = models.PositiveIntegerField(default=0, editable=False)
+    # Derived from content on save so list pages can defer('content');
+    # backfilled by `manage.py backfill_excerpts`.
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    # Sanitized HTML of content (blog/rendering.py) and the renderer that
+    # made it; stale rows are redone by `manage.py rerender_posts`.
+    content_html = models.TextField(blank=True, editable=False)
+    renderer = models.CharField(max_length=32, blank=True, editable=False)
 
     class Meta:
         ordering = ['-published_date']
+        indexes = [
+            # Keyset pagination walks (published_date, id); see pagination.py.
+            models.Index(fields=['-published_date', '-id'], name='blog_post_pub_id_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -24,6 +77,30 @@ class Post(models.Model):
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'pk': self.pk})
 
+    DERIVED_FIELDS = ('excerpt', 'word_count', 'content_html', 'renderer')
+    # Only ever moved by relative UPDATEs; a full save() of a loaded post
+    # leaves them alone so it cannot write back a stale value.
+    COUNTER_FIELDS = ('comment_count', 'view_count')
+
+    def refresh_derived_fields(self):
+        self.excerpt = make_excerpt(self.content)
+        self.word_count = count_words(self.content)
+        self.content_html = rendering.render(self.content)
+        self.renderer = rendering.RENDERER
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS
+            ]
+        if update_fields is None or 'content' in update_fields:
+            self.refresh_derived_fields()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *self.DERIVED_FIELDS}
+        super().save(*args, **kwargs)
+
 
 class Profile(models.Model):
     """
@@ -40,24 +117,130 @@ class Profile(models.Model):
 
 
 @receiver(post_save, sender=User)
-def create_or_update_user_profile(sender, instance, created, **kwargs):
-    if created:
+def create_or_update_user_profile(sender, instance, created, raw=False, **kwargs):
+    # Only new users get a profile here; logins and profile edits also save
+    # the User and must not pay for a lookup. Users created without this
+    # signal (bulk_create, fixtures) get theirs from blog.profiles.
+    if created and not raw:
         Profile.objects.create(user=instance)
-    else:
-        Profile.objects.get_or_create(user=instance)
 
 
 class Comment(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='comments')
+    parent = models.ForeignKey(
+        'self', null=True, blank=True, on_delete=models.CASCADE, related_name='replies'
+    )
+    path = models.CharField(max_length=PATH_SEGMENT * MAX_THREAD_DEPTH, editable=False, default='')
     content = models.TextField()
+    # Deleted comments that still have replies keep their place as tombstones.
+    is_removed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['post', 'path'], name='blog_comment_thread_idx'),
+        ]
 
     def __str__(self):
         return f'Comment by {self.author.username} on {self.post.title[:30]}'
 
+    @property
+    def depth(self):
+        return max(len(self.path) // PATH_SEGMENT - 1, 0)
+
+    def save(self, *args, **kwargs):
+        # Keep the insert and the Post.comment_count bump in one transaction.
+        with transaction.atomic():
+            if self.parent_id and self.parent.depth >= MAX_THREAD_DEPTH - 1:
+                # Too deep: attach to the parent's parent instead.
+                self.parent_id = self.parent.parent_id
+            super().save(*args, **kwargs)
+            if not self.path:
+                prefix = self.parent.path if self.parent_id else ''
+                self.path = prefix + path_segment(self.pk)
+                Comment.objects.filter(pk=self.pk).update(path=self.path)
+
+
+
+class TagStats(models.Model):
+    """
+    Materialized per-tag counters for the tag cloud. Maintained from
+    TaggedItem signals (see signals.py); rebuild with
+    `manage.py rebuild_tag_stats`.
+    """
+    tag = models.OneToOneField(Tag, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    post_count = models.PositiveIntegerField(default=0)
+    last_used = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = 'tag stats'
+        indexes = [
+            models.Index(fields=['-post_count'], name='blog_tagstats_count_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.tag.name} ({self.post_count})'
+
+
+class PostFeature(models.Model):
+    """
+    One tag ("t:<tag id>") or title word ("w:<word>") of a post, indexed by
+    feature so that posts sharing features are found without a scan (see
+    related.py).
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='features')
+    feature = models.CharField(max_length=64)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'feature'], name='blog_postfeature_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['feature', 'post'], name='blog_postfeature_inv_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.post_id}: {self.feature}'
+
+
+class RelatedPost(models.Model):
+    """
+    Precomputed "related posts" list entry: ``related`` resembles ``post``
+    with Jaccard similarity ``score``. Maintained by related.py; rebuild
+    with `manage.py rebuild_related_posts`.
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='related_listings')
+    score = models.FloatField()
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'related'], name='blog_relatedpost_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['post', '-score'], name='blog_relatedpost_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.post_id} -> {self.related_id} ({self.score:.2f})'
+
+
+class TrendingScore(models.Model):
+    """
+    Exponentially decaying activity score of a post (see trending.py),
+    stored as ``key = log2(score) + now / half-life`` so that it never
+    needs decaying: posts rank by ``key`` at any time.
+    """
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name='trending')
+    key = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-key'], name='blog_trending_key_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.post_id}: {self.key:.3f}'
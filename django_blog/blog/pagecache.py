@@ -0,0 +1,160 @@
+# Alx_DjangoLearnLab/django_blog/blog/pagecache.py
+"""
+Anonymous full-page cache with hole punching.
+
+Cached pages are always the anonymous rendering. Everything that depends on
+the viewer (nav links, owner edit/delete links, the CSRF comment form) is
+rendered through ``{% hole %}`` (templatetags/blog_fragments.py), which
+wraps its output in markers::
+
+    <!--hole:owner_actions?kind=post&pk=3&author_id=1-->...<!--/hole-->
+
+Anonymous visitors get the cached page verbatim. For a logged-in visitor
+``splice()`` re-renders only those small hole templates
+(``blog/holes/<name>.html``) with their user and swaps them in, so they get
+cache-speed pages too.
+
+The mixin works for both the sync views and the async ones in
+async_views.py; the cache itself is only touched through the sync API
+(a local-memory lookup, no thread hop).
+
+The cache key is the viewer-independent content key from conditional.py,
+so pages are invalidated by the same version stamps as the ETags. Pages
+with pending flash messages bypass the cache, and so do requests with
+query parameters other than the view's ``page_cache_params`` (the ones
+that select the page and are part of its key): anything else may be echoed
+into the page, e.g. ``?q=`` into the search box, and must not reach other
+visitors.
+"""
+import re
+from urllib.parse import parse_qsl, urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+
+from .conditional import has_pending_messages
+
+PAGE_TIMEOUT = 60 * 10
+
+_HOLE_RE = re.compile(r'<!--hole:(\w+)(?:\?([^>]*?))?-->.*?<!--/hole-->', re.DOTALL)
+
+
+def _comment_form_context(params):
+    from .forms import CommentForm
+    return {'comment_form': CommentForm()}
+
+
+# Extra context for holes that need more than their marker params.
+HOLE_CONTEXT = {
+    'comment_form': _comment_form_context,
+}
+
+
+def render_hole(name, request, params):
+    context = dict(params)
+    if name in HOLE_CONTEXT:
+        context.update(HOLE_CONTEXT[name](params))
+    return render_to_string(f'blog/holes/{name}.html', context, request=request)
+
+
+def wrap_hole(name, params, html):
+    query = urlencode(params)
+    return f'<!--hole:{name}{"?" + query if query else ""}-->{html}<!--/hole-->'
+
+
+def splice(html, request):
+    """Re-render every hole in ``html`` for ``request.user``."""
+    def fill(match):
+        name, query = match.group(1), match.group(2) or ''
+        params = dict(parse_qsl(query))
+        return wrap_hole(name, params, render_hole(name, request, params))
+    return _HOLE_RE.sub(fill, html)
+
+
+class AnonymousPageCacheMixin:
+    """
+    Serve GETs from the anonymous page cache. Must come after a
+    ConditionalGetMixin in the MRO, which provides ``content_validators``.
+    """
+    page_cache_timeout = PAGE_TIMEOUT
+    page_cache_params = ()
+
+    def _page_cache_enabled(self, request):
+        return (
+            getattr(settings, 'BLOG_ANONYMOUS_PAGE_CACHE', True)
+            and request.method in ('GET', 'HEAD')
+            and all(param in self.page_cache_params for param in request.GET)
+            and not has_pending_messages(request)
+        )
+
+    def _page_cache_key(self, request, content_key):
+        params = urlencode(sorted(request.GET.lists()), doseq=True)
+        return f'blog:page:{content_key}:{params}'
+
+    def _render_anonymous(self, request, *args, **kwargs):
+        real_user = request.user
+        request.user = AnonymousUser()
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        finally:
+            request.user = real_user
+        return response
+
+    async def _arender_anonymous(self, request, *args, **kwargs):
+        real_user = request.user
+        request.user = AnonymousUser()
+        try:
+            response = await super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                # Template rendering is sync (and may still run queries).
+                await sync_to_async(response.render)()
+        finally:
+            request.user = real_user
+        return response
+
+    def _serve(self, request, html):
+        if request.user.is_authenticated:
+            html = splice(html, request)
+        return HttpResponse(html)
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self._adispatch_cached(request, *args, **kwargs)
+        if not self._page_cache_enabled(request):
+            return super().dispatch(request, *args, **kwargs)
+        content_key = self.content_validators(request, **kwargs)[0]
+        if content_key is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        cache_key = self._page_cache_key(request, content_key)
+        html = cache.get(cache_key)
+        if html is None:
+            response = self._render_anonymous(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            html = response.content.decode(response.charset)
+            cache.set(cache_key, html, self.page_cache_timeout)
+        return self._serve(request, html)
+
+    async def _adispatch_cached(self, request, *args, **kwargs):
+        if not self._page_cache_enabled(request):
+            return await super().dispatch(request, *args, **kwargs)
+        content_key = (await self.acontent_validators(request, **kwargs))[0]
+        if content_key is None:
+            return await super().dispatch(request, *args, **kwargs)
+
+        cache_key = self._page_cache_key(request, content_key)
+        html = cache.get(cache_key)
+        if html is None:
+            response = await self._arender_anonymous(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            html = response.content.decode(response.charset)
+            cache.set(cache_key, html, self.page_cache_timeout)
+        return self._serve(request, html)
@@ -0,0 +1,149 @@
+# Alx_DjangoLearnLab/django_blog/blog/pagination.py
+"""
+Keyset (cursor) pagination for post lists.
+
+Pages are addressed by an opaque cursor encoding the ``(published_date, id)``
+of the row at the page edge instead of an OFFSET, so every page is one
+indexed range scan and no COUNT(*) is run. Views opt in through
+``KeysetPaginationMixin``; templates render ``blog/_keyset_pagination.html``.
+"""
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from django.http import Http404
+
+CURSOR_PARAM = 'cursor'
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(published_date, pk, direction):
+    raw = f'{direction}|{published_date.isoformat()}|{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        direction, stamp, pk = base64.urlsafe_b64decode(padded).decode().split('|')
+        if direction not in ('n', 'p'):
+            raise ValueError(direction)
+        published = datetime.fromisoformat(stamp)
+        if published.utcoffset() is None:
+            # encode_cursor() always writes an offset; naive stamps cannot be
+            # compared with the stored dates.
+            raise ValueError(stamp)
+        return direction, published, int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor(token) from exc
+
+
+class KeysetPage:
+    """Duck-types the bits of django.core.paginator.Page the templates use."""
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Newest-first paginator keyed on ``(published_date, id)``. Backed by the
+    ``blog_post_pub_id_idx`` index.
+    """
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def _window(self, cursor):
+        """The sliced, ordered queryset for the page at ``cursor``."""
+        qs = self.queryset
+        direction = 'n'
+        if cursor:
+            direction, stamp, pk = decode_cursor(cursor)
+            if direction == 'n':
+                qs = qs.filter(Q(published_date__lt=stamp) | Q(published_date=stamp, pk__lt=pk))
+            else:
+                qs = qs.filter(Q(published_date__gt=stamp) | Q(published_date=stamp, pk__gt=pk))
+        if direction == 'n':
+            qs = qs.order_by('-published_date', '-pk')
+        else:
+            qs = qs.order_by('published_date', 'pk')
+        return direction, qs[:self.per_page + 1]
+
+    def _make_page(self, rows, direction, cursor):
+        more = len(rows) > self.per_page
+        if direction == 'n':
+            rows = rows[:self.per_page]
+            has_next, has_previous = more, cursor is not None
+        else:
+            rows = rows[:self.per_page][::-1]
+            has_next, has_previous = True, more
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            last = rows[-1]
+            next_cursor = encode_cursor(last.published_date, last.pk, 'n')
+        if rows and has_previous:
+            first = rows[0]
+            previous_cursor = encode_cursor(first.published_date, first.pk, 'p')
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+    def page(self, cursor=None):
+        direction, qs = self._window(cursor)
+        return self._make_page(list(qs), direction, cursor)
+
+    async def apage(self, cursor=None):
+        direction, qs = self._window(cursor)
+        return self._make_page([row async for row in qs], direction, cursor)
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin replacing OFFSET pagination with ``KeysetPaginator``.
+    The page is selected by the ``?cursor=`` query parameter.
+    """
+    keyset_pagination = True
+
+    def get_keyset_paginator(self, queryset, page_size):
+        return KeysetPaginator(queryset, page_size)
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.keyset_pagination:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = self.get_keyset_paginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(CURSOR_PARAM))
+        except InvalidCursor:
+            raise Http404("Invalid page cursor.")
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    async def apaginate_queryset(self, queryset, page_size):
+        """Async counterpart of paginate_queryset(), used by async_views.py."""
+        paginator = self.get_keyset_paginator(queryset, page_size)
+        try:
+            page = await paginator.apage(self.request.GET.get(CURSOR_PARAM))
+        except InvalidCursor:
+            raise Http404("Invalid page cursor.")
+        return (paginator, page, page.object_list, page.has_other_pages())
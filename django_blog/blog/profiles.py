@@ -0,0 +1,38 @@
+# Alx_DjangoLearnLab/django_blog/blog/profiles.py
+"""
+Profile provisioning.
+
+A Profile is created with its User (see ``create_or_update_user_profile``).
+Users that predate that, or came in through bulk_create, get one lazily
+from ``get_profile()`` or all at once from ``manage.py backfill_profiles``.
+"""
+from django.contrib.auth.models import User
+
+from .models import Profile
+
+
+def get_profile(user):
+    """``user.profile``, created on first access. Cached on the instance."""
+    try:
+        return user.profile
+    except Profile.DoesNotExist:
+        profile, _ = Profile.objects.get_or_create(user=user)
+        user.profile = profile
+        return profile
+
+
+def backfill(user_ids=None, batch_size=1000):
+    """Create the missing profiles, in batches. Returns how many were created."""
+    users = User.objects.filter(profile__isnull=True)
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    created, last_pk = 0, 0
+    while True:
+        batch = list(
+            users.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch:
+            return created
+        Profile.objects.bulk_create([Profile(user_id=pk) for pk in batch], ignore_conflicts=True)
+        created += len(batch)
+        last_pk = batch[-1]
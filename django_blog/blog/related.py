@@ -0,0 +1,234 @@
+# Alx_DjangoLearnLab/django_blog/blog/related.py
+"""
+Precomputed "related posts" (RelatedPost), by tag and title similarity.
+
+A post is described by a set of features (PostFeature): its tags
+("t:<tag id>") and the significant words of its title ("w:<word>"). Two
+posts are as similar as the Jaccard index of their feature sets,
+|A & B| / |A | B|, and each post keeps its top RELATED_POSTS neighbours.
+
+Candidates come from the (feature, post) index with one GROUP BY: only
+posts sharing at least one feature are ever looked at, so the cost of
+scoring a post depends on how common its features are, not on the number
+of posts.
+
+``refresh()`` runs after a post's title or tags change (see signals.py).
+It rescores that post, then patches its neighbours' lists using the
+symmetry of the score: a neighbour that now ranks the post higher, or
+newly, only needs it inserted into its list; a neighbour that ranks it
+lower, or no longer, is rescored in full, since something outside its list
+may now come first. When a post is deleted, the posts that listed it are
+rescored. ``rebuild()`` recomputes everything.
+"""
+import re
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, Q
+
+from taggit.models import TaggedItem
+
+from . import versions
+from .models import Post, PostFeature, RelatedPost
+
+RELATED_POSTS = 5
+# Best-sharing candidates scored per post; bounds the work for posts whose
+# features are very common.
+MAX_CANDIDATES = 500
+MIN_SCORE = 0.1
+MIN_WORD_LENGTH = 3
+
+STOPWORDS = frozenset(
+    'about after again all also and any are because been before but can could did does '
+    'for from had has have her here him his how into its just more most not now off one '
+    'only our out over own same she should some such than that the their them then there '
+    'these they this those through too under very was were what when where which while who '
+    'why will with would you your'.split()
+)
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def features(title, tag_ids):
+    words = {
+        word for word in _WORD_RE.findall(title.lower())
+        if len(word) >= MIN_WORD_LENGTH and word not in STOPWORDS
+    }
+    return {f't:{tag_id}' for tag_id in tag_ids} | {f'w:{word[:62]}' for word in words}
+
+
+def _current_features(post_ids):
+    """post id -> feature set, from the posts' current title and tags."""
+    post_type = ContentType.objects.get_for_model(Post)
+    tags = defaultdict(list)
+    for object_id, tag_id in TaggedItem.objects.filter(
+        content_type=post_type, object_id__in=post_ids
+    ).values_list('object_id', 'tag_id'):
+        tags[object_id].append(tag_id)
+    return {
+        pk: features(title, tags[pk])
+        for pk, title in Post.objects.filter(pk__in=post_ids).values_list('pk', 'title')
+    }
+
+
+def _stored_features(post_ids):
+    stored = defaultdict(set)
+    for post_id, feature in PostFeature.objects.filter(post_id__in=post_ids).values_list(
+        'post_id', 'feature'
+    ):
+        stored[post_id].add(feature)
+    return stored
+
+
+def _store_features(post_features):
+    PostFeature.objects.filter(post_id__in=list(post_features)).delete()
+    PostFeature.objects.bulk_create(
+        PostFeature(post_id=pk, feature=feature)
+        for pk, feats in post_features.items()
+        for feature in feats
+    )
+
+
+def _scores(post_id, size):
+    """related post id -> score, for every candidate scoring MIN_SCORE or more."""
+    shared = dict(
+        PostFeature.objects
+        .filter(feature__in=PostFeature.objects.filter(post_id=post_id).values('feature'))
+        .exclude(post_id=post_id)
+        .values('post_id').annotate(shared=Count('pk'))
+        .order_by('-shared', 'post_id')
+        .values_list('post_id', 'shared')[:MAX_CANDIDATES]
+    )
+    sizes = dict(
+        PostFeature.objects.filter(post_id__in=list(shared))
+        .values('post_id').annotate(n=Count('pk'))
+        .values_list('post_id', 'n')
+    )
+    scores = {pk: n / (size + sizes[pk] - n) for pk, n in shared.items()}
+    return {pk: score for pk, score in scores.items() if score >= MIN_SCORE}
+
+
+def _top(scores):
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return dict(ranked[:RELATED_POSTS])
+
+
+def _write_lists(lists):
+    RelatedPost.objects.filter(post_id__in=list(lists)).delete()
+    RelatedPost.objects.bulk_create(
+        RelatedPost(post_id=pk, related_id=related_id, score=score)
+        for pk, top in lists.items()
+        for related_id, score in top.items()
+    )
+
+
+def _rescore(post_ids):
+    sizes = dict(
+        PostFeature.objects.filter(post_id__in=post_ids)
+        .values('post_id').annotate(n=Count('pk'))
+        .values_list('post_id', 'n')
+    )
+    _write_lists({pk: _top(_scores(pk, sizes[pk])) if pk in sizes else {} for pk in post_ids})
+
+
+def _patch_neighbours(post_id, scores):
+    """
+    Bring the lists of posts that score against ``post_id``, or that list
+    it, up to date with ``scores``. Returns the ids of the lists touched.
+    """
+    lists = defaultdict(dict)
+    for pk, related_id, score in RelatedPost.objects.filter(
+        Q(post_id__in=list(scores))
+        | Q(post_id__in=RelatedPost.objects.filter(related_id=post_id).values('post_id'))
+    ).values_list('post_id', 'related_id', 'score'):
+        lists[pk][related_id] = score
+
+    rescore, rewrite, listing = [], {}, set()
+    for pk in set(scores) | set(lists):
+        entries = lists[pk]
+        old, new = entries.get(post_id), scores.get(pk)
+        if old is not None:
+            # The post's title is on that page; drop it from the cache.
+            listing.add(pk)
+        if old == new:
+            continue
+        if old is not None and (new is None or new < old):
+            rescore.append(pk)
+            continue
+        top = _top({**entries, post_id: new})
+        if top != entries:
+            rewrite[pk] = top
+    _write_lists(rewrite)
+    _rescore(rescore)
+    return listing | set(rewrite) | set(rescore)
+
+
+def refresh(post_ids, force=False):
+    """
+    Update features and related lists after ``post_ids`` were saved, or
+    had their tags changed. Posts whose features did not change are skipped
+    unless ``force``. Returns the ids of the posts whose lists changed.
+    """
+    post_ids = set(post_ids)
+    current = _current_features(post_ids)
+    stored = _stored_features(post_ids)
+    changed = [pk for pk in sorted(current) if force or current[pk] != stored.get(pk, set())]
+    if not changed:
+        return set()
+
+    touched = set(changed)
+    with transaction.atomic():
+        _store_features({pk: current[pk] for pk in changed})
+        for pk in changed:
+            scores = _scores(pk, len(current[pk]))
+            _write_lists({pk: _top(scores)})
+            touched |= _patch_neighbours(pk, scores)
+    versions.bump_post_versions(touched)
+    return touched
+
+
+def listing(post_ids):
+    """Ids of the other posts whose related lists include any of ``post_ids``."""
+    return set(
+        RelatedPost.objects.filter(related_id__in=post_ids)
+        .exclude(post_id__in=post_ids).values_list('post_id', flat=True)
+    )
+
+
+def rescore(post_ids):
+    """Recompute the related lists of ``post_ids`` from the stored features."""
+    post_ids = sorted(post_ids)
+    with transaction.atomic():
+        _rescore(post_ids)
+    versions.bump_post_versions(post_ids)
+
+
+def rebuild(batch_size=500):
+    """Recompute every post's features, then every related list."""
+    post_ids = list(Post.objects.order_by('pk').values_list('pk', flat=True))
+    with transaction.atomic():
+        PostFeature.objects.all().delete()
+        for start in range(0, len(post_ids), batch_size):
+            _store_features(_current_features(post_ids[start:start + batch_size]))
+    for start in range(0, len(post_ids), batch_size):
+        with transaction.atomic():
+            _rescore(post_ids[start:start + batch_size])
+    versions.bump_post_versions(post_ids)
+    return len(post_ids)
+
+
+def _related_queryset(post_id, limit):
+    return (
+        Post.objects.filter(related_listings__post_id=post_id)
+        .order_by('-related_listings__score', 'pk')
+        .only('pk', 'title')[:limit]
+    )
+
+
+def related_posts(post_id, limit=RELATED_POSTS):
+    return list(_related_queryset(post_id, limit))
+
+
+async def arelated_posts(post_id, limit=RELATED_POSTS):
+    return [post async for post in _related_queryset(post_id, limit)]
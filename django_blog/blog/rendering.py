@@ -0,0 +1,150 @@
+# Alx_DjangoLearnLab/django_blog/blog/rendering.py
+"""
+Post body rendering, stored in ``Post.content_html``.
+
+Content is rendered as Markdown when the ``markdown`` package is installed,
+otherwise with Django's ``linebreaks`` (what the detail page used to run per
+request). Either way the HTML goes through an allowlist sanitizer, since
+Markdown passes raw HTML through.
+
+``RENDERER`` names the renderer that produced a row (``Post.renderer``);
+after changing it, or installing markdown, ``manage.py rerender_posts``
+re-renders the stale rows.
+"""
+import re
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from django.db import transaction
+from django.utils.html import linebreaks
+
+try:
+    import markdown
+except ImportError:
+    markdown = None
+
+RENDERER_VERSION = 1
+RENDERER = f"{'markdown' if markdown else 'text'}-{RENDERER_VERSION}"
+
+MARKDOWN_EXTENSIONS = ['fenced_code', 'tables', 'sane_lists']
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'del', 'em', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'hr', 'i', 'img', 'li', 'ol', 'p', 'pre', 'strong',
+    'table', 'tbody', 'td', 'th', 'thead', 'tr', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title'},
+    'abbr': {'title'},
+    'img': {'src', 'alt', 'title'},
+    'th': {'align'},
+    'td': {'align'},
+}
+URL_ATTRIBUTES = {'href', 'src'}
+ALLOWED_SCHEMES = {'', 'http', 'https', 'mailto'}
+VOID_TAGS = {'br', 'hr', 'img'}
+# Dropped together with everything inside them.
+DROP_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'template', 'textarea'}
+
+_URL_NOISE_RE = re.compile(r'[\x00-\x20\x7f]+')
+
+
+class _Sanitizer(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.open_tags = []
+        self.dropping = 0
+
+    def _attrs(self, tag, attrs):
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        kept = []
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES:
+                scheme = urlsplit(_URL_NOISE_RE.sub('', value)).scheme.lower()
+                if scheme not in ALLOWED_SCHEMES:
+                    continue
+            kept.append(f' {name}="{escape(value)}"')
+        if tag == 'a':
+            kept.append(' rel="nofollow noopener"')
+        return ''.join(kept)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping += 1
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        self.out.append(f'<{tag}{self._attrs(tag, attrs)}>')
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping = max(self.dropping - 1, 0)
+            return
+        if self.dropping or tag not in self.open_tags:
+            return
+        # Close anything left open inside ``tag`` so the output stays balanced.
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.out.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.out.append(escape(data, quote=False))
+
+    def result(self):
+        self.close()
+        return ''.join(self.out) + ''.join(f'</{tag}>' for tag in reversed(self.open_tags))
+
+
+def sanitize(html):
+    """Keep only allowlisted tags, attributes and URL schemes."""
+    parser = _Sanitizer()
+    parser.feed(html)
+    return parser.result()
+
+
+def render(content):
+    if markdown is not None:
+        html = markdown.markdown(content, extensions=MARKDOWN_EXTENSIONS, output_format='html')
+    else:
+        html = linebreaks(content, autoescape=True)
+    return sanitize(html)
+
+
+def rerender(everything=False, batch_size=500):
+    """
+    Re-render posts whose ``renderer`` is not the current one (or all of
+    them). Returns the number of posts updated.
+    """
+    from . import versions
+    from .models import Post
+
+    posts = Post.objects.all() if everything else Post.objects.exclude(renderer=RENDERER)
+    last_pk, total = 0, 0
+    while True:
+        batch = list(
+            posts.filter(pk__gt=last_pk).order_by('pk').only('pk', 'content')[:batch_size]
+        )
+        if not batch:
+            return total
+        for post in batch:
+            post.content_html = render(post.content)
+            post.renderer = RENDERER
+        with transaction.atomic():
+            Post.objects.bulk_update(batch, ['content_html', 'renderer'])
+        # bulk_update sends no signals; drop cached detail pages ourselves.
+        versions.bump_post_versions(post.pk for post in batch)
+        last_pk = batch[-1].pk
+        total += len(batch)
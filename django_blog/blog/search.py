@@ -0,0 +1,300 @@
+# Alx_DjangoLearnLab/django_blog/blog/search.py
+"""
+Full-text search for posts.
+
+On SQLite the posts are mirrored into an FTS5 table (``blog_post_fts``,
+created by migration 0006) whose rowid is the post id. The table is kept in
+sync from signals (see ``blog/signals.py``) and can be rebuilt with
+``manage.py rebuild_search_index``. Results are ranked by BM25.
+
+Other database backends fall back to the old ``icontains`` query.
+
+When nothing matches, ``search_with_fallback()`` falls back to typo-tolerant
+matching on titles and tag names (see trigrams.py). It caches the ranked
+ids per normalized query under the content version, and a burst of
+identical queries runs the search once (single flight).
+"""
+import hashlib
+import re
+import time
+from dataclasses import dataclass
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q, QuerySet
+
+from . import versions
+from .models import Post
+from .trigrams import trigram_index
+
+FTS_TABLE = 'blog_post_fts'
+
+# bm25() column weights for (title, content, tags).
+BM25_WEIGHTS = (10.0, 1.0, 5.0)
+
+# Result ids cached per query; later matches are not reachable by paging.
+MAX_CACHED_RESULTS = 1000
+SEARCH_CACHE_TIMEOUT = 60 * 10
+SINGLE_FLIGHT_LOCK_TIMEOUT = 30
+SINGLE_FLIGHT_WAIT = 5.0
+SINGLE_FLIGHT_POLL = 0.02
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(q):
+    """
+    Turn free text into a safe FTS5 MATCH expression. Every word is quoted
+    (so FTS5 operators typed by users are treated as text) and the last one
+    is a prefix match, which suits search-as-you-type.
+    """
+    tokens = _TOKEN_RE.findall(q or '')
+    if not tokens:
+        return ''
+    terms = ['"%s"' % t for t in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+# --- Index maintenance ------------------------------------------------------
+def _tag_text(post):
+    return ' '.join(tag.name for tag in post.tags.all())
+
+
+def _rows(posts):
+    return [(p.pk, p.title, p.content, _tag_text(p)) for p in posts]
+
+
+def _write_rows(cursor, rows):
+    cursor.executemany(
+        f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(r[0],) for r in rows]
+    )
+    cursor.executemany(
+        f'INSERT INTO {FTS_TABLE} (rowid, title, content, tags) VALUES (%s, %s, %s, %s)',
+        rows,
+    )
+
+
+def index_posts(posts):
+    """(Re)index the given Post instances."""
+    if not is_available():
+        return
+    rows = _rows(posts)
+    if rows:
+        with connection.cursor() as cursor:
+            _write_rows(cursor, rows)
+
+
+def index_post_ids(post_ids):
+    post_ids = list(post_ids)
+    if post_ids and is_available():
+        index_posts(Post.objects.filter(pk__in=post_ids).prefetch_related('tags'))
+
+
+def remove_post(post_id):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+
+
+def rebuild_index(batch_size=500):
+    """Drop every indexed row and re-index all posts. Returns the row count."""
+    if not is_available():
+        return 0
+    total = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        batch = []
+        qs = Post.objects.prefetch_related('tags').order_by('pk')
+        for post in qs.iterator(chunk_size=batch_size):
+            batch.append(post)
+            if len(batch) >= batch_size:
+                _write_rows(cursor, _rows(batch))
+                total += len(batch)
+                batch = []
+        if batch:
+            _write_rows(cursor, _rows(batch))
+            total += len(batch)
+        # Merge the b-tree segments left behind by the bulk load.
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+    return total
+
+
+# --- Querying ---------------------------------------------------------------
+class _RankedPosts:
+    """
+    Lazy, ranked post list that the Paginator can slice: subclasses give
+    ``count()`` and ``ids(offset, limit)``, and only the posts of the
+    requested page are loaded.
+    """
+    model = Post
+    ordered = True
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start = key.start or 0
+            limit = None if key.stop is None else max(key.stop - start, 0)
+            ids = self.ids(start, limit)
+            posts = Post.objects.select_related('author').defer('content').in_bulk(ids)
+            return [posts[pk] for pk in ids if pk in posts]
+        page = self[key:key + 1]
+        if not page:
+            raise IndexError(key)
+        return page[0]
+
+    def __iter__(self):
+        return iter(self[:])
+
+    # count() and ids() may run raw FTS statements and Django has no async
+    # cursor, so they run in a worker thread; the posts themselves are read
+    # with the async ORM.
+    async def acount(self):
+        return await sync_to_async(self.count)()
+
+    async def aslice(self, start, stop):
+        ids = await sync_to_async(self.ids)(start, max(stop - start, 0))
+        posts = {
+            post.pk: post
+            async for post in Post.objects.select_related('author').defer('content').filter(pk__in=ids)
+        }
+        return [posts[pk] for pk in ids if pk in posts]
+
+
+class SearchResults(_RankedPosts):
+    """Posts matching an FTS5 ``match`` expression, ranked by BM25."""
+
+    def __init__(self, match):
+        self.match = match
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+                    [self.match],
+                )
+                self._count = cursor.fetchone()[0]
+        return self._count
+
+    def ids(self, offset=0, limit=None):
+        weights = ', '.join(str(w) for w in BM25_WEIGHTS)
+        sql = (
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+            f'ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s OFFSET %s'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [self.match, -1 if limit is None else limit, offset])
+            return [row[0] for row in cursor.fetchall()]
+
+
+class RankedIds(_RankedPosts):
+    """Posts already ranked, e.g. cached search results or trigrams.search()."""
+
+    def __init__(self, ids):
+        self._ids = list(ids)
+
+    def count(self):
+        return len(self._ids)
+
+    def ids(self, offset=0, limit=None):
+        return self._ids[offset:None if limit is None else offset + limit]
+
+
+def search_posts(q):
+    """
+    Return posts matching ``q``: a ranked ``SearchResults`` when the FTS
+    index is available, otherwise a plain queryset.
+    """
+    q = (q or '').strip()
+    if not q:
+        return Post.objects.none()
+    if is_available():
+        match = build_match_query(q)
+        if not match:
+            return Post.objects.none()
+        return SearchResults(match)
+    return Post.objects.filter(
+        Q(title__icontains=q) |
+        Q(content__icontains=q) |
+        Q(tags__name__icontains=q)
+    ).distinct().select_related('author').defer('content').order_by('-published_date')
+
+
+@dataclass
+class Search:
+    results: object
+    fuzzy: bool = False
+    did_you_mean: str = None
+
+
+def normalize_query(q):
+    """Case-folded, whitespace-collapsed query: the search cache key."""
+    return ' '.join((q or '').casefold().split())
+
+
+def _run_search(q):
+    """(ranked ids, fuzzy, did_you_mean) for a normalized query."""
+    results = search_posts(q)
+    if isinstance(results, QuerySet):
+        ids = list(results.values_list('pk', flat=True)[:MAX_CACHED_RESULTS])
+    else:
+        ids = results.ids(0, MAX_CACHED_RESULTS)
+    if ids:
+        return ids, False, None
+    matches = trigram_index.search(q)[:MAX_CACHED_RESULTS]
+    return [post_id for post_id, _ in matches], True, trigram_index.did_you_mean(q)
+
+
+def _single_flight(key, compute, timeout):
+    """
+    ``cache.get(key)``, computing and storing it on a miss. Only the caller
+    that wins ``cache.add()`` on the lock key computes; the others poll for
+    its result and only compute themselves if it takes longer than
+    SINGLE_FLIGHT_WAIT.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, SINGLE_FLIGHT_LOCK_TIMEOUT):
+        try:
+            value = compute()
+            cache.set(key, value, timeout)
+            return value
+        finally:
+            cache.delete(lock_key)
+    deadline = time.monotonic() + SINGLE_FLIGHT_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(SINGLE_FLIGHT_POLL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+    return compute()
+
+
+def search_with_fallback(q):
+    """
+    Posts matching ``q``, or when nothing does, posts whose title or tag
+    words are close to ``q``'s (trigrams.py) and a corrected query.
+
+    The ranked ids (up to MAX_CACHED_RESULTS) are cached per normalized
+    query and content version, so every page and every visitor of a
+    popular query share one search; writes bump the version.
+    """
+    q = normalize_query(q)
+    if not q:
+        return Search(Post.objects.none())
+    digest = hashlib.sha1(q.encode()).hexdigest()
+    key = f'blog:search:{versions.content_version()}:{digest}'
+    ids, fuzzy, did_you_mean = _single_flight(key, lambda: _run_search(q), SEARCH_CACHE_TIMEOUT)
+    return Search(RankedIds(ids), fuzzy=fuzzy, did_you_mean=did_you_mean)
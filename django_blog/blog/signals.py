@@ -0,0 +1,310 @@
+# Alx_DjangoLearnLab/django_blog/blog/signals.py
+"""
+Signal receivers that keep derived blog data (search index, comment
+counters, version stamps, tag posting lists, tag stats, feeds, related
+posts, trending scores, autocomplete, trigrams) in sync with Post and tag
+writes. Connected from BlogConfig.ready().
+"""
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+
+from taggit.models import Tag, TaggedItem
+
+from . import autocomplete, feeds, related, search, tagstats, trending, versions
+from .tagindex import posting_cache, tag_keys, to_stamp
+from .trigrams import trigram_index
+from .models import Post, Comment
+
+
+# --- Search index -----------------------------------------------------------
+@receiver(post_save, sender=Post)
+def index_post_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.index_posts([instance])
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post_on_delete(sender, instance, **kwargs):
+    search.remove_post(instance.pk)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def index_post_on_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        search.index_post_ids(pk_set or [])
+    else:
+        search.index_post_ids([instance.pk])
+
+
+@receiver(post_save, sender=Tag)
+def index_posts_on_tag_rename(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    search.index_post_ids(Post.objects.filter(tags=instance).values_list('pk', flat=True))
+
+
+# --- Comment counters -------------------------------------------------------
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(comment_count=F('comment_count') + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    # Also fires for cascades (post or author deleted); Collector.delete()
+    # runs these inside its transaction. Tombstones were already uncounted
+    # by threads.remove_comments().
+    if instance.is_removed:
+        return
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+# --- Version stamps ---------------------------------------------------------
+@receiver(post_save, sender=Post)
+def bump_versions_on_post_save(sender, instance, **kwargs):
+    versions.bump_post_version(instance.pk)
+    versions.bump_content_version()
+
+
+@receiver(post_delete, sender=Post)
+def bump_versions_on_post_delete(sender, instance, **kwargs):
+    versions.bump_content_version()
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def bump_versions_on_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    for pk in (pk_set or []) if reverse else [instance.pk]:
+        versions.bump_post_version(pk)
+    versions.bump_content_version()
+
+
+@receiver(post_save, sender=Tag)
+def bump_versions_on_tag_save(sender, instance, created, **kwargs):
+    if not created:
+        versions.bump_content_version()
+
+
+@receiver(post_delete, sender=Tag)
+def bump_versions_on_tag_delete(sender, instance, **kwargs):
+    # Deleting a tag drops its TaggedItems without an m2m_changed.
+    versions.bump_content_version()
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_versions_on_comment_change(sender, instance, **kwargs):
+    # The post's summary fragment and the list/search pages around it all
+    # show the comment count.
+    versions.bump_post_version(instance.post_id)
+    versions.bump_content_version()
+
+
+@receiver(post_save, sender=User)
+def bump_author_version_on_rename(sender, instance, created, update_fields=None, **kwargs):
+    # Logins save with update_fields=['last_login']; only a save that may
+    # touch the username invalidates the author's fragments.
+    if created or (update_fields is not None and 'username' not in update_fields):
+        return
+    versions.bump_author_version(instance.pk)
+    versions.bump_content_version()
+
+
+# --- Tag posting lists ------------------------------------------------------
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_tag_postings(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        if action.startswith('post_'):
+            transaction.on_commit(lambda: posting_cache.apply(drop_all=True))
+        return
+    if action == 'pre_clear':
+        instance._cleared_tags = list(instance.tags.values_list('name', 'slug'))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if action == 'post_clear':
+        tags = getattr(instance, '_cleared_tags', [])
+    else:
+        tags = Tag.objects.filter(pk__in=pk_set or []).values_list('name', 'slug')
+    keys, stamp, pk = tag_keys(tags), to_stamp(instance.published_date), instance.pk
+    if action == 'post_add':
+        transaction.on_commit(lambda: posting_cache.apply(added=[(keys, stamp, pk)]))
+    else:
+        transaction.on_commit(lambda: posting_cache.apply(removed=[(keys, pk)]))
+
+
+@receiver(post_delete, sender=Post)
+def remove_deleted_post_postings(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: posting_cache.apply(removed=[(None, pk)]))
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def drop_postings_on_tag_change(sender, instance, created=False, **kwargs):
+    if not created:
+        transaction.on_commit(lambda: posting_cache.apply(drop_all=True))
+
+
+# --- Tag stats --------------------------------------------------------------
+def _is_post_tag(item):
+    return item.content_type_id == ContentType.objects.get_for_model(Post).pk
+
+
+@receiver(post_save, sender=TaggedItem)
+def count_tagged_item(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and _is_post_tag(instance):
+        published = (
+            Post.objects.filter(pk=instance.object_id)
+            .values_list('published_date', flat=True).first()
+        )
+        tagstats.record_tagged(instance.tag_id, published)
+
+
+@receiver(post_delete, sender=TaggedItem)
+def uncount_tagged_item(sender, instance, **kwargs):
+    # Also runs for the TaggedItem rows cascaded from a deleted post.
+    if _is_post_tag(instance):
+        tagstats.record_untagged(instance.tag_id)
+
+
+# --- Feeds ------------------------------------------------------------------
+@receiver(post_save, sender=Post)
+def invalidate_feeds_on_post_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    username = instance.author.username
+    slugs = list(instance.tags.values_list('slug', flat=True))
+    transaction.on_commit(lambda: feeds.invalidate(author_username=username, tag_slugs=slugs))
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_feeds_on_post_delete(sender, instance, **kwargs):
+    # Tag feeds are handled by the cascaded TaggedItem deletes below.
+    username = instance.author.username
+    transaction.on_commit(lambda: feeds.invalidate(author_username=username))
+
+
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def invalidate_tag_feed(sender, instance, created=True, raw=False, **kwargs):
+    if not created or raw or not _is_post_tag(instance):
+        return
+    slug = instance.tag.slug
+    transaction.on_commit(lambda: feeds.invalidate(site=False, tag_slugs=[slug]))
+
+
+@receiver(post_save, sender=User)
+def invalidate_feeds_on_rename(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and 'username' not in update_fields):
+        return
+    username = instance.username
+    transaction.on_commit(lambda: feeds.invalidate(author_username=username))
+
+
+# --- Related posts ----------------------------------------------------------
+# Applied after commit: a form save fires one of these for the post and one
+# per tag, and refresh() skips the posts whose features are already stored.
+@receiver(post_save, sender=Post)
+def refresh_related_on_post_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'title' not in update_fields):
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: related.refresh([pk]))
+
+
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def refresh_related_on_tag_change(sender, instance, created=True, raw=False, **kwargs):
+    if not created or raw or not _is_post_tag(instance):
+        return
+    pk = instance.object_id
+    transaction.on_commit(lambda: related.refresh([pk]))
+
+
+@receiver(pre_delete, sender=Post)
+def rescore_related_on_post_delete(sender, instance, **kwargs):
+    # The lists naming the post are cascaded away with it; note their owners.
+    listing = related.listing([instance.pk])
+    if listing:
+        transaction.on_commit(lambda: related.rescore(listing))
+
+
+# --- Trending ---------------------------------------------------------------
+# Views are added by viewcounts.py when it flushes.
+@receiver(post_save, sender=Post)
+def score_new_post(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        pk = instance.pk
+        transaction.on_commit(lambda: trending.record(pk, trending.NEW_POST_WEIGHT))
+
+
+@receiver(post_save, sender=Comment)
+def score_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        post_id = instance.post_id
+        transaction.on_commit(lambda: trending.record(post_id, trending.COMMENT_WEIGHT))
+
+
+# --- Autocomplete -----------------------------------------------------------
+@receiver(post_save, sender=Post)
+def index_post_title(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'title' not in update_fields):
+        return
+    entry = (autocomplete.POST, instance.pk, instance.title, '')
+    transaction.on_commit(lambda: autocomplete.prefix_index.apply(upserted=[entry]))
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post_title(sender, instance, **kwargs):
+    ref = (autocomplete.POST, instance.pk)
+    transaction.on_commit(lambda: autocomplete.prefix_index.apply(removed=[ref]))
+
+
+@receiver(post_save, sender=Tag)
+def index_tag_name(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    entry = (autocomplete.TAG, instance.pk, instance.name, instance.slug)
+    transaction.on_commit(lambda: autocomplete.prefix_index.apply(upserted=[entry]))
+
+
+@receiver(post_delete, sender=Tag)
+def unindex_tag_name(sender, instance, **kwargs):
+    ref = (autocomplete.TAG, instance.pk)
+    transaction.on_commit(lambda: autocomplete.prefix_index.apply(removed=[ref]))
+
+
+# --- Trigram index ----------------------------------------------------------
+@receiver(post_save, sender=Post)
+def drop_trigrams_on_post_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'title' not in update_fields):
+        return
+    transaction.on_commit(trigram_index.invalidate)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def drop_trigrams(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(trigram_index.invalidate)
+
+
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def drop_trigrams_on_tagging(sender, instance, raw=False, **kwargs):
+    if not raw and _is_post_tag(instance):
+        transaction.on_commit(trigram_index.invalidate)
@@ -0,0 +1,154 @@
+# Alx_DjangoLearnLab/django_blog/blog/staticfiles.py
+"""
+Content-hashed, precompressed static files.
+
+``CompressedManifestStaticFilesStorage`` is Django's manifest storage
+(``styles.css`` is collected as ``styles.<hash>.css`` and ``{% static %}``
+returns that name) that also writes ``.gz`` and, when the optional
+``brotli`` package is installed, ``.br`` siblings of every compressible
+hashed file at collectstatic time. A variant is only kept if it is
+smaller than the original.
+
+``serve()`` serves STATIC_ROOT for deployments without a front-end server
+doing it: it picks the best variant the client's Accept-Encoding allows
+(br, then gzip) and marks hashed files ``immutable`` for a year, so repeat
+visitors never ask for them again; a changed file gets a new name.
+Anything else (unhashed names, files found through the finders before
+collectstatic has run) is served with Last-Modified and revalidated.
+
+Until collectstatic has written a manifest (development, tests) the
+storage hands out the plain names instead of failing.
+"""
+import gzip
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import (
+    ManifestStaticFilesStorage, StaticFilesStorage, staticfiles_storage,
+)
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .exporter import accepts_encoding
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.txt', '.html', '.json', '.xml', '.map')
+# Not worth a second file (or a decompression) below this.
+MIN_COMPRESS_SIZE = 256
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, max-age=0, must-revalidate'
+
+# encoding -> file suffix, best first.
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+
+def compress(data):
+    """{encoding: compressed bytes} for the variants smaller than ``data``."""
+    variants = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(data, quality=11)
+    return {encoding: body for encoding, body in variants.items() if len(body) < len(data)}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+
+    def url(self, name, force=False):
+        if not self.hashed_files:
+            # No manifest yet: collectstatic has not run.
+            return StaticFilesStorage.url(self, name)
+        return super().url(name, force)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(set(self.hashed_files.values())):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                for encoding_name in self._compress(name):
+                    yield name, encoding_name, True
+
+    def _compress(self, name):
+        """Write the smaller variants of ``name``. Returns their names."""
+        with self.open(name) as f:
+            data = f.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return []
+        written = []
+        for encoding, body in compress(data).items():
+            variant = name + ENCODINGS[encoding]
+            if self.exists(variant):
+                self.delete(variant)
+            with open(self.path(variant), 'wb') as f:
+                f.write(body)
+            written.append(variant)
+        return written
+
+
+# --- Serving ----------------------------------------------------------------
+_hashed = (None, frozenset())
+
+
+def _hashed_names():
+    """The hashed names in the manifest, rebuilt only when it is reloaded."""
+    global _hashed
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', {})
+    if _hashed[0] is not hashed_files:
+        _hashed = (hashed_files, frozenset(hashed_files.values()))
+    return _hashed[1]
+
+
+def _locate(path):
+    """Absolute path of a static file, from STATIC_ROOT or else the finders."""
+    if settings.STATIC_ROOT:
+        # Paths escaping the root raise SuspiciousFileOperation (a 400).
+        fullpath = safe_join(settings.STATIC_ROOT, path)
+        if os.path.isfile(fullpath):
+            return fullpath
+    found = finders.find(path)
+    if not found:
+        raise Http404(path)
+    return found
+
+
+def _cache_headers(response, mtime):
+    """The caching headers, the same on a 304 as on the full response."""
+    response['Vary'] = 'Accept-Encoding'
+    if mtime is None:
+        response['Cache-Control'] = IMMUTABLE
+    else:
+        response['Cache-Control'] = REVALIDATE
+        response['Last-Modified'] = http_date(mtime)
+    return response
+
+
+def serve(request, path):
+    path = path.lstrip('/')
+    fullpath = _locate(path)
+    mtime = None
+    if path not in _hashed_names():
+        mtime = os.stat(fullpath).st_mtime
+        if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), mtime):
+            return _cache_headers(HttpResponseNotModified(), mtime)
+
+    content_type, _ = mimetypes.guess_type(fullpath)
+    accept = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    encoding = None
+    for name, suffix in ENCODINGS.items():
+        if accepts_encoding(accept, name) and os.path.isfile(fullpath + suffix):
+            encoding, fullpath = name, fullpath + suffix
+            break
+
+    response = FileResponse(
+        open(fullpath, 'rb'), content_type=content_type or 'application/octet-stream'
+    )
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return _cache_headers(response, mtime)
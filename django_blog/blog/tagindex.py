@@ -0,0 +1,265 @@
+# Alx_DjangoLearnLab/django_blog/blog/tagindex.py
+"""
+In-process tag -> post posting lists.
+
+Each cached tag maps to two parallel ``array('q')``s, ``stamps`` (published
+date in epoch microseconds) and ``ids``, sorted ascending by ``(stamp, id)``.
+A tag page bisects to its cursor, slices ``per_page`` ids and loads only
+those rows, so it never runs the TaggedItem join/DISTINCT after warm-up.
+
+The cache is an LRU bounded by the total number of postings. It is patched
+from signals after the write commits (see signals.py). Other processes
+notice writes through a shared generation counter in the Django cache: if
+the counter moved by anyone else, the local lists are dropped.
+"""
+import threading
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from django.core.cache import cache
+
+from .models import Post
+from .pagination import KeysetPage, decode_cursor, encode_cursor
+
+MAX_POSTINGS = 1_000_000
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_GENERATION_KEY = 'blog:tagindex:generation'
+
+
+def to_stamp(dt):
+    return (dt - _EPOCH) // timedelta(microseconds=1)
+
+
+def _lower_bound(stamps, ids, key):
+    """First index whose (stamp, id) is >= key."""
+    lo, hi = 0, len(ids)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if (stamps[mid], ids[mid]) < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _upper_bound(stamps, ids, key):
+    """First index whose (stamp, id) is > key."""
+    lo, hi = 0, len(ids)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if (stamps[mid], ids[mid]) <= key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class PostingList:
+    __slots__ = ('stamps', 'ids')
+
+    def __init__(self, rows=()):
+        self.stamps = array('q')
+        self.ids = array('q')
+        for stamp, pk in sorted(rows):
+            self.stamps.append(stamp)
+            self.ids.append(pk)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, stamp, pk):
+        i = _lower_bound(self.stamps, self.ids, (stamp, pk))
+        if i < len(self.ids) and self.ids[i] == pk and self.stamps[i] == stamp:
+            return
+        self.stamps.insert(i, stamp)
+        self.ids.insert(i, pk)
+
+    def discard(self, pk):
+        try:
+            i = self.ids.index(pk)
+        except ValueError:
+            return
+        del self.stamps[i]
+        del self.ids[i]
+
+
+class TagPostingCache:
+    """
+    LRU of ``(field, value)`` -> PostingList, where field is ``'slug'`` or
+    ``'name'`` and value is lowercased (the views match case-insensitively).
+    """
+
+    def __init__(self, max_postings=MAX_POSTINGS):
+        self.max_postings = max_postings
+        self._lists = OrderedDict()
+        self._size = 0
+        self._generation = None
+        self._lock = threading.Lock()
+
+    # --- cross-process invalidation ---
+    def _shared_generation(self):
+        generation = cache.get(_GENERATION_KEY)
+        if generation is None:
+            cache.add(_GENERATION_KEY, 0, None)
+            generation = cache.get(_GENERATION_KEY)
+        return generation
+
+    def _sync(self):
+        generation = self._shared_generation()
+        if generation != self._generation:
+            self._lists.clear()
+            self._size = 0
+            self._generation = generation
+
+    def _advance(self):
+        """Record a local write. Returns False if another process also wrote."""
+        self._shared_generation()
+        try:
+            generation = cache.incr(_GENERATION_KEY)
+        except ValueError:
+            generation = None
+        in_step = generation is not None and generation == (self._generation or 0) + 1
+        self._generation = generation
+        return in_step
+
+    # --- reads ---
+    def _rows(self, field, value):
+        return (
+            Post.objects.filter(**{f'tags__{field}__iexact': value})
+            .order_by().values_list('published_date', 'pk').distinct()
+        )
+
+    def _lookup(self, key):
+        with self._lock:
+            self._sync()
+            postings = self._lists.get(key)
+            if postings is not None:
+                self._lists.move_to_end(key)
+            return postings, self._generation
+
+    def _store(self, key, postings, generation):
+        with self._lock:
+            # Only keep the list if no write was applied while it loaded.
+            if key not in self._lists and generation == self._generation:
+                self._lists[key] = postings
+                self._size += len(postings)
+                while self._size > self.max_postings and len(self._lists) > 1:
+                    _, evicted = self._lists.popitem(last=False)
+                    self._size -= len(evicted)
+
+    def get(self, field, value):
+        key = (field, value.lower())
+        postings, generation = self._lookup(key)
+        if postings is None:
+            rows = self._rows(field, value)
+            postings = PostingList((to_stamp(published), pk) for published, pk in rows)
+            self._store(key, postings, generation)
+        return postings
+
+    async def aget(self, field, value):
+        key = (field, value.lower())
+        postings, generation = self._lookup(key)
+        if postings is None:
+            rows = self._rows(field, value)
+            postings = PostingList([(to_stamp(published), pk) async for published, pk in rows])
+            self._store(key, postings, generation)
+        return postings
+
+    # --- writes (called after commit) ---
+    def apply(self, added=(), removed=(), drop_all=False):
+        """
+        ``added`` holds ``(keys, stamp, pk)`` and ``removed`` holds
+        ``(keys, pk)`` tuples, ``keys`` being the cache keys of the tags
+        involved (None: every cached tag).
+        """
+        with self._lock:
+            if not self._advance() or drop_all:
+                self._lists.clear()
+                self._size = 0
+                return
+            for keys, stamp, pk in added:
+                for key in keys:
+                    postings = self._lists.get(key)
+                    if postings is not None:
+                        before = len(postings)
+                        postings.add(stamp, pk)
+                        self._size += len(postings) - before
+            for keys, pk in removed:
+                for key in keys if keys is not None else list(self._lists):
+                    postings = self._lists.get(key)
+                    if postings is not None:
+                        before = len(postings)
+                        postings.discard(pk)
+                        self._size += len(postings) - before
+
+    def clear(self):
+        with self._lock:
+            self._lists.clear()
+            self._size = 0
+            self._generation = None
+
+
+posting_cache = TagPostingCache()
+
+
+def tag_keys(tags):
+    """Cache keys for Tag rows/values (each tag is cached by slug and name)."""
+    keys = []
+    for name, slug in tags:
+        keys.append(('slug', slug.lower()))
+        keys.append(('name', name.lower()))
+    return keys
+
+
+class PostingListPaginator:
+    """KeysetPaginator-compatible pages served from a tag's posting list."""
+
+    def __init__(self, field, value, per_page):
+        self.field = field
+        self.value = value
+        self.per_page = per_page
+
+    def _window(self, postings, cursor):
+        """Newest-first ids of the page at ``cursor`` and its neighbours."""
+        stamps, ids = postings.stamps, postings.ids
+        if cursor:
+            direction, published, pk = decode_cursor(cursor)
+            key = (to_stamp(published), pk)
+        else:
+            direction, key = 'n', None
+
+        if direction == 'n':
+            hi = len(ids) if key is None else _lower_bound(stamps, ids, key)
+            lo = max(0, hi - self.per_page)
+            has_next, has_previous = lo > 0, key is not None
+        else:
+            lo = _upper_bound(stamps, ids, key)
+            hi = min(len(ids), lo + self.per_page)
+            has_next, has_previous = True, hi < len(ids)
+        return list(reversed(ids[lo:hi])), has_next, has_previous
+
+    def _queryset(self):
+        return Post.objects.select_related('author').defer('content')
+
+    def _make_page(self, rows, page_ids, has_next, has_previous):
+        posts = [rows[pk] for pk in page_ids if pk in rows]
+        next_cursor = previous_cursor = None
+        if posts and has_next:
+            next_cursor = encode_cursor(posts[-1].published_date, posts[-1].pk, 'n')
+        if posts and has_previous:
+            previous_cursor = encode_cursor(posts[0].published_date, posts[0].pk, 'p')
+        return KeysetPage(posts, next_cursor, previous_cursor)
+
+    def page(self, cursor=None):
+        postings = posting_cache.get(self.field, self.value)
+        page_ids, has_next, has_previous = self._window(postings, cursor)
+        rows = self._queryset().in_bulk(page_ids)
+        return self._make_page(rows, page_ids, has_next, has_previous)
+
+    async def apage(self, cursor=None):
+        postings = await posting_cache.aget(self.field, self.value)
+        page_ids, has_next, has_previous = self._window(postings, cursor)
+        rows = {post.pk: post async for post in self._queryset().filter(pk__in=page_ids)}
+        return self._make_page(rows, page_ids, has_next, has_previous)
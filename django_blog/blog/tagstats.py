@@ -0,0 +1,99 @@
+# Alx_DjangoLearnLab/django_blog/blog/tagstats.py
+"""
+Materialized tag statistics (TagStats) and the tag cloud built from them.
+
+Counters move incrementally on every TaggedItem insert/delete for a Post
+(which covers tags.add/remove/set/clear and cascades from post deletion);
+``rebuild()`` recomputes the whole table with one GROUP BY.
+
+``last_used`` is the newest publish date among the tag's posts on both
+paths. Incrementally it only moves forward, so after untagging the newest
+post it stays ahead until the next rebuild.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import Post, TagStats
+
+CLOUD_SIZE = 100
+CLOUD_WEIGHTS = 5
+
+
+def _increment(tag_id, published):
+    return TagStats.objects.filter(tag_id=tag_id).update(
+        post_count=F('post_count') + 1,
+        last_used=Greatest(Coalesce('last_used', Value(published)), Value(published)),
+    )
+
+
+def record_tagged(tag_id, published=None):
+    """Count a post tagged ``tag_id``; ``published`` is that post's publish date."""
+    published = published or timezone.now()
+    if not _increment(tag_id, published):
+        try:
+            with transaction.atomic():
+                TagStats.objects.create(tag_id=tag_id, post_count=1, last_used=published)
+        except IntegrityError:
+            # Created concurrently; fall back to the increment.
+            _increment(tag_id, published)
+
+
+def record_untagged(tag_id):
+    TagStats.objects.filter(tag_id=tag_id, post_count__gt=0).update(
+        post_count=F('post_count') - 1
+    )
+
+
+def rebuild(batch_size=1000):
+    """
+    Recompute every row from the posts' tags. ``last_used`` becomes the
+    newest publish date among the tag's posts. Returns the number of tags.
+    """
+    rows = (
+        Post.objects.filter(tags__isnull=False).order_by()
+        .values('tags').annotate(count=Count('pk', distinct=True), last=Max('published_date'))
+    )
+    stats = [
+        TagStats(tag_id=row['tags'], post_count=row['count'], last_used=row['last'])
+        for row in rows
+    ]
+    with transaction.atomic():
+        TagStats.objects.all().delete()
+        TagStats.objects.bulk_create(stats, batch_size=batch_size)
+    return len(stats)
+
+
+def _top_tags_queryset(limit):
+    return (
+        TagStats.objects.filter(post_count__gt=0)
+        .select_related('tag').order_by('-post_count', 'tag__name')[:limit]
+    )
+
+
+def top_tags(limit=CLOUD_SIZE):
+    return list(_top_tags_queryset(limit))
+
+
+def _weighted(stats):
+    if not stats:
+        return []
+    low = min(s.post_count for s in stats)
+    high = max(s.post_count for s in stats)
+    spread = max(high - low, 1)
+    for s in stats:
+        s.weight = 1 + (s.post_count - low) * (CLOUD_WEIGHTS - 1) // spread
+    return sorted(stats, key=lambda s: s.tag.name.lower())
+
+
+def cloud(limit=CLOUD_SIZE):
+    """
+    The ``limit`` most used tags, alphabetical, each with a ``weight`` from
+    1 to CLOUD_WEIGHTS scaled between the smallest and largest count.
+    """
+    return _weighted(top_tags(limit))
+
+
+async def acloud(limit=CLOUD_SIZE):
+    return _weighted([s async for s in _top_tags_queryset(limit)])
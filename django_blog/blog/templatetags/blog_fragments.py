@@ -0,0 +1,28 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from blog import fragments, pagecache
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_summary(post):
+    return mark_safe(fragments.post_summary(post))
+
+
+@register.simple_tag
+def post_body(post):
+    # Rendered and sanitized on save (blog/rendering.py).
+    return mark_safe(post.content_html)
+
+
+@register.simple_tag(takes_context=True)
+def hole(context, name, **params):
+    """
+    Render the viewer-specific template ``blog/holes/<name>.html`` wrapped in
+    markers so the anonymous page cache can re-render it per user.
+    """
+    params = {key: str(value) for key, value in params.items()}
+    html = pagecache.render_hole(name, context.get('request'), params)
+    return mark_safe(pagecache.wrap_hole(name, params, html))
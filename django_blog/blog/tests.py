@@ -1,3 +1,1299 @@
-from django.test import TestCase
+import base64
+import gzip
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError
+from django.db.models import QuerySet
+from django.template.response import TemplateResponse
+from django.test import TestCase, override_settings
+from django.urls import resolve, reverse
+from django.utils.http import http_date
+
+from . import (
+    async_views, autocomplete, benchmarks, fragments, profiles, related, rendering, search,
+    staticfiles, tagstats, threads, throttling, trending, versions, viewcounts,
+)
+from .tagindex import PostingList, posting_cache
+from .trigrams import trigram_index
+from .models import (
+    MAX_THREAD_DEPTH, Post, Comment, PostFeature, Profile, RelatedPost, TagStats, TrendingScore,
+)
+
+# No view counter flush thread: it could not write while a test holds its
+# transaction open, so views are flushed inline at the threshold instead.
+# No write throttling either: buckets live in the shared cache and would
+# leak between tests (ThrottleTests sets its own rates).
+_test_settings = override_settings(BLOG_VIEW_FLUSH_INTERVAL=None, BLOG_THROTTLE_RATES={})
+
+
+def setUpModule():
+    _test_settings.enable()
+
+
+def tearDownModule():
+    _test_settings.disable()
+
+
+class SearchIndexTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        self.django = Post.objects.create(
+            title='Django tips', content='Querysets are lazy.', author=self.user
+        )
+        self.python = Post.objects.create(
+            title='Python notes', content='Generators and Django signals.', author=self.user
+        )
+        self.python.tags.add('snakes')
+
+    def _titles(self, q):
+        response = self.client.get(reverse('blog:search_results'), {'q': q})
+        self.assertEqual(response.status_code, 200)
+        return [p.title for p in response.context['posts']]
+
+    def test_title_match_ranks_above_content_match(self):
+        self.assertEqual(self._titles('django'), ['Django tips', 'Python notes'])
+
+    def test_prefix_and_tag_match(self):
+        self.assertEqual(self._titles('snak'), ['Python notes'])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.django.title = 'Renamed'
+        self.django.content = 'Nothing here.'
+        self.django.save()
+        self.assertEqual(self._titles('querysets'), [])
+        # Misses fall back to the trigram index, which drops the tag after commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python.tags.remove('snakes')
+        self.assertEqual(self._titles('snakes'), [])
+        self.python.delete()
+        self.assertEqual(self._titles('generators'), [])
+
+    def test_operators_are_treated_as_text(self):
+        self.assertEqual(search.build_match_query('a OR "b'), '"a" "OR" "b"*')
+        self.assertEqual(self._titles('") NEAR('), [])
+
+    def test_rebuild_command(self):
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self._titles('generators'), ['Python notes'])
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        # Created in a tight loop, so many rows share a published_date and
+        # the id tie-breaker matters.
+        for i in range(25):
+            post = Post.objects.create(title=f'Post {i}', content='x', author=self.user)
+            post.tags.add('walk')
+        self.expected = [f'Post {i}' for i in reversed(range(25))]
+
+    def _walk(self, url):
+        seen, cursor, pages = [], None, []
+        while True:
+            response = self.client.get(url, {'cursor': cursor} if cursor else {})
+            page = response.context['page_obj']
+            pages.append(page)
+            seen += [p.title for p in page]
+            if not page.has_next():
+                return seen, pages
+            cursor = page.next_cursor
+
+    def test_forward_walk_visits_every_post_once(self):
+        for url in (reverse('blog:post_list'), reverse('blog:posts_by_tag', args=['walk'])):
+            seen, pages = self._walk(url)
+            self.assertEqual(seen, self.expected)
+            self.assertEqual(len(pages), 3)
+            self.assertFalse(pages[0].has_previous())
+
+    def test_previous_cursor_returns_prior_page(self):
+        _, pages = self._walk(reverse('blog:post_list'))
+        response = self.client.get(reverse('blog:post_list'), {'cursor': pages[2].previous_cursor})
+        self.assertEqual([p.title for p in response.context['page_obj']], self.expected[10:20])
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get(reverse('blog:post_list'), {'cursor': 'garbage!'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_naive_timestamp_cursor_is_404(self):
+        post = Post.objects.latest('pk')
+        naive = base64.urlsafe_b64encode(f'n|2020-01-01T00:00:00|{post.pk}'.encode()).decode()
+        for url in (reverse('blog:post_list'), reverse('blog:posts_by_tag', args=['walk'])):
+            self.assertEqual(self.client.get(url, {'cursor': naive}).status_code, 404)
+
+
+class CommentCountTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        self.reader = User.objects.create_user(username='reader', password='pass12345')
+        self.post = Post.objects.create(title='Counted', content='x', author=self.user)
+
+    def _count(self):
+        self.post.refresh_from_db()
+        return self.post.comment_count
+
+    def test_create_delete_and_cascade(self):
+        mine = Comment.objects.create(post=self.post, author=self.user, content='a')
+        Comment.objects.create(post=self.post, author=self.reader, content='b')
+        Comment.objects.create(post=self.post, author=self.reader, content='c')
+        self.assertEqual(self._count(), 3)
+
+        self.client.login(username='writer', password='pass12345')
+        self.client.post(reverse('blog:comment_delete', args=[mine.pk]))
+        self.assertEqual(self._count(), 2)
+
+        self.reader.delete()
+        self.assertEqual(self._count(), 0)
+
+    def test_repair_command(self):
+        Comment.objects.create(post=self.post, author=self.user, content='a')
+        Post.objects.update(comment_count=42)
+        call_command('repair_comment_counts', stdout=StringIO())
+        self.assertEqual(self._count(), 1)
+
+    def test_repair_command_leaves_tombstones_out(self):
+        parent = Comment.objects.create(post=self.post, author=self.user, content='parent')
+        Comment.objects.create(post=self.post, author=self.user, content='reply', parent=parent)
+        threads.remove_comments([parent])
+        self.assertEqual(self._count(), 1)
+        out = StringIO()
+        call_command('repair_comment_counts', stdout=out)
+        self.assertEqual(self._count(), 1)
+        self.assertIn('Repaired 0 ', out.getvalue())
+
+    def test_detail_view_query_count_is_independent_of_comments(self):
+        for i in range(5):
+            Comment.objects.create(post=self.post, author=self.reader, content=str(i))
+        self.post.tags.add('t')
+        # ETag aggregate, post+author, tags, first comment page, related posts
+        with self.assertNumQueries(5):
+            response = self.client.get(self.post.get_absolute_url())
+        self.assertContains(response, 'Comments (5)')
+
+
+class FragmentCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        fragments.reset_stats()
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        self.post = Post.objects.create(title='Cached', content='First body', author=self.user)
+
+    @override_settings(BLOG_ANONYMOUS_PAGE_CACHE=False)
+    def test_hits_after_first_render(self):
+        self.client.get(reverse('blog:post_list'))
+        self.client.get(reverse('blog:post_list'))
+        self.assertEqual(fragments.stats()['misses'], 1)
+        self.assertEqual(fragments.stats()['hits'], 1)
+
+    def test_save_and_tag_change_invalidate(self):
+        self.assertContains(self.client.get(self.post.get_absolute_url()), 'First body')
+        self.post.content = 'Second body'
+        self.post.save()
+        self.assertContains(self.client.get(self.post.get_absolute_url()), 'Second body')
+        before = versions.post_version(self.post.pk)
+        self.post.tags.add('fresh')
+        self.assertNotEqual(versions.post_version(self.post.pk), before)
+
+    def test_author_rename_invalidates_summary_but_login_does_not(self):
+        self.assertContains(self.client.get(reverse('blog:post_list')), 'By writer')
+        version = versions.author_version(self.user.pk)
+        self.client.login(username='writer', password='pass12345')
+        self.assertEqual(versions.author_version(self.user.pk), version)
+        self.user.username = 'renamed'
+        self.user.save()
+        self.assertContains(self.client.get(reverse('blog:post_list')), 'By renamed')
+
+    def test_stats_view_is_staff_only(self):
+        url = reverse('blog:fragment_cache_stats')
+        self.assertEqual(self.client.get(url).status_code, 302)
+        User.objects.create_user(username='staff', password='pass12345', is_staff=True)
+        self.client.login(username='staff', password='pass12345')
+        self.assertEqual(set(self.client.get(url).json()), {'hits', 'misses', 'hit_ratio'})
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        self.post = Post.objects.create(title='Validated', content='x', author=self.user)
+
+    def _revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_list_answers_304_without_queries(self):
+        url = reverse('blog:post_list')
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            again = self._revalidate(url, first)
+        self.assertEqual(again.status_code, 304)
+
+    def test_detail_304_until_a_comment_is_added(self):
+        url, list_url = self.post.get_absolute_url(), reverse('blog:post_list')
+        first, listing = self.client.get(url), self.client.get(list_url)
+        with self.assertNumQueries(1):
+            self.assertEqual(self._revalidate(url, first).status_code, 304)
+        post_version = versions.post_version(self.post.pk)
+        Comment.objects.create(post=self.post, author=self.user, content='new')
+        self.assertEqual(self._revalidate(url, first).status_code, 200)
+        # List pages show the comment count, so they change too.
+        self.assertNotEqual(versions.post_version(self.post.pk), post_version)
+        self.assertEqual(self._revalidate(list_url, listing).status_code, 200)
+
+    def test_etag_differs_per_user(self):
+        url = self.post.get_absolute_url()
+        anonymous = self.client.get(url)
+        self.client.login(username='writer', password='pass12345')
+        self.assertEqual(self._revalidate(url, anonymous).status_code, 200)
+
+    def test_missing_post_is_still_404(self):
+        self.assertEqual(self.client.get(reverse('blog:post_detail', args=[999])).status_code, 404)
+
+
+class AnonymousPageCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='owner', password='pass12345')
+        self.other = User.objects.create_user(username='other', password='pass12345')
+        self.post = Post.objects.create(title='Shared', content='x', author=self.owner)
+        self.comment = Comment.objects.create(post=self.post, author=self.other, content='hi')
+        self.edit_post = reverse('blog:post_update', args=[self.post.pk])
+        self.edit_comment = reverse('blog:comment_update', args=[self.comment.pk])
+
+    def test_anonymous_hit_runs_no_queries(self):
+        self.client.get(reverse('blog:post_list'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('blog:post_list'))
+        self.assertContains(response, 'Shared')
+        self.assertContains(response, reverse('blog:login'))
+
+    def test_holes_are_filled_per_user(self):
+        url = self.post.get_absolute_url()
+        anonymous = self.client.get(url)
+        self.assertContains(anonymous, 'to leave a comment')
+        self.assertNotContains(anonymous, self.edit_post)
+
+        self.client.login(username='owner', password='pass12345')
+        owner = self.client.get(url)
+        self.assertContains(owner, self.edit_post)
+        self.assertNotContains(owner, self.edit_comment)
+        self.assertContains(owner, 'csrfmiddlewaretoken')
+        self.assertContains(owner, reverse('blog:logout'))
+
+        self.client.login(username='other', password='pass12345')
+        other = self.client.get(url)
+        self.assertNotContains(other, self.edit_post)
+        self.assertContains(other, self.edit_comment)
+
+    def test_unkeyed_query_params_bypass_the_cache(self):
+        for url in (self.post.get_absolute_url(), reverse('blog:post_list')):
+            self.assertContains(self.client.get(url, {'q': 'INJECTED-TEXT'}), 'INJECTED-TEXT')
+            self.assertNotContains(self.client.get(url), 'INJECTED-TEXT')
+        # Page-selecting params are cached under their own key.
+        self.client.get(reverse('blog:post_list'), {'page': 1})
+        with self.assertNumQueries(0):
+            self.client.get(reverse('blog:post_list'), {'page': 1})
+
+    def test_cached_comment_form_posts(self):
+        self.client.get(self.post.get_absolute_url())
+        self.client.login(username='owner', password='pass12345')
+        self.client.post(reverse('blog:comment_create', args=[self.post.pk]), {'content': 'second'})
+        self.assertContains(self.client.get(self.post.get_absolute_url()), 'second')
+
+
+class ExcerptTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        self.post = Post.objects.create(title='Long', content='word ' * 1000, author=self.user)
+
+    def test_excerpt_and_word_count_follow_content(self):
+        self.assertEqual(self.post.word_count, 1000)
+        self.assertEqual(len(self.post.excerpt), 200)
+        self.post.content = 'short one'
+        self.post.save(update_fields=['content'])
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.excerpt, self.post.word_count), ('short one', 2))
+
+    def test_list_pages_do_not_load_content(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.post.tags.add('long')
+        for url in (reverse('blog:post_list'), reverse('blog:posts_by_tag', args=['long'])):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertContains(response, 'Long')
+            self.assertFalse(any('"blog_post"."content"' in q['sql'] for q in ctx.captured_queries))
+
+    def test_backfill_command(self):
+        Post.objects.update(excerpt='', word_count=0)
+        stamps = versions.post_version(self.post.pk), versions.content_version()
+        call_command('backfill_excerpts', batch_size=1, stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.word_count, 1000)
+        # Cached pages showing the old excerpt are invalidated.
+        self.assertNotEqual(versions.post_version(self.post.pk), stamps[0])
+        self.assertNotEqual(versions.content_version(), stamps[1])
+
+
+@override_settings(BLOG_ANONYMOUS_PAGE_CACHE=False)
+class TagPostingCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        posting_cache.clear()
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.posts = [
+                Post.objects.create(title=f'Tagged {i}', content='x', author=self.user)
+                for i in range(12)
+            ]
+            for post in self.posts:
+                post.tags.add('Hot Topic')
+        self.url = reverse('blog:posts_by_tag', args=['hot-topic'])
+
+    def _titles(self, **params):
+        response = self.client.get(self.url, params)
+        return [p.title for p in response.context['posts']], response.context['page_obj']
+
+    def test_posting_list_keeps_order(self):
+        postings = PostingList([(20, 2), (10, 1), (20, 3)])
+        postings.add(15, 9)
+        postings.add(15, 9)
+        postings.discard(2)
+        self.assertEqual(list(postings.ids), [1, 9, 3])
+
+    def test_warm_pages_fetch_only_rendered_rows(self):
+        titles, page = self._titles()
+        self.assertEqual(titles, [f'Tagged {i}' for i in range(11, 1, -1)])
+        with self.assertNumQueries(1):
+            titles, _ = self._titles(cursor=page.next_cursor)
+        self.assertEqual(titles, ['Tagged 1', 'Tagged 0'])
+
+    def test_signals_patch_cached_lists(self):
+        self._titles()
+        with self.captureOnCommitCallbacks(execute=True):
+            fresh = Post.objects.create(title='Fresh', content='x', author=self.user)
+            fresh.tags.add('Hot Topic')
+        self.assertEqual(self._titles()[0][0], 'Fresh')
+        with self.captureOnCommitCallbacks(execute=True):
+            fresh.tags.remove('Hot Topic')
+            self.posts[-1].delete()
+        self.assertEqual(self._titles()[0][0], 'Tagged 10')
+
+
+class TagStatsTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        self.first = Post.objects.create(title='One', content='x', author=self.user)
+        self.second = Post.objects.create(title='Two', content='x', author=self.user)
+        self.first.tags.add('django', 'python')
+        self.second.tags.add('django')
+
+    def _counts(self):
+        return dict(TagStats.objects.values_list('tag__name', 'post_count'))
+
+    def test_counts_follow_tag_changes_and_deletes(self):
+        self.assertEqual(self._counts(), {'django': 2, 'python': 1})
+        self.first.tags.set(['python', 'orm'])
+        self.assertEqual(self._counts(), {'django': 1, 'python': 1, 'orm': 1})
+        self.second.delete()
+        self.assertEqual(self._counts(), {'django': 0, 'python': 1, 'orm': 1})
+
+    def test_rebuild_command(self):
+        TagStats.objects.all().delete()
+        call_command('rebuild_tag_stats', stdout=StringIO())
+        self.assertEqual(self._counts(), {'django': 2, 'python': 1})
+
+    def test_last_used_is_newest_publish_date_on_both_paths(self):
+        long_ago = datetime(2020, 1, 1, tzinfo=dt_timezone.utc)
+        old = Post.objects.create(title='Old', content='x', author=self.user)
+        Post.objects.filter(pk=old.pk).update(published_date=long_ago)
+        old.tags.add('django', 'history')
+        incremental = dict(TagStats.objects.values_list('tag__name', 'last_used'))
+        # Tagging an older post does not move last_used back.
+        self.assertEqual(incremental['django'], Post.objects.get(pk=self.second.pk).published_date)
+        self.assertEqual(incremental['history'], long_ago)
+        tagstats.rebuild()
+        self.assertEqual(dict(TagStats.objects.values_list('tag__name', 'last_used')), incremental)
+
+    def test_cloud_and_json(self):
+        response = self.client.get(reverse('blog:tag_cloud'))
+        self.assertContains(response, 'tag-weight-5')
+        data = self.client.get(reverse('blog:tag_stats'), {'limit': 1}).json()
+        self.assertEqual([(t['name'], t['post_count']) for t in data['tags']], [('django', 2)])
+
+
+class FeedTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post = Post.objects.create(title='Feed me', content='x', author=self.user)
+            self.post.tags.add('news')
+
+    def _get(self, url, **headers):
+        response = self.client.get(url, **headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_site_author_and_tag_feeds(self):
+        for url in (
+            reverse('blog:feed'),
+            reverse('blog:author_feed', args=['writer']),
+            reverse('blog:tag_feed', args=['news']),
+        ):
+            response, body = self._get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('atom', response['Content-Type'])
+            self.assertIn(b'Feed me', body)
+        self.assertEqual(self.client.get(reverse('blog:author_feed', args=['nobody'])).status_code, 404)
+
+    def test_poll_is_one_cache_hit_and_revalidates(self):
+        url = reverse('blog:feed')
+        first, _ = self._get(url)
+        with self.assertNumQueries(0):
+            again, _ = self._get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, 304)
+
+    def test_last_modified_is_newest_entry(self):
+        long_ago = datetime(2020, 1, 1, tzinfo=dt_timezone.utc)
+        Post.objects.filter(pk=self.post.pk).update(published_date=long_ago)
+        cache.clear()
+        response, _ = self._get(reverse('blog:feed'))
+        self.assertEqual(response['Last-Modified'], http_date(long_ago.timestamp()))
+        revalidated, _ = self._get(reverse('blog:feed'), HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_post_change_regenerates_only_affected_feeds(self):
+        url = reverse('blog:tag_feed', args=['news'])
+        first, _ = self._get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            other = Post.objects.create(title='Second', content='x', author=self.user)
+        self.assertEqual(self._get(url, HTTP_IF_NONE_MATCH=first['ETag'])[0].status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            other.tags.add('news')
+        response, body = self._get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Second', body)
+
+
+class ImportPostsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(username='writer', password='pass12345')
+
+    def _import(self, lines, suffix='.jsonl', *args):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'w') as fh:
+            fh.write('\n'.join(lines))
+        out = StringIO()
+        call_command('import_posts', path, '--batch-size', '2', *args, stdout=out)
+        return out.getvalue()
+
+    def test_jsonl_import_with_tags_dates_and_rebuild(self):
+        records = [
+            {'title': 'Old news', 'content': 'archive body', 'author': 'writer',
+             'tags': ['history', 'news'], 'published_date': '2001-02-03T04:05:06Z'},
+            {'title': 'Second', 'content': 'b', 'author': 'writer', 'tags': ['news']},
+            {'title': 'Orphan', 'content': 'c', 'author': 'ghost'},
+        ]
+        out = self._import([json.dumps(r) for r in records])
+        self.assertIn('Imported 2 posts, skipped 1', out)
+        old = Post.objects.get(title='Old news')
+        self.assertEqual(old.published_date.year, 2001)
+        self.assertEqual(sorted(old.tags.names()), ['history', 'news'])
+        self.assertEqual(old.excerpt, 'archive body')
+        self.assertEqual(TagStats.objects.get(tag__name='news').post_count, 2)
+        response = self.client.get(reverse('blog:search_results'), {'q': 'archive'})
+        self.assertEqual([p.title for p in response.context['posts']], ['Old news'])
+
+    def test_failed_import_still_rebuilds_for_committed_posts(self):
+        lines = [
+            json.dumps({'title': 'Kept', 'content': 'salvaged body', 'author': 'writer'}),
+            json.dumps({'title': 'Also kept', 'content': 'b', 'author': 'writer'}),
+            '{not json',
+        ]
+        with self.assertRaisesMessage(CommandError, 'Import stopped after 2 posts'):
+            self._import(lines)
+        response = self.client.get(reverse('blog:search_results'), {'q': 'salvaged'})
+        self.assertEqual([p.title for p in response.context['posts']], ['Kept'])
+
+    def test_import_reaches_autocomplete(self):
+        self.assertEqual(autocomplete.prefix_index.lookup('kube'), [])
+        self._import([json.dumps({'title': 'Kubernetes primer', 'content': 'c', 'author': 'writer'})])
+        self.assertEqual(
+            [label for _, _, label, _ in autocomplete.prefix_index.lookup('kube')],
+            ['Kubernetes primer'],
+        )
+
+    def test_import_reaches_fuzzy_search(self):
+        self.assertEqual(trigram_index.search('kubernetis'), [])
+        self._import([json.dumps({'title': 'Kubernetes primer', 'content': 'c', 'author': 'writer'})])
+        post = Post.objects.get(title='Kubernetes primer')
+        self.assertEqual([pk for pk, _ in trigram_index.search('kubernetis')], [post.pk])
+
+    def test_csv_import_creates_authors_and_profiles(self):
+        self._import(
+            ['title,content,author,tags', 'Hello,body,newbie,"a, b"'],
+            '.csv', '--create-authors',
+        )
+        post = Post.objects.get(title='Hello')
+        self.assertEqual(post.author.username, 'newbie')
+        self.assertTrue(hasattr(post.author, 'profile'))
+        self.assertEqual(sorted(post.tags.names()), ['a', 'b'])
+
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        self.staff = User.objects.create_user(username='staff', password='pass12345', is_staff=True)
+        for i in range(5):
+            post = Post.objects.create(title=f'P{i}', content='body, with comma', author=self.staff)
+            post.tags.add('t%d' % (i % 2))
+            Comment.objects.create(post=post, author=self.staff, content='c')
+
+    def _export(self, url, **headers):
+        self.client.login(username='staff', password='pass12345')
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content)
+
+    def test_ndjson_posts_with_tags(self):
+        _, body = self._export(reverse('blog:export', args=['posts', 'ndjson']))
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual([r['title'] for r in rows], ['P0', 'P1', 'P2', 'P3', 'P4'])
+        self.assertEqual(rows[1]['tags'], ['t1'])
+        self.assertEqual(rows[0]['author'], 'staff')
+
+    def test_gzip_csv_comments(self):
+        response, body = self._export(
+            reverse('blog:export', args=['comments', 'csv']), HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        lines = gzip.decompress(body).decode().splitlines()
+        self.assertEqual(
+            lines[0], 'id,post_id,parent_id,author,content,is_removed,created_at,updated_at'
+        )
+        self.assertEqual(len(lines), 6)
+
+    def test_thread_structure_is_exported(self):
+        parent = Comment.objects.first()
+        reply = Comment.objects.create(post=parent.post, author=self.staff, content='r', parent=parent)
+        _, body = self._export(reverse('blog:export', args=['comments', 'ndjson']))
+        rows = {row['id']: row for row in map(json.loads, body.decode().splitlines())}
+        self.assertEqual(rows[reply.pk]['parent_id'], parent.pk)
+        self.assertIs(rows[parent.pk]['is_removed'], False)
+
+    def test_gzip_refused_with_zero_q(self):
+        url = reverse('blog:export', args=['posts', 'ndjson'])
+        for accept in ('gzip;q=0', '*, gzip;q=0', 'identity'):
+            response, body = self._export(url, HTTP_ACCEPT_ENCODING=accept)
+            self.assertFalse(response.has_header('Content-Encoding'))
+            self.assertIn('Accept-Encoding', response['Vary'])
+        response, _ = self._export(url, HTTP_ACCEPT_ENCODING='br, *;q=0.1')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_malformed_q_value_refuses_gzip(self):
+        url = reverse('blog:export', args=['posts', 'ndjson'])
+        for accept in ('gzip;q=.', 'gzip;q=1.0.0', 'gzip;q=2', 'gzip;q='):
+            response, _ = self._export(url, HTTP_ACCEPT_ENCODING=accept)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.has_header('Content-Encoding'))
+        response, _ = self._export(url, HTTP_ACCEPT_ENCODING='gzip;Q=0.5')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_tags_are_fetched_once_per_chunk(self):
+        from blog import exporter
+        # One streamed row query plus one tag query per chunk of two.
+        with self.assertNumQueries(1 + 3):
+            rows = list(exporter.post_rows(chunk_size=2))
+        self.assertEqual(len(rows), 5)
+
+    def test_staff_only(self):
+        self.assertEqual(self.client.get(reverse('blog:export', args=['posts', 'csv'])).status_code, 302)
+
+
+class AsyncReadViewTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        posting_cache.clear()
+        switch = benchmarks.use_async_views()
+        switch.__enter__()
+        self.addCleanup(switch.__exit__, None, None, None)
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.posts = [
+                Post.objects.create(title=f'Async {i}', content='Event loops.', author=self.user)
+                for i in range(12)
+            ]
+            self.posts[0].tags.add('asyncio')
+        Comment.objects.create(post=self.posts[0], author=self.user, content='First!')
+
+    def test_routes_resolve_to_async_views(self):
+        match = resolve(reverse('blog:post_detail', args=[self.posts[0].pk]))
+        self.assertIs(match.func.view_class, async_views.PostDetailView)
+        self.assertTrue(match.func.view_class.view_is_async)
+        self.assertIs(resolve(reverse('blog:search_results')).func.view_class,
+                      async_views.SearchResultsView)
+
+    async def test_list_tag_and_cloud_pages(self):
+        response = await self.async_client.get(reverse('blog:post_list'))
+        self.assertEqual([p.title for p in response.context['posts']][:2], ['Async 11', 'Async 10'])
+        cursor = response.context['page_obj'].next_cursor
+        response = await self.async_client.get(reverse('blog:post_list'), {'cursor': cursor})
+        self.assertEqual([p.title for p in response.context['posts']], ['Async 1', 'Async 0'])
+        response = await self.async_client.get(reverse('blog:posts_by_tag', args=['asyncio']))
+        self.assertContains(response, 'Async 0')
+        response = await self.async_client.get(reverse('blog:tag_cloud'))
+        self.assertContains(response, 'tag-weight-1')
+
+    async def test_detail_and_search(self):
+        url = reverse('blog:post_detail', args=[self.posts[0].pk])
+        response = await self.async_client.get(url)
+        self.assertContains(response, 'First!')
+        self.assertContains(response, 'asyncio')
+        response = await self.async_client.get(url, headers={'if-none-match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+        missing = await self.async_client.get(reverse('blog:post_detail', args=[9999]))
+        self.assertEqual(missing.status_code, 404)
+        response = await self.async_client.get(reverse('blog:search_results'), {'q': 'async', 'page': 2})
+        self.assertEqual(len(response.context['posts']), 2)
+        self.assertEqual(response.context['paginator'].count, 12)
+
+    async def test_cached_page_is_rendered_off_the_event_loop(self):
+        threads_seen = []
+        real_render = TemplateResponse.render
+
+        def render(response):
+            threads_seen.append(threading.current_thread())
+            return real_render(response)
+
+        with mock.patch.object(TemplateResponse, 'render', render):
+            response = await self.async_client.get(reverse('blog:post_list'))
+        self.assertContains(response, 'Async 11')
+        self.assertTrue(threads_seen)
+        self.assertNotIn(threading.current_thread(), threads_seen)
+
+    async def test_logged_in_viewer_gets_owner_links(self):
+        await self.async_client.aforce_login(self.user)
+        url = reverse('blog:post_detail', args=[self.posts[0].pk])
+        response = await self.async_client.get(url)
+        self.assertContains(response, reverse('blog:post_update', args=[self.posts[0].pk]))
+        self.assertContains(response, 'Logout')
+
+
+class CommentThreadTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        self.post = Post.objects.create(title='Threads', content='x', author=self.user)
+        self.first = self._comment('first')
+        self.second = self._comment('second')
+        self.reply = self._comment('reply', parent=self.first)
+        self.nested = self._comment('nested', parent=self.reply)
+
+    def _comment(self, content, parent=None):
+        return Comment.objects.create(post=self.post, author=self.user, content=content, parent=parent)
+
+    def _refresh(self):
+        self.post.refresh_from_db()
+        return [(c.content, c.depth) for c in threads.thread(self.post.pk)]
+
+    def test_thread_and_subtree_in_display_order(self):
+        self.assertEqual(
+            self._refresh(), [('first', 0), ('reply', 1), ('nested', 2), ('second', 0)]
+        )
+        with self.assertNumQueries(1):
+            subtree = [c.content for c in threads.subtree(self.first)]
+        self.assertEqual(subtree, ['first', 'reply', 'nested'])
+
+    def test_depth_is_capped(self):
+        parent = self.nested
+        for i in range(MAX_THREAD_DEPTH + 2):
+            parent = self._comment(f'deep {i}', parent=parent)
+        self.assertEqual(parent.depth, MAX_THREAD_DEPTH - 1)
+
+    def test_remove_tombstones_then_prunes(self):
+        self.assertEqual(threads.remove_comments([self.first]), (0, 1))
+        self.assertEqual(self._refresh()[0], ('', 0))
+        self.assertEqual(self.post.comment_count, 3)
+        # Removing the last replies also drops the tombstone above them.
+        self.assertEqual(threads.remove_comments([self.reply, self.nested]), (3, 0))
+        self.assertEqual(self._refresh(), [('second', 0)])
+        self.assertEqual(self.post.comment_count, 1)
+
+    def test_reply_and_delete_views(self):
+        self.client.login(username='writer', password='pass12345')
+        response = self.client.post(
+            reverse('blog:comment_reply', args=[self.post.pk, self.second.pk]), {'content': 'hi'}
+        )
+        reply = Comment.objects.get(content='hi')
+        self.assertEqual(reply.parent, self.second)
+        self.assertRedirects(response, reverse('blog:post_detail', args=[self.post.pk]) + f'#comment-{reply.pk}')
+        self.client.post(reverse('blog:comment_delete', args=[self.second.pk]))
+        response = self.client.get(reverse('blog:post_detail', args=[self.post.pk]))
+        self.assertContains(response, '[deleted]')
+        self.assertContains(response, 'class="comment-depth-1"', count=2)
+
+
+@override_settings(BLOG_ANONYMOUS_PAGE_CACHE=False)
+class CommentPageTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        self.post = Post.objects.create(title='Viral', content='x', author=self.user)
+        for i in range(5):
+            Comment.objects.create(post=self.post, author=self.user, content=f'c{i}')
+        patcher = mock.patch.object(threads, 'COMMENTS_PER_PAGE', 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_detail_embeds_first_page(self):
+        response = self.client.get(self.post.get_absolute_url())
+        self.assertContains(response, 'c1')
+        self.assertNotContains(response, 'c2')
+        self.assertContains(response, 'data-load-more')
+
+    def test_fragments_follow_cursor_to_the_end(self):
+        url = reverse('blog:comment_page', args=[self.post.pk])
+        seen, after = [], ''
+        while True:
+            data = self.client.get(url, {'after': after, 'format': 'json'}).json()
+            seen += [c['content'] for c in data['comments']]
+            if not data['next_cursor']:
+                break
+            after = data['next_cursor']
+        self.assertEqual(seen, ['c0', 'c1', 'c2', 'c3', 'c4'])
+        html = self.client.get(url, {'after': after}).content.decode()
+        self.assertNotIn('data-load-more', html)
+
+    def test_bad_cursor_and_post_are_404(self):
+        url = reverse('blog:comment_page', args=[self.post.pk])
+        self.assertEqual(self.client.get(url, {'after': 'NOPE'}).status_code, 404)
+        self.assertEqual(
+            self.client.get(reverse('blog:comment_page', args=[9999])).status_code, 404
+        )
+
+
+class ProfileProvisioningTests(TestCase):
+
+    def test_created_with_user_and_not_looked_up_on_login(self):
+        user = User.objects.create_user(username='writer', password='pass12345')
+        self.assertTrue(Profile.objects.filter(user=user).exists())
+        # update_last_login: one UPDATE, no profile SELECT.
+        with self.assertNumQueries(1):
+            user.save(update_fields=['last_login'])
+
+    def test_lazy_accessor_creates_once(self):
+        user = User.objects.create_user(username='writer', password='pass12345')
+        Profile.objects.filter(user=user).delete()
+        user = User.objects.get(pk=user.pk)
+        self.assertEqual(profiles.get_profile(user).user_id, user.pk)
+        with self.assertNumQueries(0):
+            profiles.get_profile(user)
+        self.assertEqual(Profile.objects.filter(user=user).count(), 1)
+
+    def test_backfill_command(self):
+        User.objects.bulk_create([User(username=f'bulk{i}') for i in range(3)])
+        out = StringIO()
+        call_command('backfill_profiles', '--batch-size', '2', stdout=out)
+        self.assertIn('Created 3 profiles.', out.getvalue())
+        self.assertFalse(User.objects.filter(profile__isnull=True).exists())
+
+
+class ContentRenderingTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+
+    def test_sanitizer_allowlist(self):
+        html = rendering.sanitize(
+            '<p onclick="x()">Hi <script>alert(1)</script><b>bold'
+            '<a href="java\nscript:alert(1)">bad</a> <a href="https://ok.example/">ok</a>'
+        )
+        self.assertEqual(
+            html,
+            '<p>Hi <b>bold<a rel="nofollow noopener">bad</a> '
+            '<a href="https://ok.example/" rel="nofollow noopener">ok</a></b></p>',
+        )
+
+    def test_saved_html_is_served_verbatim(self):
+        post = Post.objects.create(title='T', content='One <em>\n\nTwo', author=self.user)
+        self.assertEqual(post.renderer, rendering.RENDERER)
+        self.assertIn('&lt;em&gt;' if rendering.markdown is None else '<em>', post.content_html)
+        Post.objects.filter(pk=post.pk).update(content_html='<p>stored</p>')
+        versions.bump_post_version(post.pk)
+        self.assertContains(self.client.get(post.get_absolute_url()), '<p>stored</p>')
+
+    def test_rerender_only_stale_rows(self):
+        fresh = Post.objects.create(title='A', content='a', author=self.user)
+        stale = Post.objects.create(title='B', content='b', author=self.user)
+        Post.objects.filter(pk=stale.pk).update(renderer='old', content_html='')
+        out = StringIO()
+        call_command('rerender_posts', stdout=out)
+        self.assertIn('Re-rendered 1 posts', out.getvalue())
+        stale.refresh_from_db()
+        self.assertEqual(stale.content_html, rendering.render('b'))
+        self.assertEqual(fresh.renderer, stale.renderer)
+
+    @skipUnless(rendering.markdown, "markdown is not installed")
+    def test_markdown(self):
+        self.assertEqual(rendering.render('**hi** <i onmouseover="x">'), '<p><strong>hi</strong> <i></i></p>')
+
+
+class RelatedPostTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+
+    def _post(self, title, *tags):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(title=title, content='x', author=self.user)
+            post.tags.add(*tags)
+        return post
+
+    def _related(self, post):
+        return [p.title for p in related.related_posts(post.pk)]
+
+    def test_similar_posts_rank_first(self):
+        a = self._post('Django testing tips', 'django', 'python')
+        b = self._post('Testing Django views', 'django', 'python')
+        c = self._post('Python packaging', 'python')
+        self._post('Sourdough bread', 'baking')
+        self.assertIn('w:testing', set(PostFeature.objects.filter(post=a).values_list('feature', flat=True)))
+        self.assertEqual(self._related(a), [b.title, c.title])
+        self.assertEqual(self._related(b), [a.title, c.title])
+        # 4 shared features ("django", "testing" and both tags) out of 6
+        self.assertAlmostEqual(RelatedPost.objects.get(post=a, related=b).score, 4 / 6)
+
+    def test_tag_changes_update_neighbours(self):
+        a = self._post('Django tips', 'django', 'python')
+        b = self._post('Views', 'django', 'python')
+        c = self._post('Bread', 'baking')
+        self.assertEqual(self._related(a), [b.title])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            c.tags.set(['django', 'python'])
+        self.assertEqual(self._related(a), [b.title, c.title])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            b.tags.clear()
+        self.assertEqual(self._related(a), [c.title])
+        self.assertEqual(self._related(b), [])
+
+    def test_delete_rescores_posts_listing_it(self):
+        a = self._post('Django tips', 'django')
+        b = self._post('Django views', 'django')
+        c = self._post('Django forms', 'django')
+        with self.captureOnCommitCallbacks(execute=True):
+            b.delete()
+        self.assertEqual(self._related(a), [c.title])
+        self.assertFalse(RelatedPost.objects.filter(related_id=b.pk).exists())
+
+    def test_rebuild_matches_incremental_and_detail_shows_list(self):
+        a = self._post('Django tips', 'django', 'python')
+        self._post('Django views', 'django')
+        self._post('Python tips', 'python')
+        incremental = set(RelatedPost.objects.values_list('post_id', 'related_id', 'score'))
+        out = StringIO()
+        call_command('rebuild_related_posts', stdout=out)
+        self.assertIn('Rebuilt related posts for 3 posts', out.getvalue())
+        self.assertEqual(set(RelatedPost.objects.values_list('post_id', 'related_id', 'score')), incremental)
+        self.assertContains(self.client.get(a.get_absolute_url()), 'Related posts')
+
+
+class ViewCountTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        self.post = Post.objects.create(title='Viewed', content='x', author=self.user)
+        self.other = Post.objects.create(title='Other', content='y', author=self.user)
+        patcher = mock.patch.object(viewcounts, 'counter', viewcounts.ViewCounter())
+        self.counter = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_views_are_buffered_then_flushed(self):
+        url = self.post.get_absolute_url()
+        first = self.client.get(url)
+        self.client.get(url)
+        # Revalidations and page cache hits are views too.
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        self.client.get(self.other.get_absolute_url())
+        self.client.get(reverse('blog:post_detail', args=[999]))
+
+        self.assertEqual(Post.objects.get(pk=self.post.pk).view_count, 0)
+        self.assertEqual(viewcounts.live_counts([self.post.pk, self.other.pk]), {self.post.pk: 3, self.other.pk: 1})
+        self.assertEqual(self.counter.flush(), 4)
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.view_count, viewcounts.live_count(self.post)), (3, 3))
+
+    @override_settings(BLOG_VIEW_FLUSH_THRESHOLD=3)
+    def test_threshold_flushes_inline_without_a_thread(self):
+        for _ in range(3):
+            viewcounts.record_view(self.post.pk)
+        self.assertEqual(self.counter.pending(), 0)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 3)
+
+    @override_settings(BLOG_VIEW_FLUSH_THRESHOLD=1000)
+    def test_failed_flush_keeps_a_bounded_buffer(self):
+        self.counter.add(self.post.pk, 9000)
+        with mock.patch.object(Post.objects, 'filter', side_effect=DatabaseError), \
+                self.assertLogs('blog.viewcounts', 'ERROR'):
+            self.assertEqual(self.counter.flush(), 0)
+        self.assertEqual(self.counter.pending(self.post.pk), 9000)
+        self.counter.add(self.other.pk, 2000)
+        self.assertEqual((self.counter.pending(), self.counter.dropped), (10000, 1000))
+
+    def test_full_save_does_not_overwrite_counters(self):
+        Post.objects.filter(pk=self.post.pk).update(view_count=7)
+        self.post.title = 'Renamed'
+        self.post.save()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.title, self.post.view_count), ('Renamed', 7))
+
+
+class TrendingTests(TestCase):
+    T0 = 1_800_000_000
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        self.a = Post.objects.create(title='Old news', content='x', author=self.user)
+        self.b = Post.objects.create(title='Fresh', content='y', author=self.user)
+
+    def _score(self, post, now):
+        return trending.score(TrendingScore.objects.get(post=post).key, now)
+
+    def test_scores_decay_and_accumulate(self):
+        trending.record(self.a.pk, 10, now=self.T0)
+        trending.record(self.b.pk, 4, now=self.T0 + trending.HALF_LIFE)
+        trending.record(self.b.pk, 2, now=self.T0 + trending.HALF_LIFE)
+        later = self.T0 + trending.HALF_LIFE
+        self.assertAlmostEqual(self._score(self.a, later), 5)
+        self.assertAlmostEqual(self._score(self.b, later), 6)
+        self.assertEqual([p.title for p in trending.trending_posts(now=later)], ['Fresh', 'Old news'])
+        self.assertAlmostEqual(self._score(self.b, later + 2 * trending.HALF_LIFE), 1.5)
+
+    def test_comments_and_view_flushes_feed_the_score(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(post=self.a, author=self.user, content='hi')
+        self.assertAlmostEqual(self._score(self.a, None), trending.COMMENT_WEIGHT, places=3)
+        counter = viewcounts.ViewCounter()
+        counter.add(self.a.pk, 3)
+        counter.flush()
+        self.assertAlmostEqual(
+            self._score(self.a, None), trending.COMMENT_WEIGHT + 3 * trending.VIEW_WEIGHT, places=3
+        )
+        # A rebuild rescores from dates alone: both posts, plus the comment.
+        out = StringIO()
+        call_command('compact_trending', '--rebuild', stdout=out)
+        self.assertIn('Rescored 2 posts', out.getvalue())
+        self.assertAlmostEqual(
+            self._score(self.a, None), trending.NEW_POST_WEIGHT + trending.COMMENT_WEIGHT, places=2
+        )
+
+    def test_compact_prunes_and_page_reads_the_snapshot(self):
+        trending.record(self.a.pk, 1, now=self.T0)
+        trending.record(self.b.pk, 1, now=self.T0 + 20 * trending.HALF_LIFE)
+        top = trending.compact(now=self.T0 + 20 * trending.HALF_LIFE)
+        self.assertEqual([post_id for post_id, _ in top], [self.b.pk])
+        self.assertFalse(TrendingScore.objects.filter(post=self.a).exists())
+
+        trending.compact()
+        with self.assertNumQueries(1):
+            self.assertEqual(trending.trending_posts(), [self.b])
+        self.assertContains(self.client.get(reverse('blog:trending')), 'Fresh')
+
+    def test_page_loads_only_its_own_posts(self):
+        posts = [Post.objects.create(title=f'Hot {i}', content='x', author=self.user) for i in range(25)]
+        for i, post in enumerate(posts):
+            trending.record(post.pk, i + 1, now=self.T0)
+        trending.compact(now=self.T0)
+        real_in_bulk = QuerySet.in_bulk
+        with mock.patch.object(QuerySet, 'in_bulk', autospec=True, side_effect=real_in_bulk) as in_bulk:
+            response = self.client.get(reverse('blog:trending'), {'page': 2})
+        self.assertEqual([p.title for p in response.context['posts']], [f'Hot {i}' for i in range(14, 4, -1)])
+        self.assertEqual(response.context['paginator'].count, 25)
+        # The whole snapshot is counted, but only the page's ten posts are read.
+        self.assertEqual([len(call.args[1]) for call in in_bulk.call_args_list], [10])
+
+
+class AutocompleteTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        self.tips = Post.objects.create(title='Django tips', content='x', author=self.user)
+        self.intro = Post.objects.create(title='Intro to  Django', content='x', author=self.user)
+        self.tips.tags.add('django')
+        self.index = autocomplete.prefix_index
+        self.index.load()
+
+    def _labels(self, prefix):
+        return [label for _, _, label, _ in self.index.lookup(prefix)]
+
+    def test_word_prefixes_ranked_without_queries(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self._labels('DJA'), ['django', 'Django tips', 'Intro to  Django'])
+            self.assertEqual(self._labels('to dj'), ['Intro to  Django'])
+            self.assertEqual(self._labels('d'), [])
+
+    def test_signals_patch_the_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tips.title = 'Flask tips'
+            self.tips.save()
+            self.intro.delete()
+            Post.objects.create(title='Djangonaut diaries', content='x', author=self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._labels('dj'), ['django', 'Djangonaut diaries'])
+            self.assertEqual(self._labels('fla'), ['Flask tips'])
+
+    def test_write_in_another_process_forces_a_reload(self):
+        Post.objects.create(title='Django forms', content='x', author=self.user)
+        cache.incr('blog:autocomplete:generation')
+        with self.assertNumQueries(1):
+            self.assertIn('Django forms', self._labels('django f'))
+
+    def test_json_endpoint(self):
+        response = self.client.get(reverse('blog:autocomplete'), {'q': 'intro', 'limit': 'x'})
+        self.assertEqual(response.json(), {'suggestions': [
+            {'kind': 'post', 'label': 'Intro to  Django', 'url': self.intro.get_absolute_url()},
+        ]})
+
+
+class TrigramSearchTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        trigram_index.invalidate()
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        self.post = Post.objects.create(
+            title='Django deployment checklist', content='Gunicorn settings', author=self.user
+        )
+        self.post.tags.add('python')
+        search.index_posts([self.post])
+
+    def test_did_you_mean(self):
+        self.assertEqual(trigram_index.did_you_mean('Djang deploymnt'), 'django deployment')
+        self.assertEqual(trigram_index.did_you_mean('pytho tips'), 'python tips')
+        self.assertIsNone(trigram_index.did_you_mean('django'))
+
+    def test_search_falls_back_to_similar_titles_and_tags(self):
+        response = self.client.get(reverse('blog:search_results'), {'q': 'deploymnt'})
+        self.assertContains(response, 'Django deployment checklist')
+        self.assertContains(response, 'Did you mean')
+        self.assertTrue(response.context['fuzzy'])
+        # Content is never matched fuzzily.
+        self.assertEqual(trigram_index.search('gunicron'), [])
+
+    @override_settings(BLOG_TRIGRAM_THRESHOLD=0.9, BLOG_TRIGRAM_SUGGEST_THRESHOLD=0.9)
+    def test_thresholds_are_configurable(self):
+        self.assertEqual(trigram_index.search('deploymnt'), [])
+        self.assertIsNone(trigram_index.did_you_mean('deploymnt'))
+        self.assertEqual(trigram_index.search('deploymnt', threshold=0.3), [(self.post.pk, mock.ANY)])
+
+    def test_title_changes_reach_the_index(self):
+        self.assertEqual(trigram_index.search('kubernetes'), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.title = 'Kubernetes checklist'
+            self.post.save()
+        self.assertEqual([pk for pk, _ in trigram_index.search('kubernets')], [self.post.pk])
+
+
+class SearchCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        self.posts = [
+            Post.objects.create(title=f'Django note {i}', content='Body', author=self.user)
+            for i in range(12)
+        ]
+
+    def _ids(self, found):
+        return [post.pk for post in found.results[:]]
+
+    def test_normalized_queries_share_one_entry(self):
+        first = search.search_with_fallback('Django  NOTE')
+        with self.assertNumQueries(0):
+            again = search.search_with_fallback('  django note ')
+            self.assertEqual(again.results.count(), 12)
+        self.assertEqual(self._ids(again), self._ids(first))
+
+    def test_pages_slice_the_cached_ids(self):
+        url = reverse('blog:search_results')
+        self.client.get(url, {'q': 'django'})
+        # Page 2 loads only its posts: no search, no count.
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'q': 'Django', 'page': 2})
+        self.assertEqual(len(response.context['posts']), 2)
+
+    def test_writes_bump_the_content_version(self):
+        self.assertEqual(search.search_with_fallback('flask').results.count(), 0)
+        Post.objects.create(title='Flask basics', content='Body', author=self.user)
+        self.assertEqual(search.search_with_fallback('flask').results.count(), 1)
+        self.posts[0].tags.add('flask')
+        self.assertEqual(search.search_with_fallback('flask').results.count(), 2)
+
+    @mock.patch.object(search, 'SINGLE_FLIGHT_POLL', 0.01)
+    def test_single_flight(self):
+        compute = mock.Mock(return_value='computed')
+        # Someone else holds the lock and stores the result while we wait.
+        cache.add('key:lock', 1)
+        threading.Timer(0.05, cache.set, ['key', 'shared']).start()
+        self.assertEqual(search._single_flight('key', compute, 60), 'shared')
+        compute.assert_not_called()
+        # A leader that never finishes only delays us by SINGLE_FLIGHT_WAIT.
+        cache.add('other:lock', 1)
+        with mock.patch.object(search, 'SINGLE_FLIGHT_WAIT', 0.05):
+            self.assertEqual(search._single_flight('other', compute, 60), 'computed')
+        compute.assert_called_once()
+
+
+class ThrottleTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='pass12345')
+        self.post = Post.objects.create(title='Throttled', content='Body', author=self.user)
+        self.client.login(username='writer', password='pass12345')
+        self.url = reverse('blog:comment_create', args=[self.post.pk])
+
+    def test_parse_rate(self):
+        self.assertEqual(throttling.parse_rate('5/min'), throttling.Rate(5, 60))
+        self.assertEqual(throttling.parse_rate('3/10s'), throttling.Rate(3, 10))
+        with self.assertRaises(ValueError):
+            throttling.parse_rate('5 per minute')
+
+    @override_settings(BLOG_THROTTLE_RATES={'comment_create': {'user': '2/min'}})
+    def test_burst_then_429_with_retry_after(self):
+        for i in range(2):
+            self.assertEqual(self.client.post(self.url, {'content': f'c{i}'}).status_code, 302)
+        response = self.client.post(self.url, {'content': 'flood'})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+        self.assertEqual(Comment.objects.filter(post=self.post).count(), 2)
+        # Reading the form is never throttled.
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    @override_settings(BLOG_THROTTLE_RATES={'post_create': {'user': '1/h', 'ip': '5/h'}})
+    def test_post_creation_is_throttled(self):
+        url = reverse('blog:post_create')
+        data = {'title': 'First', 'content': 'Body', 'tags': ''}
+        self.assertEqual(self.client.post(url, data).status_code, 302)
+        response = self.client.post(url, {**data, 'title': 'Second'})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '3600')
+        self.assertFalse(Post.objects.filter(title='Second').exists())
+
+    def test_default_rates_apply_without_the_setting(self):
+        with self.settings():
+            del settings.BLOG_THROTTLE_RATES
+            self.assertEqual(
+                throttling.rates_for('comment_create'),
+                {kind: throttling.parse_rate(rate)
+                 for kind, rate in throttling.DEFAULT_RATES['comment_create'].items()},
+            )
+
+    def test_tokens_refill_over_time(self):
+        bucket = {'b': throttling.parse_rate('2/min')}
+        self.assertEqual(throttling.take(bucket, now=1000), 0)
+        self.assertEqual(throttling.take(bucket, now=1000), 0)
+        self.assertAlmostEqual(throttling.take(bucket, now=1010), 20)
+        self.assertEqual(throttling.take(bucket, now=1030), 0)
+
+    def test_user_and_ip_buckets_are_taken_together(self):
+        user, ip = throttling.parse_rate('1/min'), throttling.parse_rate('5/min')
+        self.assertEqual(throttling.take({'u1': user, 'ip': ip}, now=0), 0)
+        self.assertGreater(throttling.take({'u1': user, 'ip': ip}, now=0), 0)
+        # The refused request took nothing from the shared IP bucket.
+        for _ in range(4):
+            self.assertEqual(throttling.take({'ip': ip}, now=0), 0)
+        self.assertGreater(throttling.take({'u2': user, 'ip': ip}, now=0), 0)
+
+    @mock.patch.object(throttling, 'LOCK_WAIT', 0)
+    def test_busy_bucket_is_throttled(self):
+        cache.add('b:lock', 1)
+        self.assertEqual(throttling.take({'b': throttling.parse_rate('6/min')}), 10)
+
+
+class StaticFilesTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        settings_override = override_settings(STATIC_ROOT=root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _collect(self):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        return staticfiles_storage.url('blog/css/styles.css')
+
+    def test_collectstatic_writes_hashed_and_compressed_files(self):
+        self.assertEqual(staticfiles_storage.url('blog/css/styles.css'), '/static/blog/css/styles.css')
+        url = self._collect()
+        self.assertRegex(url, r'^/static/blog/css/styles\.[0-9a-f]{12}\.css$')
+        path = staticfiles_storage.path(url[len('/static/'):])
+        with open(path, 'rb') as f, open(path + '.gz', 'rb') as gz:
+            original, compressed = f.read(), gz.read()
+        self.assertLess(len(compressed), len(original))
+        self.assertEqual(gzip.decompress(compressed), original)
+        self.assertContains(self.client.get(reverse('blog:post_list')), url)
+
+    def test_hashed_files_are_immutable_and_precompressed(self):
+        url = self._collect()
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='br;q=0.5, gzip')
+        self.assertEqual(response['Cache-Control'], staticfiles.IMMUTABLE)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertIn(b'body', gzip.decompress(b''.join(response.streaming_content)))
+
+        for accept in ('', 'gzip;q=0, identity', 'gzip;q=.', 'gzip;q=1.0.0', '*;q=0'):
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING=accept)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.has_header('Content-Encoding'))
+            self.assertIn(b'body', b''.join(response.streaming_content))
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='identity, *')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_unhashed_files_are_revalidated(self):
+        response = self.client.get('/static/blog/css/styles.css')
+        self.assertEqual(response['Cache-Control'], staticfiles.REVALIDATE)
+        response = self.client.get(
+            '/static/blog/css/styles.css', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['Cache-Control'], staticfiles.REVALIDATE)
+        self.assertEqual(self.client.get('/static/blog/css/missing.css').status_code, 404)
+        self.assertEqual(self.client.get('/static/../settings.py').status_code, 400)
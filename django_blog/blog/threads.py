@@ -0,0 +1,147 @@
+# Alx_DjangoLearnLab/django_blog/blog/threads.py
+"""
+Threaded comments stored as materialized paths (see ``Comment.path``).
+
+``thread()`` and ``subtree()`` load a post's comments, or one comment and
+its replies, with a single range scan of the ``(post, path)`` index,
+already in display order.
+
+``comment_page()`` serves a thread in pages of COMMENTS_PER_PAGE, keyed by
+the last path shown: the detail page embeds the first one and the
+``comment_page`` endpoint returns the following ones.
+
+``remove_comments()`` deletes in bulk: a removed comment that still has
+replies becomes a tombstone (content cleared, place in the thread kept),
+the others are deleted, and tombstones left without replies are pruned.
+"""
+import re
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import versions
+from .models import PATH_SEGMENT, Comment, Post, path_upper_bound
+from .pagination import InvalidCursor, KeysetPage
+
+COMMENTS_PER_PAGE = 50
+
+_PATH_RE = re.compile(r'(?:[0-9a-z]{%d})+' % PATH_SEGMENT)
+
+
+def thread(post_id):
+    return Comment.objects.filter(post_id=post_id).order_by('path')
+
+
+def subtree(comment, include_self=True):
+    lower = 'path__gte' if include_self else 'path__gt'
+    return Comment.objects.filter(
+        post_id=comment.post_id,
+        path__lt=path_upper_bound(comment.path),
+        **{lower: comment.path},
+    ).order_by('path')
+
+
+def _page_queryset(post_id, after, per_page):
+    qs = thread(post_id).select_related('author')
+    if after:
+        if not _PATH_RE.fullmatch(after):
+            raise InvalidCursor(after)
+        qs = qs.filter(path__gt=after)
+    return qs[:per_page + 1]
+
+
+def _make_page(rows, per_page):
+    next_cursor = rows[per_page - 1].path if len(rows) > per_page else None
+    return KeysetPage(rows[:per_page], next_cursor, None)
+
+
+def comment_page(post_id, after='', per_page=None):
+    """The ``per_page`` comments following path ``after``, in thread order."""
+    per_page = per_page or COMMENTS_PER_PAGE
+    return _make_page(list(_page_queryset(post_id, after, per_page)), per_page)
+
+
+async def acomment_page(post_id, after='', per_page=None):
+    per_page = per_page or COMMENTS_PER_PAGE
+    rows = [c async for c in _page_queryset(post_id, after, per_page)]
+    return _make_page(rows, per_page)
+
+
+def ancestor_paths(path):
+    """Paths of the ancestors of ``path``, root first."""
+    return [path[:end] for end in range(PATH_SEGMENT, len(path), PATH_SEGMENT)]
+
+
+def _any_of(lookups):
+    q = Q()
+    for lookup in lookups:
+        q |= Q(**lookup)
+    return q
+
+
+def remove_comments(comments):
+    """
+    Remove ``comments`` (Comment instances, any posts). Returns the numbers
+    of deleted and tombstoned comments.
+    """
+    targets = {c.pk: c for c in comments}
+    if not targets:
+        return 0, 0
+
+    with transaction.atomic():
+        # A chain of tombstones above a target can become prunable too, so
+        # widen each target to its highest ancestor reachable through
+        # tombstones only.
+        ancestors = {(c.post_id, p) for c in targets.values() for p in ancestor_paths(c.path)}
+        tombstones = set()
+        if ancestors:
+            tombstones = set(
+                Comment.objects.filter(
+                    _any_of({'post_id': post_id, 'path': path} for post_id, path in ancestors),
+                    is_removed=True,
+                ).values_list('post_id', 'path')
+            )
+        roots = set()
+        for c in targets.values():
+            root = c.path
+            for path in reversed(ancestor_paths(c.path)):
+                if (c.post_id, path) not in tombstones:
+                    break
+                root = path
+            roots.add((c.post_id, root))
+
+        # One range scan per root; deepest paths first, so every node is
+        # seen after all of its descendants.
+        nodes = (
+            Comment.objects.filter(_any_of(
+                {'post_id': post_id, 'path__gte': root, 'path__lt': path_upper_bound(root)}
+                for post_id, root in roots
+            ))
+            .order_by('-path').values_list('pk', 'post_id', 'path', 'is_removed')
+        )
+        survivors_below = set()
+        delete, tombstone = [], []
+        for pk, post_id, path, is_removed in nodes:
+            removed = is_removed or pk in targets
+            if removed and (post_id, path) not in survivors_below:
+                delete.append(pk)
+                continue
+            if removed and not is_removed:
+                tombstone.append((pk, post_id))
+            survivors_below.update((post_id, p) for p in ancestor_paths(path))
+
+        if tombstone:
+            Comment.objects.filter(pk__in=[pk for pk, _ in tombstone]).update(
+                is_removed=True, content='', updated_at=timezone.now()
+            )
+            # Deletions are counted by the post_delete signal, tombstones here.
+            for post_id, n in Counter(post_id for _, post_id in tombstone).items():
+                Post.objects.filter(pk=post_id, comment_count__gte=n).update(
+                    comment_count=F('comment_count') - n
+                )
+            versions.bump_content_version()
+        if delete:
+            Comment.objects.filter(pk__in=delete).delete()
+    return len(delete), len(tombstone)
@@ -0,0 +1,169 @@
+# Alx_DjangoLearnLab/django_blog/blog/throttling.py
+"""
+Token-bucket throttling for write views.
+
+A view using ``ThrottleMixin`` names a ``throttle_scope``, and
+BLOG_THROTTLE_RATES gives that scope a rate per user and per client IP,
+e.g. ``{'comment_create': {'user': '5/min', 'ip': '20/min'}}``. A rate of
+"N/period" is a bucket of N tokens refilled at N per period: up to N
+writes in a burst, then one every period / N. POSTs that find either
+bucket empty get a 429 with Retry-After; other methods are not throttled.
+
+Each bucket is stored as a single number in the Django cache, the time at
+which it will be full again (the "theoretical arrival time" of the generic
+cell rate algorithm). Taking a token checks that this is at most
+``period - period / N`` ahead of now and moves it on by ``period / N``, and
+the key expires once the bucket is full, so idle clients cost nothing.
+The cache has no compare-and-set, so the read-modify-write runs under a
+lock taken with ``cache.add()`` (as trending.py does for compaction). A
+check is five cache calls, about 0.1 ms on the local-memory cache
+(``manage.py benchmark_throttle``).
+
+The client IP is REMOTE_ADDR. Behind a reverse proxy, have the proxy set
+it (or rewrite it in a middleware) rather than trusting X-Forwarded-For.
+"""
+import math
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+
+DEFAULT_RATES = {
+    'post_create': {'user': '10/h', 'ip': '30/h'},
+    'comment_create': {'user': '10/min', 'ip': '30/min'},
+}
+THROTTLED_METHODS = ('POST',)
+
+LOCK_TIMEOUT = 1
+# How long to wait for a bucket another request is updating; a bucket that
+# busy is being flooded anyway, so the request is throttled after that.
+LOCK_WAIT = 0.05
+LOCK_POLL = 0.001
+
+PERIODS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+_RATE_RE = re.compile(r'^\s*(\d+)\s*/\s*(\d*)\s*([a-z]+)\s*$')
+
+
+@dataclass(frozen=True)
+class Rate:
+    tokens: int
+    period: float
+
+    @property
+    def interval(self):
+        """Seconds to earn back one token."""
+        return self.period / self.tokens
+
+    @property
+    def tolerance(self):
+        """How far ahead of now a bucket's full time may be and still allow a take."""
+        return self.period - self.interval
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """'5/min', '100/h', '3/10s' -> Rate. Raises ValueError on anything else."""
+    match = _RATE_RE.match(rate)
+    if not match or match.group(3) not in PERIODS or int(match.group(1)) < 1:
+        raise ValueError(f"Invalid throttle rate {rate!r}")
+    tokens, multiple, unit = match.groups()
+    return Rate(int(tokens), int(multiple or 1) * PERIODS[unit])
+
+
+def rates_for(scope):
+    """{'user': Rate, 'ip': Rate} for ``scope``; missing or None entries are not throttled."""
+    rates = getattr(settings, 'BLOG_THROTTLE_RATES', DEFAULT_RATES).get(scope) or {}
+    return {kind: parse_rate(rate) for kind, rate in rates.items() if rate}
+
+
+def _lock(keys):
+    """Lock ``keys`` in order. Returns the locks taken, or None on timeout."""
+    taken = []
+    deadline = None
+    for key in sorted(keys):
+        lock_key = f'{key}:lock'
+        while not cache.add(lock_key, 1, LOCK_TIMEOUT):
+            now = time.monotonic()
+            deadline = deadline or now + LOCK_WAIT
+            if now >= deadline:
+                cache.delete_many(taken)
+                return None
+            time.sleep(LOCK_POLL)
+        taken.append(lock_key)
+    return taken
+
+
+def take(buckets, now=None):
+    """
+    Take one token from every bucket in ``buckets`` (cache key -> Rate), or
+    from none of them if any is empty. Returns 0 when taken, otherwise the
+    seconds until every bucket has a token again.
+    """
+    if not buckets:
+        return 0
+    locks = _lock(buckets)
+    if locks is None:
+        return max(rate.interval for rate in buckets.values())
+    try:
+        now = time.time() if now is None else now
+        stored = cache.get_many(list(buckets))
+        wait, full_at = 0, {}
+        for key, rate in buckets.items():
+            tat = max(stored.get(key, now), now)
+            wait = max(wait, tat - rate.tolerance - now)
+            full_at[key] = tat + rate.interval
+        if wait > 0:
+            return wait
+        # Keys expire once their buckets are full again; an expired key
+        # and a stale one read the same.
+        cache.set_many(full_at, math.ceil(max(full_at.values()) - now))
+        return 0
+    finally:
+        cache.delete_many(locks)
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR') or 'unknown'
+
+
+def buckets_for(request, scope):
+    """The cache key -> Rate buckets a request to ``scope`` draws from."""
+    buckets = {}
+    for kind, rate in rates_for(scope).items():
+        if kind == 'user':
+            if not request.user.is_authenticated:
+                continue
+            ident = request.user.pk
+        elif kind == 'ip':
+            ident = client_ip(request)
+        else:
+            raise ValueError(f"Unknown throttle kind {kind!r} for scope {scope!r}")
+        buckets[f'blog:throttle:{scope}:{kind}:{ident}'] = rate
+    return buckets
+
+
+def throttled_response(request, wait):
+    seconds = max(math.ceil(wait), 1)
+    response = render(request, 'blog/throttled.html', {'wait': seconds}, status=429)
+    response['Retry-After'] = str(seconds)
+    return response
+
+
+class ThrottleMixin:
+    """
+    Throttle POSTs by ``throttle_scope`` (see BLOG_THROTTLE_RATES). Goes
+    after LoginRequiredMixin in the MRO, so only signed-in users' writes
+    reach the buckets.
+    """
+    throttle_scope = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.throttle_scope and request.method in THROTTLED_METHODS:
+            wait = take(buckets_for(request, self.throttle_scope))
+            if wait:
+                return throttled_response(request, wait)
+        return super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,188 @@
+# Alx_DjangoLearnLab/django_blog/blog/trending.py
+"""
+Trending posts: an exponentially decaying activity score per post.
+
+Every event adds a weight to its post's score (NEW_POST_WEIGHT when
+published, COMMENT_WEIGHT per comment, VIEW_WEIGHT per view as flushed by
+viewcounts.py), and scores halve every HALF_LIFE seconds. Rather than
+decaying every row as time passes, a score is stored as
+
+    key = log2(sum of weight * 2 ** (event_time / HALF_LIFE))
+
+i.e. in units where nothing decays and "now" moves up instead: the current
+score is ``2 ** (key - now / HALF_LIFE)`` and ranking by ``key`` is ranking
+by current score. Adding an event is one relative UPDATE (a log-sum-exp in
+SQL), so concurrent writers never lose increments.
+
+Reads never touch TrendingScore directly: ``compact()`` deletes rows whose
+score has decayed below MIN_SCORE and caches the top TOP_K, at most every
+COMPACT_INTERVAL seconds (one process at a time), and the trending page
+reads that snapshot plus one query for the posts shown. New activity shows
+up on the page within COMPACT_INTERVAL.
+"""
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from math import log2
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Log, Power
+
+from .models import Comment, Post, TrendingScore
+
+HALF_LIFE = 6 * 60 * 60
+NEW_POST_WEIGHT = 10.0
+COMMENT_WEIGHT = 5.0
+VIEW_WEIGHT = 1.0
+MIN_SCORE = 0.01
+
+TOP_K = 100
+COMPACT_INTERVAL = 60
+SNAPSHOT_KEY = 'blog:trending:top'
+COMPACT_LOCK_KEY = 'blog:trending:compact'
+
+
+def _clock(now=None):
+    return (time.time() if now is None else now) / HALF_LIFE
+
+
+def score(key, now=None):
+    """The current (decayed) score of a stored ``key``."""
+    return 2 ** (key - _clock(now))
+
+
+def _add(post_ids, weight, clock):
+    # log2(2**key + weight * 2**clock), computed relative to ``clock`` so
+    # neither power overflows.
+    two = Value(2.0)
+    TrendingScore.objects.filter(post_id__in=post_ids).update(
+        key=Value(clock) + Log(two, Power(two, F('key') - Value(clock)) + Value(weight))
+    )
+
+
+def record_many(weights, now=None):
+    """Add ``weights`` (post id -> weight) to the posts' scores."""
+    clock = _clock(now)
+    by_weight = defaultdict(list)
+    for post_id, weight in weights.items():
+        if weight > 0:
+            by_weight[weight].append(post_id)
+    for weight, post_ids in by_weight.items():
+        existing = set(
+            TrendingScore.objects.filter(post_id__in=post_ids).values_list('post_id', flat=True)
+        )
+        if existing:
+            _add(existing, weight, clock)
+        missing = Post.objects.filter(pk__in=set(post_ids) - existing).values_list('pk', flat=True)
+        for post_id in missing:
+            try:
+                with transaction.atomic():
+                    TrendingScore.objects.create(post_id=post_id, key=clock + log2(weight))
+            except IntegrityError:
+                # Created concurrently; fall back to the increment.
+                _add([post_id], weight, clock)
+
+
+def record(post_id, weight, now=None):
+    record_many({post_id: weight}, now=now)
+
+
+def compact(now=None):
+    """Drop decayed rows and snapshot the top TOP_K. Returns the snapshot."""
+    clock = _clock(now)
+    TrendingScore.objects.filter(key__lt=clock + log2(MIN_SCORE)).delete()
+    top = list(TrendingScore.objects.order_by('-key').values_list('post_id', 'key')[:TOP_K])
+    cache.set(SNAPSHOT_KEY, (time.time() if now is None else now, top), None)
+    return top
+
+
+def _snapshot(now=None):
+    now = time.time() if now is None else now
+    snapshot = cache.get(SNAPSHOT_KEY)
+    if snapshot is not None and now - snapshot[0] < COMPACT_INTERVAL:
+        return snapshot[1]
+    if cache.add(COMPACT_LOCK_KEY, 1, COMPACT_INTERVAL):
+        try:
+            return compact(now)
+        finally:
+            cache.delete(COMPACT_LOCK_KEY)
+    if snapshot is not None:
+        # Another process is compacting; its snapshot will do next time.
+        return snapshot[1]
+    return list(TrendingScore.objects.order_by('-key').values_list('post_id', 'key')[:TOP_K])
+
+
+class TrendingPosts:
+    """
+    The ``limit`` top posts of the snapshot, best first, as a list the
+    Paginator can slice: only the posts of the requested page are loaded,
+    each with its current score as ``trending_score``.
+    """
+
+    def __init__(self, limit=TOP_K, now=None):
+        self.top = _snapshot(now)[:limit]
+        self.now = now
+
+    def __len__(self):
+        return len(self.top)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            top = self.top[index]
+            posts = (
+                Post.objects.select_related('author').defer('content')
+                .in_bulk([post_id for post_id, _ in top])
+            )
+            ranked = []
+            for post_id, key in top:
+                if post_id in posts:
+                    post = posts[post_id]
+                    post.trending_score = score(key, self.now)
+                    ranked.append(post)
+            return ranked
+        page = self[index:index + 1]
+        if not page:
+            raise IndexError(index)
+        return page[0]
+
+    def __iter__(self):
+        return iter(self[:])
+
+
+def trending_posts(limit=TOP_K, now=None):
+    """The ``limit`` top posts, best first (see TrendingPosts)."""
+    return TrendingPosts(limit, now)[:]
+
+
+def rebuild(now=None):
+    """
+    Recompute every score from post and comment dates (views carry no date
+    and are left out). Returns the number of posts scored.
+    """
+    now = time.time() if now is None else now
+    clock = _clock(now)
+    # Older events have decayed below MIN_SCORE whatever their weight.
+    horizon = HALF_LIFE * log2(max(NEW_POST_WEIGHT, COMMENT_WEIGHT) / MIN_SCORE)
+    since = datetime.fromtimestamp(now - horizon, tz=timezone.utc)
+
+    sums = defaultdict(float)
+    for post_id, published in Post.objects.filter(published_date__gte=since).values_list(
+        'pk', 'published_date'
+    ):
+        sums[post_id] += NEW_POST_WEIGHT * 2 ** (_clock(published.timestamp()) - clock)
+    for post_id, created in Comment.objects.filter(
+        created_at__gte=since, is_removed=False
+    ).values_list('post_id', 'created_at'):
+        sums[post_id] += COMMENT_WEIGHT * 2 ** (_clock(created.timestamp()) - clock)
+
+    rows = [
+        TrendingScore(post_id=post_id, key=clock + log2(total))
+        for post_id, total in sums.items() if total >= MIN_SCORE
+    ]
+    with transaction.atomic():
+        TrendingScore.objects.all().delete()
+        TrendingScore.objects.bulk_create(rows)
+    compact(now)
+    return len(rows)
@@ -0,0 +1,176 @@
+# Alx_DjangoLearnLab/django_blog/blog/trigrams.py
+"""
+In-process trigram index over the words of post titles and tag names, for
+typo-tolerant search and "did you mean" suggestions.
+
+Every distinct word gets an id. ``grams`` maps each trigram to an
+``array('i')`` of the word ids containing it, and ``postings[word id]`` is
+an ``array('q')`` of the posts whose title or tags contain the word. Words
+are padded like pg_trgm ("  word ") so that beginnings count more, and two
+words are as similar as the Jaccard index of their trigram sets.
+
+``search()`` finds, for each query word, the vocabulary words at least
+``threshold`` similar (BLOG_TRIGRAM_THRESHOLD) and ranks posts by the sum
+of their best similarity per query word. ``did_you_mean()`` swaps unknown
+query words for their closest vocabulary word at least
+BLOG_TRIGRAM_SUGGEST_THRESHOLD similar. Neither reads Post.content or
+touches the database once the index is loaded.
+
+The index is loaded on first use and dropped on any title or tag write
+(see signals.py); a shared generation counter in the Django cache tells
+other processes to drop theirs too. It is only consulted when full-text
+search finds nothing, so a reload is rare and off the common path.
+"""
+import re
+import threading
+from array import array
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+
+from taggit.models import TaggedItem
+
+from .models import Post
+
+THRESHOLD = 0.3
+SUGGEST_THRESHOLD = 0.45
+# Similar words considered per query word.
+MAX_SIMILAR_WORDS = 20
+
+_GENERATION_KEY = 'blog:trigrams:generation'
+_WORD_RE = re.compile(r'\w+')
+
+
+def words(text):
+    return _WORD_RE.findall(text.casefold())
+
+
+def trigrams(word):
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _threshold(value, setting, default):
+    return value if value is not None else getattr(settings, setting, default)
+
+
+class _Index:
+    """One immutable build; replaced as a whole, so readers need no lock."""
+
+    def __init__(self, word_posts):
+        self.words = sorted(word_posts)
+        self.ids = {word: i for i, word in enumerate(self.words)}
+        self.postings = [array('q', sorted(word_posts[word])) for word in self.words]
+        self.gram_counts = array('H')
+        grams = defaultdict(lambda: array('i'))
+        for i, word in enumerate(self.words):
+            word_grams = trigrams(word)
+            self.gram_counts.append(min(len(word_grams), 0xFFFF))
+            for gram in word_grams:
+                grams[gram].append(i)
+        self.grams = dict(grams)
+
+    def similar(self, word, threshold):
+        """[(similarity, word id)] of words at least ``threshold`` similar, best first."""
+        word_grams = trigrams(word)
+        shared = Counter()
+        for gram in word_grams:
+            shared.update(self.grams.get(gram, ()))
+        scored = []
+        for i, n in shared.items():
+            similarity = n / (len(word_grams) + self.gram_counts[i] - n)
+            if similarity >= threshold:
+                scored.append((similarity, i))
+        # Ties go to the more common word.
+        scored.sort(key=lambda item: (-item[0], -len(self.postings[item[1]]), item[1]))
+        return scored[:MAX_SIMILAR_WORDS]
+
+
+class TrigramIndex:
+
+    def __init__(self):
+        self._index = None
+        self._generation = None
+        self._lock = threading.Lock()
+
+    def _shared_generation(self):
+        generation = cache.get(_GENERATION_KEY)
+        if generation is None:
+            cache.add(_GENERATION_KEY, 0, None)
+            generation = cache.get(_GENERATION_KEY)
+        return generation
+
+    def _rows(self):
+        yield from Post.objects.values_list('pk', 'title').iterator(chunk_size=2000)
+        yield from TaggedItem.objects.filter(
+            content_type=ContentType.objects.get_for_model(Post)
+        ).values_list('object_id', 'tag__name').iterator(chunk_size=2000)
+
+    def load(self):
+        """(Re)build from post titles and tag names. Returns the vocabulary size."""
+        with self._lock:
+            generation = self._shared_generation()
+            word_posts = defaultdict(set)
+            for post_id, text in self._rows():
+                for word in words(text):
+                    word_posts[word].add(post_id)
+            self._index = _Index(word_posts)
+            self._generation = generation
+            return len(self._index.words)
+
+    def _current(self):
+        index = self._index
+        if index is None or self._shared_generation() != self._generation:
+            self.load()
+            index = self._index
+        return index
+
+    def invalidate(self):
+        """Drop this process's index and tell the others to drop theirs."""
+        self._shared_generation()
+        try:
+            cache.incr(_GENERATION_KEY)
+        except ValueError:
+            pass
+        self._index = None
+
+    # --- queries ---
+    def search(self, q, threshold=None):
+        """[(post id, score)] for posts with words similar to ``q``'s, best first."""
+        threshold = _threshold(threshold, 'BLOG_TRIGRAM_THRESHOLD', THRESHOLD)
+        index = self._current()
+        scores = Counter()
+        for word in set(words(q)):
+            best = {}
+            for similarity, i in index.similar(word, threshold):
+                for post_id in index.postings[i]:
+                    if similarity > best.get(post_id, 0):
+                        best[post_id] = similarity
+            scores.update(best)
+        # Newer posts (higher ids) first among equals.
+        return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+
+    def did_you_mean(self, q, threshold=None):
+        """``q`` with unknown words corrected, or None if nothing changed."""
+        threshold = _threshold(threshold, 'BLOG_TRIGRAM_SUGGEST_THRESHOLD', SUGGEST_THRESHOLD)
+        index = self._current()
+        changed = False
+
+        def fix(match):
+            nonlocal changed
+            word = match.group().casefold()
+            if word in index.ids:
+                return match.group()
+            similar = index.similar(word, threshold)
+            if not similar:
+                return match.group()
+            changed = True
+            return index.words[similar[0][1]]
+
+        suggestion = _WORD_RE.sub(fix, q.strip())
+        return suggestion if changed else None
+
+
+trigram_index = TrigramIndex()
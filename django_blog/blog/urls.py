@@ -1,14 +1,23 @@
 # Alx_DjangoLearnLab/django_blog/blog/urls.py
+from django.conf import settings
 from django.urls import path
 from django.contrib.auth import views as auth_views
-from . import views
+from . import async_views, feeds, views
 
 app_name = 'blog'
 
+
+def read_path(route, view_class, name):
+    """Route to ``view_class`` or, if listed in BLOG_ASYNC_VIEWS, its async twin."""
+    if name in settings.BLOG_ASYNC_VIEWS:
+        view_class = getattr(async_views, view_class.__name__)
+    return path(route, view_class.as_view(), name=name)
+
+
 urlpatterns = [
     # Post read
-    path('', views.PostListView.as_view(), name='post_list'),
-    path('post/<int:pk>/', views.PostDetailView.as_view(), name='post_detail'),
+    read_path('', views.PostListView, name='post_list'),
+    read_path('post/<int:pk>/', views.PostDetailView, name='post_detail'),
 
     # Post CRUD (checker required patterns)
     path('post/new/', views.PostCreateView.as_view(), name='post_create'),
@@ -16,15 +25,34 @@ urlpatterns = [
     path('post/<int:pk>/delete/', views.PostDeleteView.as_view(), name='post_delete'),
 
     # Comments
+    path('post/<int:pk>/comments/', views.comment_page, name='comment_page'),
     path('post/<int:pk>/comments/new/', views.CommentCreateView.as_view(), name='comment_create'),
+    path('post/<int:pk>/comments/<int:parent_pk>/reply/', views.CommentCreateView.as_view(), name='comment_reply'),
     path('comment/<int:pk>/update/', views.CommentUpdateView.as_view(), name='comment_update'),
     path('comment/<int:pk>/delete/', views.CommentDeleteView.as_view(), name='comment_delete'),
 
     # Tags: required pattern and view
-    path('tags/<slug:tag_slug>/', views.PostByTagListView.as_view(), name='posts_by_tag'),
+    read_path('tags/', views.TagCloudView, name='tag_cloud'),
+    path('tags.json', views.tag_stats_json, name='tag_stats'),
+    read_path('tags/<slug:tag_slug>/', views.PostByTagListView, name='posts_by_tag'),
+
+    # Trending
+    path('trending/', views.TrendingView.as_view(), name='trending'),
+
+    # Feeds (Atom)
+    path('feeds/', feeds.site_feed, name='feed'),
+    path('feeds/author/<str:username>/', feeds.author_feed, name='author_feed'),
+    path('feeds/tag/<slug:tag_slug>/', feeds.tag_feed, name='tag_feed'),
 
     # Search
-    path('search/', views.SearchResultsView.as_view(), name='search_results'),
+    read_path('search/', views.SearchResultsView, name='search_results'),
+    path('search/suggest/', views.autocomplete_suggestions, name='autocomplete'),
+
+    # Export (staff only)
+    path('export/<str:kind>.<str:fmt>', views.export_data, name='export'),
+
+    # Cache diagnostics (staff only)
+    path('stats/fragment-cache/', views.fragment_cache_stats, name='fragment_cache_stats'),
 
     # Auth
     path('register/', views.register, name='register'),
@@ -0,0 +1,62 @@
+# Alx_DjangoLearnLab/django_blog/blog/versions.py
+"""
+Cache-held version stamps used to key and validate derived data.
+
+A stamp is the ``time.time_ns()`` of the last change, so it doubles as a
+last-modified time. A missing (evicted) stamp is recreated as "now", which
+can only cause extra misses, never a stale hit. Stamps are bumped from
+signals (see signals.py):
+
+* post:<id>    -- the post was saved, or its tags, comments or related posts changed
+* author:<id>  -- the user may have been renamed
+* content      -- anything shown on list/search pages changed
+"""
+import time
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+
+
+def _version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(key):
+    cache.set(key, time.time_ns(), None)
+
+
+def as_datetime(version):
+    return datetime.fromtimestamp(version / 1e9, tz=timezone.utc)
+
+
+def post_version(post_id):
+    return _version(f'blog:ver:post:{post_id}')
+
+
+def bump_post_version(post_id):
+    _bump(f'blog:ver:post:{post_id}')
+
+
+def bump_post_versions(post_ids):
+    now = time.time_ns()
+    cache.set_many({f'blog:ver:post:{pk}': now for pk in post_ids}, None)
+
+
+def author_version(user_id):
+    return _version(f'blog:ver:author:{user_id}')
+
+
+def bump_author_version(user_id):
+    _bump(f'blog:ver:author:{user_id}')
+
+
+def content_version():
+    return _version('blog:ver:content')
+
+
+def bump_content_version():
+    _bump('blog:ver:content')
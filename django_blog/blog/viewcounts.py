@@ -0,0 +1,187 @@
+# Alx_DjangoLearnLab/django_blog/blog/viewcounts.py
+"""
+Write-behind post view counters.
+
+Views are added to an in-memory buffer (post id -> views) under a lock and
+written out later as relative UPDATEs, one per distinct increment, so a
+burst of hits on one post costs one write instead of one each and the hot
+row is not locked per request. The same flush feeds the views to the
+trending scores (trending.py).
+
+A daemon thread flushes every ``BLOG_VIEW_FLUSH_INTERVAL`` seconds, and is
+woken early once ``BLOG_VIEW_FLUSH_THRESHOLD`` views are pending, so a
+crash loses at most about that many; a clean exit flushes too. When the
+database is unavailable the views are put back, but the buffer never holds
+more than MAX_PENDING_FACTOR times the threshold: beyond that new views are
+dropped (and counted in ``counter.dropped``). Without an interval there is
+no thread: the request that reaches the threshold flushes, and whatever is
+pending at exit is lost.
+
+Each process buffers its own views, so ``live_count()`` (stored count plus
+this process's pending views) is approximate.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F
+
+from . import trending
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 5.0
+FLUSH_THRESHOLD = 500
+MAX_PENDING_FACTOR = 10
+UPDATE_BATCH_SIZE = 500
+
+
+class ViewCounter:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._pending = 0
+        self._wake = threading.Event()
+        self._thread = None
+        self._flush_at_exit = False
+        self.dropped = 0
+
+    @property
+    def interval(self):
+        return getattr(settings, 'BLOG_VIEW_FLUSH_INTERVAL', FLUSH_INTERVAL)
+
+    @property
+    def threshold(self):
+        return getattr(settings, 'BLOG_VIEW_FLUSH_THRESHOLD', FLUSH_THRESHOLD)
+
+    def _add(self, counts):
+        # Callers hold the lock.
+        room = self.threshold * MAX_PENDING_FACTOR - self._pending
+        for post_id, n in counts.items():
+            kept = max(min(n, room), 0)
+            if kept:
+                self._counts[post_id] += kept
+                self._pending += kept
+                room -= kept
+            self.dropped += n - kept
+
+    def add(self, post_id, n=1):
+        """
+        Buffer ``n`` views of a post. Returns True when the caller should
+        flush now (the threshold was reached and there is no flush thread).
+        """
+        with self._lock:
+            self._add({post_id: n})
+            full = self._pending >= self.threshold
+        if self.interval:
+            self._ensure_thread()
+            if full:
+                self._wake.set()
+            return False
+        return full
+
+    def pending(self, post_id=None):
+        with self._lock:
+            return self._pending if post_id is None else self._counts.get(post_id, 0)
+
+    def flush(self):
+        """Write the buffered views. Returns the number of views written."""
+        with self._lock:
+            counts, self._counts, self._pending = self._counts, Counter(), 0
+        if not counts:
+            return 0
+        by_increment = defaultdict(list)
+        for post_id, n in counts.items():
+            by_increment[n].append(post_id)
+        try:
+            with transaction.atomic():
+                for n, post_ids in by_increment.items():
+                    for start in range(0, len(post_ids), UPDATE_BATCH_SIZE):
+                        batch = post_ids[start:start + UPDATE_BATCH_SIZE]
+                        Post.objects.filter(pk__in=batch).update(view_count=F('view_count') + n)
+                trending.record_many({pk: n * trending.VIEW_WEIGHT for pk, n in counts.items()})
+        except DatabaseError:
+            logger.exception("Could not flush %d post views; keeping them", sum(counts.values()))
+            with self._lock:
+                self._add(counts)
+            return 0
+        return sum(counts.values())
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='blog-view-counter', daemon=True
+                )
+                self._thread.start()
+                if not self._flush_at_exit:
+                    atexit.register(self.flush)
+                    self._flush_at_exit = True
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval or FLUSH_INTERVAL)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("View counter flush failed")
+            finally:
+                # This thread's connections; don't hold them between flushes.
+                connections.close_all()
+
+
+counter = ViewCounter()
+
+
+def record_view(post_id):
+    if counter.add(post_id):
+        counter.flush()
+
+
+async def arecord_view(post_id):
+    if counter.add(post_id):
+        await sync_to_async(counter.flush)()
+
+
+def live_count(post):
+    """Approximate view count of a loaded post, including unflushed views."""
+    return post.view_count + counter.pending(post.pk)
+
+
+def live_counts(post_ids):
+    """post id -> approximate view count, including unflushed views."""
+    stored = Post.objects.filter(pk__in=post_ids).values_list('pk', 'view_count')
+    return {pk: views + counter.pending(pk) for pk, views in stored}
+
+
+class ViewCountMixin:
+    """
+    Counts successful GETs of a post's page, including 304s and page cache
+    hits. Goes before the conditional and page cache mixins in the MRO.
+    """
+
+    def _is_view(self, request, response):
+        return request.method == 'GET' and response.status_code in (200, 304)
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self._adispatch_counted(request, *args, **kwargs)
+        response = super().dispatch(request, *args, **kwargs)
+        if self._is_view(request, response):
+            record_view(int(kwargs['pk']))
+        return response
+
+    async def _adispatch_counted(self, request, *args, **kwargs):
+        response = await super().dispatch(request, *args, **kwargs)
+        if self._is_view(request, response):
+            await arecord_view(int(kwargs['pk']))
+        return response
@@ -1,16 +1,25 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth import login
-from django.contrib.auth.decorators import login_required
+from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.urls import reverse, reverse_lazy
+from django.utils.cache import patch_vary_headers
 from django.views.generic import (
-    ListView, DetailView, CreateView, UpdateView, DeleteView
+    ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView
 )
-from django.db.models import Q
 
-from .models import Post, Profile, Comment, Tag
+from .models import Post, Comment, Tag
+from . import autocomplete, exporter, fragments, profiles, related, tagstats, threads, trending
 from .forms import RegisterForm, ProfileForm, PostForm, CommentForm
+from .conditional import ContentVersionConditionalMixin, PostConditionalMixin
+from .pagecache import AnonymousPageCacheMixin
+from .pagination import CURSOR_PARAM, InvalidCursor, KeysetPaginationMixin
+from .search import search_with_fallback
+from .tagindex import PostingListPaginator
+from .throttling import ThrottleMixin
+from .viewcounts import ViewCountMixin
 
 # --- Auth / Profile views ---------------------------------------------------
 def register(request):
@@ -29,7 +38,7 @@ def register(request):
 
 @login_required
 def profile_view(request):
-    profile, _ = Profile.objects.get_or_create(user=request.user)
+    profile = profiles.get_profile(request.user)
     if request.method == 'POST':
         form = ProfileForm(request.POST, request.FILES, instance=profile)
         if form.is_valid():
@@ -43,30 +52,47 @@ def profile_view(request):
     return render(request, 'blog/profile.html', {'form': form})
 
 # --- Post CRUD --------------------------------------------------------------
-class PostListView(ListView):
+class PostListView(ContentVersionConditionalMixin, AnonymousPageCacheMixin, KeysetPaginationMixin, ListView):
     model = Post
     template_name = 'blog/post_list.html'
     context_object_name = 'posts'
     paginate_by = 10
     ordering = ['-published_date']
+    page_cache_params = (CURSOR_PARAM, 'page')
 
-class PostDetailView(DetailView):
+    def get_queryset(self):
+        # The list renders Post.excerpt, never the full content.
+        return super().get_queryset().select_related('author').defer('content')
+
+class PostDetailView(ViewCountMixin, PostConditionalMixin, AnonymousPageCacheMixin, DetailView):
     model = Post
     template_name = 'blog/post_detail.html'
     context_object_name = 'post'
 
+    def get_queryset(self):
+        # One query each for the post+author and its tags; comments come in
+        # pages (blog/threads.py), so the page costs the same for any count.
+        return Post.objects.select_related('author').prefetch_related('tags')
+
     def get_context_data(self, **kwargs):
+        # The async view passes in what it already loaded.
+        if 'comment_page' not in kwargs:
+            kwargs['comment_page'] = threads.comment_page(self.object.pk)
+        if 'related_posts' not in kwargs:
+            kwargs['related_posts'] = related.related_posts(self.object.pk)
         context = super().get_context_data(**kwargs)
         context['comment_form'] = CommentForm()
         return context
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostCreateView(LoginRequiredMixin, ThrottleMixin, CreateView):
     model = Post
+    throttle_scope = 'post_create'
     form_class = PostForm
     template_name = 'blog/post_form.html'
 
     def form_valid(self, form):
-        post = form.save(commit=True, author=self.request.user)
+        form.instance.author = self.request.user
+        post = form.save()
         messages.success(self.request, "Post created successfully.")
         return redirect(post.get_absolute_url())
 
@@ -94,21 +120,38 @@ class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         return post.author == self.request.user
 
 # --- Comments ---------------------------------------------------------------
-class CommentCreateView(LoginRequiredMixin, CreateView):
+class CommentCreateView(LoginRequiredMixin, ThrottleMixin, CreateView):
     model = Comment
     form_class = CommentForm
     template_name = 'blog/comment_form.html'  # optional
+    throttle_scope = 'comment_create'
+
+    def get_parent(self):
+        """The comment being replied to (reply URL), or None."""
+        parent_pk = self.kwargs.get('parent_pk')
+        if parent_pk is None:
+            return None
+        return get_object_or_404(
+            Comment, pk=parent_pk, post_id=self.kwargs.get('pk'), is_removed=False
+        )
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx['parent'] = self.get_parent()
+        return ctx
 
     def form_valid(self, form):
         post_pk = self.kwargs.get('pk')  # matches URL: post/<int:pk>/comments/new/
         form.instance.author = self.request.user
         form.instance.post_id = post_pk
+        form.instance.parent = self.get_parent()
         response = super().form_valid(form)
         messages.success(self.request, "Comment posted.")
         return response
 
     def get_success_url(self):
-        return reverse('blog:post_detail', kwargs={'pk': self.object.post.pk})
+        url = reverse('blog:post_detail', kwargs={'pk': self.object.post_id})
+        return f'{url}#comment-{self.object.pk}'
 
 class CommentUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     model = Comment
@@ -117,7 +160,7 @@ class CommentUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
 
     def test_func(self):
         comment = self.get_object()
-        return comment.author == self.request.user
+        return comment.author == self.request.user and not comment.is_removed
 
     def get_success_url(self):
         return reverse('blog:post_detail', kwargs={'pk': self.object.post.pk})
@@ -128,13 +171,47 @@ class CommentDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
 
     def test_func(self):
         comment = self.get_object()
-        return comment.author == self.request.user
+        return comment.author == self.request.user and not comment.is_removed
+
+    def form_valid(self, form):
+        # Tombstones the comment if it has replies, see blog/threads.py.
+        threads.remove_comments([self.object])
+        return redirect(self.get_success_url())
 
     def get_success_url(self):
-        return reverse_lazy('blog:post_detail', kwargs={'pk': self.object.post.pk})
+        return reverse_lazy('blog:post_detail', kwargs={'pk': self.object.post_id})
+
+def comment_page(request, pk):
+    """
+    The comments after ``?after=<path>`` as an HTML fragment for "load
+    more", or as JSON with ``?format=json``.
+    """
+    try:
+        page = threads.comment_page(pk, request.GET.get('after', ''))
+    except InvalidCursor:
+        raise Http404("Invalid page cursor.")
+    if not page and not Post.objects.filter(pk=pk).exists():
+        raise Http404("No post found matching the query.")
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'comments': [
+                {
+                    'id': c.pk,
+                    'parent_id': c.parent_id,
+                    'depth': c.depth,
+                    'author': None if c.is_removed else c.author.username,
+                    'content': c.content,
+                    'is_removed': c.is_removed,
+                    'created_at': c.created_at,
+                }
+                for c in page
+            ],
+            'next_cursor': page.next_cursor,
+        })
+    return render(request, 'blog/_comment_page.html', {'page': page, 'post_pk': pk})
 
 # --- Tag & Search Views ----------------------------------------------------
-class TagListView(ListView):
+class TagListView(ContentVersionConditionalMixin, KeysetPaginationMixin, ListView):
     model = Post
     template_name = 'blog/tag_list.html'
     context_object_name = 'posts'
@@ -142,30 +219,41 @@ class TagListView(ListView):
 
     def get_queryset(self):
         tag_name = self.kwargs.get('tag_name')
-        return Post.objects.filter(tags__name__iexact=tag_name).distinct().order_by('-published_date')
+        return (
+            Post.objects.filter(tags__name__iexact=tag_name).distinct()
+            .select_related('author').defer('content').order_by('-published_date')
+        )
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         ctx['tag_name'] = self.kwargs.get('tag_name')
         return ctx
 
-class SearchResultsView(ListView):
+    def get_keyset_paginator(self, queryset, page_size):
+        # Pages come from the in-process tag posting list (blog/tagindex.py).
+        return PostingListPaginator('name', self.kwargs.get('tag_name') or '', page_size)
+
+class SearchResultsView(ContentVersionConditionalMixin, ListView):
     model = Post
     template_name = 'blog/search_results.html'
     context_object_name = 'posts'
     paginate_by = 10
 
     def get_queryset(self):
-        q = self.request.GET.get('q', '').strip()
-        if not q:
-            return Post.objects.none()
-        return Post.objects.filter(
-            Q(title__icontains=q) |
-            Q(content__icontains=q) |
-            Q(tags__name__icontains=q)
-        ).distinct().order_by('-published_date')
+        # Ranked by BM25 via the FTS5 index (see blog/search.py), or by
+        # title/tag similarity when that finds nothing. The async view
+        # runs the search beforehand.
+        if not hasattr(self, 'search'):
+            self.search = search_with_fallback(self.request.GET.get('q', ''))
+        return self.search.results
 
-class PostByTagListView(ListView):
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['fuzzy'] = self.search.fuzzy
+        context['did_you_mean'] = self.search.did_you_mean
+        return context
+
+class PostByTagListView(ContentVersionConditionalMixin, AnonymousPageCacheMixin, KeysetPaginationMixin, ListView):
     """
     Lists posts that have a tag matching the provided slug (tag_slug).
     URL should provide <slug:tag_slug>.
@@ -174,15 +262,97 @@ class PostByTagListView(ListView):
     template_name = 'blog/tag_list.html'   # reuse existing tag_list template
     context_object_name = 'posts'
     paginate_by = 10
+    page_cache_params = (CURSOR_PARAM, 'page')
 
     def get_queryset(self):
         tag_slug = self.kwargs.get('tag_slug')
         if not tag_slug:
             return Post.objects.none()
         # taggit stores Tag.slug field; lookup via tags__slug
-        return Post.objects.filter(tags__slug__iexact=tag_slug).distinct().order_by('-published_date')
+        return (
+            Post.objects.filter(tags__slug__iexact=tag_slug).distinct()
+            .select_related('author').defer('content').order_by('-published_date')
+        )
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         ctx['tag_slug'] = self.kwargs.get('tag_slug')
         return ctx
+
+    def get_keyset_paginator(self, queryset, page_size):
+        # Pages come from the in-process tag posting list (blog/tagindex.py).
+        return PostingListPaginator('slug', self.kwargs.get('tag_slug') or '', page_size)
+
+class TagCloudView(TemplateView):
+    """Tag cloud read from the materialized TagStats table."""
+    template_name = 'blog/tag_cloud.html'
+
+    def get_context_data(self, **kwargs):
+        # The async view passes in tags it already loaded.
+        if 'tags' not in kwargs:
+            kwargs['tags'] = tagstats.cloud()
+        return super().get_context_data(**kwargs)
+
+def autocomplete_suggestions(request):
+    """Search box suggestions as JSON for the prefix ``?q=``; ``?limit=`` caps at 20."""
+    try:
+        limit = min(max(int(request.GET.get('limit', autocomplete.MAX_SUGGESTIONS)), 1), 20)
+    except ValueError:
+        limit = autocomplete.MAX_SUGGESTIONS
+    matches = autocomplete.prefix_index.lookup(request.GET.get('q', ''), limit)
+    suggestions = [
+        {'kind': kind, 'label': label, 'url': autocomplete.suggestion_url(kind, pk, slug)}
+        for kind, pk, label, slug in matches
+    ]
+    return JsonResponse({'suggestions': suggestions})
+
+class TrendingView(ListView):
+    """Top posts by decayed activity, read from the trending.py snapshot."""
+    template_name = 'blog/trending.html'
+    context_object_name = 'posts'
+    paginate_by = 10
+
+    def get_queryset(self):
+        # Sliced per page by the Paginator; only that page's posts are loaded.
+        return trending.TrendingPosts()
+
+def tag_stats_json(request):
+    """Most used tags as JSON; ``?limit=`` caps at 500."""
+    try:
+        limit = min(max(int(request.GET.get('limit', tagstats.CLOUD_SIZE)), 1), 500)
+    except ValueError:
+        limit = tagstats.CLOUD_SIZE
+    tags = [
+        {
+            'name': s.tag.name,
+            'slug': s.tag.slug,
+            'post_count': s.post_count,
+            'last_used': s.last_used,
+            'url': reverse('blog:posts_by_tag', kwargs={'tag_slug': s.tag.slug}),
+        }
+        for s in tagstats.top_tags(limit)
+    ]
+    return JsonResponse({'tags': tags})
+
+# --- Export ----------------------------------------------------------------
+@user_passes_test(lambda u: u.is_staff)
+def export_data(request, kind, fmt):
+    """Stream every post or comment as NDJSON/CSV, gzipped if accepted."""
+    if kind not in exporter.EXPORTS or fmt not in ('ndjson', 'csv'):
+        raise Http404("Unknown export.")
+    gzip = exporter.accepts_encoding(request.headers.get('Accept-Encoding', ''), 'gzip')
+    content_type = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    response = StreamingHttpResponse(
+        exporter.export_stream(kind, fmt, gzip=gzip), content_type=f'{content_type}; charset=utf-8'
+    )
+    if gzip:
+        response['Content-Encoding'] = 'gzip'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    response['Content-Disposition'] = f'attachment; filename="{kind}.{fmt}"'
+    return response
+
+# --- Cache statistics -------------------------------------------------------
+@user_passes_test(lambda u: u.is_staff)
+def fragment_cache_stats(request):
+    """Per-process hit/miss counters of the post fragment cache."""
+    return JsonResponse(fragments.stats())
@@ -84,6 +84,49 @@ DATABASES = {
 }
 
 
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Holds the rendered post fragments (blog/fragments.py). Point this at
+# Redis/Memcached in production so all workers share it.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'django-blog',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+
+# Serve post list/detail/tag pages from the anonymous page cache and splice
+# in per-user fragments (blog/pagecache.py).
+BLOG_ANONYMOUS_PAGE_CACHE = True
+
+# Read routes served by the async views in blog/async_views.py instead of
+# their sync twins: any of 'post_list', 'post_detail', 'posts_by_tag',
+# 'tag_cloud', 'search_results'. Only worth it under ASGI (asgi.py).
+BLOG_ASYNC_VIEWS = ()
+
+# Post views are counted in memory and written in batched UPDATEs by a
+# background thread (blog/viewcounts.py) every BLOG_VIEW_FLUSH_INTERVAL
+# seconds, or as soon as BLOG_VIEW_FLUSH_THRESHOLD views are pending, so a
+# crash loses at most about that many. Without an interval the request
+# that reaches the threshold flushes (blog/tests.py runs that way).
+BLOG_VIEW_FLUSH_INTERVAL = 5.0
+BLOG_VIEW_FLUSH_THRESHOLD = 500
+
+# When full-text search finds nothing, posts whose title/tag words are at
+# least this trigram-similar to the query's are shown instead, and unknown
+# words similar enough to a known one get a "did you mean" (blog/trigrams.py).
+BLOG_TRIGRAM_THRESHOLD = 0.3
+BLOG_TRIGRAM_SUGGEST_THRESHOLD = 0.45
+
+# Write views are throttled with token buckets per signed-in user and per
+# client IP (blog/throttling.py); over the limit, POSTs get a 429 with
+# Retry-After. Set BLOG_THROTTLE_RATES to override the default rates in
+# blog.throttling.DEFAULT_RATES, e.g. {'comment_create': {'user': '5/min'}}
+# ("N/period": bursts of N, refilled at N per period).
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -119,8 +162,26 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# collectstatic writes content-hashed names plus .gz/.br siblings
+# (blog/staticfiles.py). Run it on deploy; until then the plain names are
+# used.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'blog.staticfiles.CompressedManifestStaticFilesStorage'},
+}
+
+# Serve STATIC_ROOT from Django (blog.staticfiles.serve), picking the
+# precompressed variant and sending immutable cache headers for hashed
+# names. Turn off when a front-end server serves /static/ itself.
+BLOG_SERVE_STATIC = True
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Media files (user uploads such as avatars)
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
@@ -19,6 +19,8 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from blog import staticfiles
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('blog.urls', namespace='blog')),
@@ -27,3 +29,6 @@ urlpatterns = [
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
+if settings.BLOG_SERVE_STATIC:
+    urlpatterns += [path(f"{settings.STATIC_URL.lstrip('/')}<path:path>", staticfiles.serve)]
+